@@ -0,0 +1,52 @@
+"""Add quiz_attempts.phase and make student_progress unique per user and module
+
+Revision ID: 1c9e7a5f3d62
+Revises: b8c5e2d7f3a0
+Create Date: 2026-10-18 21:04:37.118502
+
+Duplicate progress rows are collapsed first, keeping the completed,
+highest-scoring one. Rollups still count the removed rows until
+rebuild_rollups.py is run.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e7a5f3d62'
+down_revision: Union[str, Sequence[str], None] = 'b8c5e2d7f3a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DEDUPLICATE_PROGRESS = """
+DELETE FROM student_progress WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY user_id, module_id
+            ORDER BY CASE WHEN completed THEN 1 ELSE 0 END DESC, COALESCE(score, 0) DESC, id DESC
+        ) AS ordinal
+        FROM student_progress
+    ) ranked
+    WHERE ordinal > 1
+)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quiz_attempts', sa.Column('phase', sa.String(), nullable=True))
+
+    op.execute(DEDUPLICATE_PROGRESS)
+    op.drop_index('ix_student_progress_user_module', table_name='student_progress')
+    op.create_index('ix_student_progress_user_module', 'student_progress', ['user_id', 'module_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_student_progress_user_module', table_name='student_progress')
+    op.create_index('ix_student_progress_user_module', 'student_progress', ['user_id', 'module_id'], unique=False)
+
+    op.drop_column('quiz_attempts', 'phase')
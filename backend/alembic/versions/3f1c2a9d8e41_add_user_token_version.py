@@ -0,0 +1,28 @@
+"""Add users.token_version for claim-based token invalidation
+
+Revision ID: 3f1c2a9d8e41
+Revises: 7ba00fea7859
+Create Date: 2026-10-18 09:12:03.412210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8e41'
+down_revision: Union[str, Sequence[str], None] = '7ba00fea7859'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
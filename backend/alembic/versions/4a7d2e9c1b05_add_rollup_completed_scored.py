@@ -0,0 +1,62 @@
+"""Add completed_scored to the module, department and cohort-module rollups
+
+Revision ID: 4a7d2e9c1b05
+Revises: 1c9e7a5f3d62
+Create Date: 2026-10-18 22:16:09.530871
+
+Averages divide the score sum by the completions that have a score, so
+completions with a NULL score no longer pull them down.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7d2e9c1b05'
+down_revision: Union[str, Sequence[str], None] = '1c9e7a5f3d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ['analytics_module_rollup', 'analytics_department_rollup', 'analytics_cohort_module_rollup']
+
+# COUNT(score) counts the completed rows whose score is not NULL
+BACKFILL = [
+    """
+    UPDATE analytics_module_rollup SET completed_scored = (
+        SELECT COUNT(sp.score) FROM student_progress sp
+        WHERE sp.module_id = analytics_module_rollup.module_id AND sp.completed
+    )
+    """,
+    """
+    UPDATE analytics_department_rollup SET completed_scored = (
+        SELECT COUNT(sp.score) FROM student_progress sp JOIN users u ON u.id = sp.user_id
+        WHERE COALESCE(u.department, '') = analytics_department_rollup.department AND sp.completed
+    )
+    """,
+    """
+    UPDATE analytics_cohort_module_rollup SET completed_scored = (
+        SELECT COUNT(sp.score) FROM student_progress sp JOIN users u ON u.id = sp.user_id
+        WHERE sp.module_id = analytics_cohort_module_rollup.module_id AND sp.completed
+        AND COALESCE(CASE analytics_cohort_module_rollup.dimension
+                     WHEN 'department' THEN u.department ELSE u.year_of_study END, '')
+            = analytics_cohort_module_rollup.cohort
+    )
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('completed_scored', sa.Integer(), server_default='0', nullable=False))
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_column(table, 'completed_scored')
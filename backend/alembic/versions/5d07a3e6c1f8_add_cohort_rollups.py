@@ -0,0 +1,53 @@
+"""Add department / year-of-study cohort rollups
+
+Revision ID: 5d07a3e6c1f8
+Revises: c2e84f19b7a3
+Create Date: 2026-10-18 16:22:40.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d07a3e6c1f8'
+down_revision: Union[str, Sequence[str], None] = 'c2e84f19b7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str, type_=sa.Integer()) -> sa.Column:
+    return sa.Column(name, type_, server_default='0', nullable=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analytics_cohort_rollup',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('cohort', sa.String(), nullable=False),
+    _counter('students'),
+    sa.PrimaryKeyConstraint('dimension', 'cohort')
+    )
+    op.create_table('analytics_cohort_module_rollup',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('cohort', sa.String(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    _counter('completed_count'),
+    _counter('completed_score_sum', sa.BigInteger()),
+    _counter('quiz_attempts'),
+    sa.ForeignKeyConstraint(['module_id'], ['disaster_modules.id'], ),
+    sa.PrimaryKeyConstraint('dimension', 'cohort', 'module_id')
+    )
+
+    # Backfill from the live tables
+    from app.models.models import CohortRollup, CohortModuleRollup
+    from app.services.rollups import rebuild_rollups
+    rebuild_rollups(op.get_bind(), [CohortRollup, CohortModuleRollup])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analytics_cohort_module_rollup')
+    op.drop_table('analytics_cohort_rollup')
@@ -0,0 +1,126 @@
+"""Store quiz options and answers as native JSON (JSONB on PostgreSQL)
+
+PostgreSQL converts each column in place with ALTER COLUMN ... USING. SQLite
+cannot change a column type, so rows are copied into a new column in keyset
+batches to keep memory bounded on large quiz_attempts tables.
+
+Missing values become an empty list; anything else that is not a JSON list
+stops the migration with the offending row id.
+
+Revision ID: 7f2d9a4c6b18
+Revises: e4a1c8f5b962
+Create Date: 2026-10-18 20:31:44.902517
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f2d9a4c6b18'
+down_revision: Union[str, Sequence[str], None] = 'e4a1c8f5b962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+JSON_TYPE = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+# (table, column)
+COLUMNS = [
+    ('quiz_questions', 'options'),
+    ('quiz_attempts', 'answers'),
+]
+
+
+def _parse(table_name: str, column: str, row_id: int, value):
+    if value is None:
+        return []
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f'{table_name}.{column} of row {row_id} is not valid JSON: {value!r}') from exc
+    if parsed is None:
+        return []
+    if not isinstance(parsed, list):
+        raise ValueError(f'{table_name}.{column} of row {row_id} is not a JSON list: {value!r}')
+    return parsed
+
+
+def _dump(table_name: str, column: str, row_id: int, value):
+    return json.dumps(value)
+
+
+def _convert(table_name: str, source: str, target: str, source_type, target_type, transform) -> None:
+    """Copy source into target batch by batch, transforming each (row id, value)."""
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer()),
+                     sa.column(source, source_type), sa.column(target, target_type))
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(
+        {target: sa.bindparam('value', type_=target_type)}
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[source])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [
+            {'row_id': row_id, 'value': transform(table_name, source, row_id, value)} for row_id, value in rows
+        ])
+        last_id = rows[-1][0]
+
+
+def _swap(table_name: str, column: str, new_type, transform, old_type) -> None:
+    staging = f'{column}_new'
+    op.add_column(table_name, sa.Column(staging, new_type, nullable=True))
+    _convert(table_name, column, staging, old_type, new_type, transform)
+    with op.batch_alter_table(table_name) as batch_op:
+        batch_op.drop_column(column)
+        batch_op.alter_column(staging, new_column_name=column, existing_type=new_type, nullable=False)
+
+
+def _to_jsonb(table_name: str, column: str) -> None:
+    """Cast in place on PostgreSQL, then hold the column to the same rules as _parse."""
+    bind = op.get_bind()
+    # Invalid JSON text fails the cast itself
+    op.alter_column(table_name, column, type_=postgresql.JSONB(), existing_type=sa.Text(),
+                    postgresql_using=f'{column}::jsonb')
+    op.execute(f"UPDATE {table_name} SET {column} = '[]'::jsonb "
+               f"WHERE {column} IS NULL OR jsonb_typeof({column}) = 'null'")
+    row_id = bind.execute(sa.text(
+        f"SELECT id FROM {table_name} WHERE jsonb_typeof({column}) <> 'array' ORDER BY id LIMIT 1"
+    )).scalar()
+    if row_id is not None:
+        raise ValueError(f'{table_name}.{column} of row {row_id} is not a JSON list')
+    op.alter_column(table_name, column, existing_type=postgresql.JSONB(), nullable=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table_name, column in COLUMNS:
+        if postgres:
+            _to_jsonb(table_name, column)
+        else:
+            _swap(table_name, column, JSON_TYPE, _parse, sa.Text())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table_name, column in COLUMNS:
+        if postgres:
+            op.alter_column(table_name, column, type_=sa.Text(), existing_type=postgresql.JSONB(),
+                            postgresql_using=f'{column}::text')
+        else:
+            _swap(table_name, column, sa.Text(), _dump, JSON_TYPE)
@@ -0,0 +1,41 @@
+"""Add disaster_modules.content_version and phase tree foreign-key indexes
+
+Revision ID: 9b3f6d21e0a4
+Revises: 5d07a3e6c1f8
+Create Date: 2026-10-18 17:48:12.640391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6d21e0a4'
+down_revision: Union[str, Sequence[str], None] = '5d07a3e6c1f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, column) for the selectinload IN lookups
+INDEXES = [
+    ('ix_module_phases_module_id', 'module_phases', 'module_id'),
+    ('ix_phase_checklists_phase_id', 'phase_checklists', 'phase_id'),
+    ('ix_phase_steps_phase_id', 'phase_steps', 'phase_id'),
+    ('ix_phase_qa_phase_id', 'phase_qa', 'phase_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('disaster_modules', sa.Column('content_version', sa.Integer(), server_default='1', nullable=False))
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_column('disaster_modules', 'content_version')
@@ -0,0 +1,56 @@
+"""Add composite and partial indexes for the hot query shapes
+
+Revision ID: a61d0c4b7f25
+Revises: 3f1c2a9d8e41
+Create Date: 2026-10-18 11:40:27.018634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d0c4b7f25'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d8e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial-index predicate or None)
+INDEXES = [
+    ('ix_student_progress_user_module', 'student_progress', ['user_id', 'module_id'], None),
+    ('ix_student_progress_module_completed', 'student_progress', ['module_id', 'completed'], None),
+    ('ix_student_progress_completed_at', 'student_progress', ['completed_at'], 'completed'),
+    ('ix_sos_requests_status_created_at', 'sos_requests', ['status', 'created_at'], None),
+    ('ix_sos_requests_user_created_at', 'sos_requests', ['user_id', 'created_at'], None),
+    ('ix_sos_requests_created_at', 'sos_requests', ['created_at'], None),
+    ('ix_emergency_alerts_active', 'emergency_alerts', ['is_active', 'expires_at', 'severity', 'created_at'], None),
+    ('ix_emergency_alerts_active_severity', 'emergency_alerts', ['severity', 'created_at'], 'is_active'),
+    ('ix_emergency_alerts_created_at', 'emergency_alerts', ['created_at'], None),
+    ('ix_quiz_questions_module_phase', 'quiz_questions', ['module_id', 'phase'], None),
+    ('ix_quiz_attempts_module_id', 'quiz_attempts', ['module_id'], None),
+    ('ix_emergency_contacts_active_priority', 'emergency_contacts', ['is_active', 'priority', 'name'], None),
+    ('ix_emergency_contacts_active', 'emergency_contacts', ['priority', 'name'], 'is_active'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build concurrently on PostgreSQL so live SOS/alert traffic is not blocked
+    with op.get_context().autocommit_block():
+        for name, table, columns, predicate in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(f'{predicate} = true') if predicate else None,
+                sqlite_where=sa.text(f'{predicate} = 1') if predicate else None,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,119 @@
+"""Add search_documents with a full-text index (GIN tsvector / SQLite FTS5)
+
+Revision ID: b8c5e2d7f3a0
+Revises: 7f2d9a4c6b18
+Create Date: 2026-10-18 21:56:09.331470
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c5e2d7f3a0'
+down_revision: Union[str, Sequence[str], None] = '7f2d9a4c6b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Full-text index DDL as of this revision (see SEARCH_INDEX_DDL in app/models/models.py)
+SEARCH_INDEX_DDL = {
+    'postgresql': [
+        "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents "
+        "USING gin (to_tsvector('english', title || ' ' || body))"
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+        "title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+    ]
+}
+
+# Table stubs for the backfill, so it does not depend on the live models
+search_documents = sa.table(
+    'search_documents',
+    sa.column('kind', sa.String), sa.column('source_id', sa.Integer), sa.column('module_id', sa.Integer),
+    sa.column('phase_id', sa.Integer), sa.column('title', sa.Text), sa.column('body', sa.Text)
+)
+disaster_modules = sa.table(
+    'disaster_modules', sa.column('id', sa.Integer), sa.column('title', sa.String), sa.column('description', sa.Text)
+)
+module_phases = sa.table(
+    'module_phases', sa.column('id', sa.Integer), sa.column('module_id', sa.Integer),
+    sa.column('title', sa.String), sa.column('content_focus', sa.Text)
+)
+phase_checklists = sa.table('phase_checklists', sa.column('id', sa.Integer), sa.column('phase_id', sa.Integer),
+                            sa.column('item', sa.Text))
+phase_steps = sa.table('phase_steps', sa.column('id', sa.Integer), sa.column('phase_id', sa.Integer),
+                       sa.column('step', sa.String), sa.column('description', sa.Text))
+phase_qa = sa.table('phase_qa', sa.column('id', sa.Integer), sa.column('phase_id', sa.Integer),
+                    sa.column('question', sa.Text), sa.column('answer', sa.Text))
+
+
+def _text(column):
+    return sa.func.coalesce(column, '')
+
+
+def _backfill_statements():
+    """INSERT ... SELECT per content table, matching the documents events.py indexes."""
+    columns = ['kind', 'source_id', 'module_id', 'phase_id', 'title', 'body']
+    sources = [
+        sa.select(sa.literal('module'), disaster_modules.c.id, disaster_modules.c.id,
+                  sa.null(), _text(disaster_modules.c.title), _text(disaster_modules.c.description)),
+        sa.select(sa.literal('phase'), module_phases.c.id, module_phases.c.module_id,
+                  module_phases.c.id, _text(module_phases.c.title), _text(module_phases.c.content_focus)),
+    ]
+    for kind, child, title, body in (
+        ('checklist', phase_checklists, None, phase_checklists.c.item),
+        ('step', phase_steps, phase_steps.c.step, phase_steps.c.description),
+        ('qa', phase_qa, phase_qa.c.question, phase_qa.c.answer),
+    ):
+        sources.append(
+            sa.select(sa.literal(kind), child.c.id, module_phases.c.module_id, child.c.phase_id,
+                      sa.literal('') if title is None else _text(title), _text(body))
+            .select_from(child.join(module_phases, module_phases.c.id == child.c.phase_id))
+        )
+    return [sa.insert(search_documents).from_select(columns, source) for source in sources]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    sa.Column('phase_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'source_id', name='uq_search_documents_source')
+    )
+    op.create_index(op.f('ix_search_documents_module_id'), 'search_documents', ['module_id'], unique=False)
+
+    bind = op.get_bind()
+    for statement in SEARCH_INDEX_DDL.get(bind.dialect.name, []):
+        op.execute(statement)
+
+    # Backfill from the existing module content (the SQLite triggers fill the FTS table)
+    for statement in _backfill_statements():
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS search_documents_fts')
+    op.drop_index(op.f('ix_search_documents_module_id'), table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,75 @@
+"""Add analytics rollup tables and backfill them
+
+Revision ID: c2e84f19b7a3
+Revises: a61d0c4b7f25
+Create Date: 2026-10-18 14:05:51.207733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e84f19b7a3'
+down_revision: Union[str, Sequence[str], None] = 'a61d0c4b7f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _counter(name: str, type_=sa.Integer()) -> sa.Column:
+    return sa.Column(name, type_, server_default='0', nullable=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('analytics_global_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    _counter('total_users'),
+    _counter('active_users'),
+    _counter('students'),
+    _counter('admins'),
+    _counter('completed_progress'),
+    _counter('active_sos'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('analytics_module_rollup',
+    sa.Column('module_id', sa.Integer(), nullable=False),
+    _counter('completed_count'),
+    _counter('completed_score_sum', sa.BigInteger()),
+    _counter('quiz_attempts'),
+    sa.ForeignKeyConstraint(['module_id'], ['disaster_modules.id'], ),
+    sa.PrimaryKeyConstraint('module_id')
+    )
+    op.create_table('analytics_department_rollup',
+    sa.Column('department', sa.String(), nullable=False),
+    _counter('students'),
+    _counter('completed_count'),
+    _counter('completed_score_sum', sa.BigInteger()),
+    _counter('quiz_attempts'),
+    _counter('sos_requests'),
+    sa.PrimaryKeyConstraint('department')
+    )
+    op.create_table('analytics_daily_rollup',
+    sa.Column('day', sa.Date(), nullable=False),
+    _counter('completions'),
+    _counter('quiz_attempts'),
+    _counter('sos_created'),
+    _counter('sos_resolved'),
+    _counter('alerts_created'),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+    # Backfill from the live tables
+    from app.models.models import GlobalRollup, ModuleRollup, DepartmentRollup, DailyRollup
+    from app.services.rollups import rebuild_rollups
+    rebuild_rollups(op.get_bind(), [GlobalRollup, ModuleRollup, DepartmentRollup, DailyRollup])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('analytics_daily_rollup')
+    op.drop_table('analytics_department_rollup')
+    op.drop_table('analytics_module_rollup')
+    op.drop_table('analytics_global_rollup')
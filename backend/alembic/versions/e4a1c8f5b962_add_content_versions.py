@@ -0,0 +1,32 @@
+"""Add content_versions counters for HTTP ETags
+
+Revision ID: e4a1c8f5b962
+Revises: 9b3f6d21e0a4
+Create Date: 2026-10-18 19:03:27.115842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1c8f5b962'
+down_revision: Union[str, Sequence[str], None] = '9b3f6d21e0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('content_versions',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('content_versions')
@@ -0,0 +1,109 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional, Union
+from datetime import datetime, timedelta
+
+from ..core.database import get_read_db, open_read_session
+from ..core.security import get_admin_user
+from ..models.models import User
+from ..models.schemas import CursorPage, DashboardAnalytics
+from ..services.analytics import AnalyticsService, get_cached_dashboard
+from .emergency import CURSOR_DESCRIPTION
+from ..services.export import EXPORT_FORMATS, EXPORT_TABLES, TableExporter, pyarrow_available
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=DashboardAnalytics)
+def get_dashboard(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get dashboard analytics (Admin only).
+    
+    Served from a shared cache; age_seconds reports how old the numbers are.
+    """
+    return get_cached_dashboard()
+
+
+@router.get("/activities", response_model=Union[List[dict], CursorPage[dict]])
+def get_recent_activities(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get the recent activity feed (Admin only).
+    
+    Returns a plain list, or a cursor page when cursor is given; pass
+    next_cursor back to load the next page.
+    """
+    return AnalyticsService(db).get_recent_activities(limit=limit, cursor=cursor)
+
+
+@router.get("/cohorts/{dimension}")
+def get_cohort_analytics(
+    dimension: str = Path(..., regex="^(department|year)$"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get department or year-of-study x module analytics (Admin only)."""
+    return AnalyticsService(db).get_cohort_analytics(dimension)
+
+
+@router.get("/sos-response-times")
+def get_sos_response_times(
+    start: Optional[datetime] = Query(None, description="Start of the range (default: 30 days ago)"),
+    end: Optional[datetime] = Query(None, description="End of the range, exclusive (default: now)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get SOS time-to-resolve percentiles and breakdowns (Admin only).
+    
+    Durations are in seconds; requests are selected by creation time.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    return AnalyticsService(db).get_sos_response_times(start, end)
+
+
+@router.get("/export/{table}")
+def export_table(
+    table: str,
+    format: str = Query("parquet", regex="^(parquet|csv)$"),
+    current_user: User = Depends(get_admin_user)
+):
+    """Stream a full table dump as Parquet or CSV (Admin only).
+    
+    Rows are read through a server-side cursor one batch at a time.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export table; choose one of: {', '.join(EXPORT_TABLES)}"
+        )
+    if format == "parquet" and not pyarrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow; use format=csv"
+        )
+    
+    def stream():
+        # The response outlives request-scoped dependencies, so use our own session
+        db = open_read_session()
+        try:
+            yield from TableExporter(db.connection(), table).iter_bytes(format)
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'}
+    )
@@ -1,38 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, File, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from typing import Any
+import json
+import shutil
+import tempfile
+from typing import Any, Optional
 
-from ..core.database import get_db
+from ..core.database import get_db, SessionLocal
 from ..core.security import (
-    authenticate_user,
+    authenticate_user_async,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
-    verify_token,
-    get_current_active_user
+    get_password_hash_async,
+    get_user_by_email,
+    get_token_data,
+    revoke_token,
+    bump_token_version,
+    token_claims,
+    verify_refresh_token,
+    get_current_active_user,
+    get_admin_user
 )
 from ..models.models import User
 from ..models.schemas import (
     LoginRequest,
     Token,
+    TokenData,
     UserCreate,
     User as UserSchema,
     ResponseBase
 )
+from ..services.provisioning import BulkProvisioningService
 
 router = APIRouter()
 
 
+def _save_user(db: Session, db_user: User) -> User:
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+
 @router.post("/register", response_model=UserSchema)
-def register_user(
+async def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
     """Register a new user."""
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+    db_user = await run_in_threadpool(get_user_by_email, db, user_data.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,7 +60,7 @@ def register_user(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -51,20 +71,48 @@ def register_user(
         year_of_study=user_data.year_of_study
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    return await run_in_threadpool(_save_user, db, db_user)
+
+
+@router.post("/bulk-import")
+def bulk_import_students(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(csv|ndjson)$"),
+    current_user: User = Depends(get_admin_user)
+):
+    """Bulk register students from a CSV or NDJSON upload (Admin only).
     
-    return db_user
+    Streams back one NDJSON result per row followed by a summary line.
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    
+    # The upload is closed once this handler returns, so keep our own copy
+    upload = tempfile.TemporaryFile()
+    shutil.copyfileobj(file.file, upload)
+    upload.seek(0)
+    
+    def report():
+        db = SessionLocal()
+        try:
+            service = BulkProvisioningService(db)
+            for result in service.import_rows(service.read_rows(upload, format)):
+                yield json.dumps(result) + "\n"
+        finally:
+            db.close()
+            upload.close()
+    
+    return StreamingResponse(report(), media_type="application/x-ndjson")
 
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
     """Authenticate and login a user."""
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -79,8 +127,9 @@ def login_user(
         )
     
     # Create tokens
-    access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    claims = token_claims(user)
+    access_token = create_access_token(data=claims)
+    refresh_token = create_refresh_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -101,28 +150,34 @@ def refresh_token(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        from jose import jwt, JWTError
-        from ..core.config import settings
-        
-        payload = jwt.decode(refresh_token, settings.secret_key, algorithms=[settings.algorithm])
-        email: str = payload.get("sub")
-        token_type: str = payload.get("type")
-        
-        if email is None or token_type != "refresh":
+    token_data = verify_refresh_token(refresh_token, credentials_exception)
+    
+    if token_data.user_id is not None:
+        # Identity comes from the claims; role, version and status from the row
+        row = db.query(User.role, User.token_version, User.is_active).filter(
+            User.id == token_data.user_id
+        ).first()
+        if row is None or not row.is_active or row.token_version != token_data.token_version:
             raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
+        claims = {
+            "sub": token_data.email,
+            "uid": token_data.user_id,
+            "role": row.role.value,
+            "tv": row.token_version
+        }
+    else:
+        # Refresh tokens issued before claims existed need the full row
+        user = db.query(User).filter(User.email == token_data.email).first()
+        if user is None:
+            raise credentials_exception
+        claims = token_claims(user)
     
-    # Check if user exists
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+    # Rotate: the presented refresh token cannot be used again
+    revoke_token(token_data)
     
     # Create new tokens
-    access_token = create_access_token(data={"sub": user.email})
-    new_refresh_token = create_refresh_token(data={"sub": user.email})
+    access_token = create_access_token(data=claims)
+    new_refresh_token = create_refresh_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -141,12 +196,38 @@ def get_current_user_profile(
 
 @router.post("/logout", response_model=ResponseBase)
 def logout_user(
+    refresh_token: Optional[str] = None,
+    token_data: TokenData = Depends(get_token_data),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Logout current user."""
-    # In a production system, you might want to blacklist the token
-    # For now, we'll just return success
+    """Logout current user, revoking the access token and optional refresh token."""
+    revoke_token(token_data)
+    
+    if refresh_token:
+        try:
+            refresh_data = verify_refresh_token(refresh_token, ValueError())
+        except ValueError:
+            refresh_data = None
+        if refresh_data and refresh_data.email == token_data.email:
+            revoke_token(refresh_data)
+    
     return {
         "success": True,
         "message": "Successfully logged out"
+    }
+
+
+@router.post("/logout-all", response_model=ResponseBase)
+def logout_all_sessions(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Invalidate every access and refresh token issued to the current user."""
+    user = db.merge(current_user)
+    bump_token_version(user)
+    db.commit()
+    
+    return {
+        "success": True,
+        "message": "Logged out of all sessions"
     }
\ No newline at end of file
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
+from ..core.pagination import apply_cursor, cursor_page, sort_order
 from ..core.security import get_current_active_user, get_admin_user
 from ..models.models import User, EmergencyAlert, SOSRequest, EmergencyContact
 from ..models.schemas import (
@@ -13,6 +15,7 @@ from ..models.schemas import (
     SOSRequestCreate,
     EmergencyContact as EmergencyContactSchema,
     DataResponse,
+    CursorPage,
     AlertSeverity,
     AlertType
 )
@@ -20,15 +23,81 @@ from ..models.schemas import (
 router = APIRouter()
 
 
+# Listing sort orders; the trailing id makes them unique for cursor pagination
+CONTACT_SORT_KEYS = [
+    (EmergencyContact.priority, False),
+    (EmergencyContact.name, False),
+    (EmergencyContact.id, False)
+]
+ALERT_SORT_KEYS = [
+    (EmergencyAlert.severity, True),
+    (EmergencyAlert.created_at, True),
+    (EmergencyAlert.id, True)
+]
+SOS_SORT_KEYS = [
+    (SOSRequest.created_at, True),
+    (SOSRequest.id, True)
+]
+
+CURSOR_DESCRIPTION = "Opaque cursor from next_cursor; pass an empty value to start cursor pagination"
+
+
+# Query builders shared by the sync routes and their async twins
+def contacts_statement(active_only: bool = True):
+    """Build the emergency contacts listing query."""
+    stmt = select(EmergencyContact)
+    
+    if active_only:
+        stmt = stmt.where(EmergencyContact.is_active == True)
+    
+    return stmt.order_by(*sort_order(CONTACT_SORT_KEYS))
+
+
+def alerts_statement(
+    severity: Optional[AlertSeverity] = None,
+    alert_type: Optional[AlertType] = None,
+    active_only: bool = True
+):
+    """Build the emergency alerts listing query."""
+    stmt = select(EmergencyAlert)
+    
+    if active_only:
+        stmt = stmt.where(EmergencyAlert.is_active == True)
+        # Also filter by expiration
+        stmt = stmt.where(
+            (EmergencyAlert.expires_at == None) | 
+            (EmergencyAlert.expires_at > datetime.utcnow())
+        )
+    
+    if severity:
+        stmt = stmt.where(EmergencyAlert.severity == severity)
+    
+    if alert_type:
+        stmt = stmt.where(EmergencyAlert.alert_type == alert_type)
+    
+    return stmt.order_by(*sort_order(ALERT_SORT_KEYS))
+
+
+def sos_statement(current_user: User, status: Optional[str] = None):
+    """Build the SOS requests listing query visible to a user."""
+    stmt = select(SOSRequest)
+    
+    # Students can only see their own SOS requests
+    if current_user.role.value == "student":
+        stmt = stmt.where(SOSRequest.user_id == current_user.id)
+    
+    if status:
+        stmt = stmt.where(SOSRequest.status == status)
+    
+    return stmt.order_by(*sort_order(SOS_SORT_KEYS))
+
+
 @router.get("/contacts/public")
 def get_emergency_contacts_public(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get emergency contacts (public endpoint for testing)."""
-    contacts = db.query(EmergencyContact).filter(EmergencyContact.is_active == True).order_by(
-        EmergencyContact.priority.asc(),
-        EmergencyContact.name.asc()
-    ).limit(10).all()
+    contacts = db.execute(contacts_statement().limit(10)).scalars().all()
     
     return [{
         "id": contact.id,
@@ -41,59 +110,52 @@ def get_emergency_contacts_public(
     } for contact in contacts]
 
 
-@router.get("/contacts", response_model=List[EmergencyContactSchema])
+@router.get(
+    "/contacts",
+    response_model=Union[List[EmergencyContactSchema], CursorPage[EmergencyContactSchema]]
+)
 def get_emergency_contacts(
     active_only: bool = Query(True),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get emergency contacts."""
-    query = db.query(EmergencyContact)
+    """Get emergency contacts (offset list, or a cursor page when cursor is given)."""
+    stmt = contacts_statement(active_only)
     
-    if active_only:
-        query = query.filter(EmergencyContact.is_active == True)
+    if cursor is not None:
+        stmt = apply_cursor(stmt, CONTACT_SORT_KEYS, cursor).limit(limit + 1)
+        return cursor_page(db.execute(stmt).scalars().all(), CONTACT_SORT_KEYS, limit)
     
-    contacts = query.order_by(
-        EmergencyContact.priority.asc(),
-        EmergencyContact.name.asc()
-    ).offset(skip).limit(limit).all()
+    contacts = db.execute(stmt.offset(skip).limit(limit)).scalars().all()
     
     return contacts
 
 
-@router.get("/alerts", response_model=List[EmergencyAlertSchema])
+@router.get(
+    "/alerts",
+    response_model=Union[List[EmergencyAlertSchema], CursorPage[EmergencyAlertSchema]]
+)
 def get_active_alerts(
     severity: Optional[AlertSeverity] = Query(None),
     alert_type: Optional[AlertType] = Query(None),
     active_only: bool = Query(True),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get emergency alerts."""
-    query = db.query(EmergencyAlert)
+    """Get emergency alerts (offset list, or a cursor page when cursor is given)."""
+    stmt = alerts_statement(severity, alert_type, active_only)
     
-    if active_only:
-        query = query.filter(EmergencyAlert.is_active == True)
-        # Also filter by expiration
-        query = query.filter(
-            (EmergencyAlert.expires_at == None) | 
-            (EmergencyAlert.expires_at > datetime.utcnow())
-        )
-    
-    if severity:
-        query = query.filter(EmergencyAlert.severity == severity)
-    
-    if alert_type:
-        query = query.filter(EmergencyAlert.alert_type == alert_type)
+    if cursor is not None:
+        stmt = apply_cursor(stmt, ALERT_SORT_KEYS, cursor).limit(limit + 1)
+        return cursor_page(db.execute(stmt).scalars().all(), ALERT_SORT_KEYS, limit)
     
-    alerts = query.order_by(
-        EmergencyAlert.severity.desc(),
-        EmergencyAlert.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    alerts = db.execute(stmt.offset(skip).limit(limit)).scalars().all()
     
     return alerts
 
@@ -173,27 +235,26 @@ def trigger_sos(
     return db_sos
 
 
-@router.get("/sos", response_model=List[SOSRequestSchema])
+@router.get(
+    "/sos",
+    response_model=Union[List[SOSRequestSchema], CursorPage[SOSRequestSchema]]
+)
 def get_sos_requests(
     status: Optional[str] = Query(None, regex="^(active|resolved|cancelled)$"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get SOS requests."""
-    query = db.query(SOSRequest)
-    
-    # Students can only see their own SOS requests
-    if current_user.role.value == "student":
-        query = query.filter(SOSRequest.user_id == current_user.id)
+    """Get SOS requests (offset list, or a cursor page when cursor is given)."""
+    stmt = sos_statement(current_user, status)
     
-    if status:
-        query = query.filter(SOSRequest.status == status)
+    if cursor is not None:
+        stmt = apply_cursor(stmt, SOS_SORT_KEYS, cursor).limit(limit + 1)
+        return cursor_page(db.execute(stmt).scalars().all(), SOS_SORT_KEYS, limit)
     
-    sos_requests = query.order_by(
-        SOSRequest.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    sos_requests = db.execute(stmt.offset(skip).limit(limit)).scalars().all()
     
     return sos_requests
 
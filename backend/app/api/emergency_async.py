@@ -0,0 +1,234 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from datetime import datetime
+
+from ..core.database import get_async_db, get_async_read_db
+from ..core.pagination import apply_cursor, cursor_page
+from ..core.security import get_current_active_user_async, get_admin_user_async
+from ..models.models import User, EmergencyAlert, SOSRequest
+from ..models.schemas import (
+    EmergencyAlert as EmergencyAlertSchema,
+    EmergencyAlertCreate,
+    SOSRequest as SOSRequestSchema,
+    SOSRequestCreate,
+    EmergencyContact as EmergencyContactSchema,
+    DataResponse,
+    CursorPage,
+    AlertSeverity,
+    AlertType
+)
+from .emergency import (
+    CONTACT_SORT_KEYS,
+    ALERT_SORT_KEYS,
+    SOS_SORT_KEYS,
+    CURSOR_DESCRIPTION,
+    contacts_statement,
+    alerts_statement,
+    sos_statement,
+    send_alert_notifications,
+    send_sos_notifications
+)
+
+# Async (AsyncSession) versions of the hot emergency routes, mounted ahead of
+# the sync router when settings.use_async_db is enabled.
+router = APIRouter()
+
+
+@router.get("/contacts/public")
+async def get_emergency_contacts_public_async(
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get emergency contacts (public endpoint for testing)."""
+    result = await db.execute(contacts_statement().limit(10))
+    contacts = result.scalars().all()
+    
+    return [{
+        "id": contact.id,
+        "name": contact.name,
+        "role": contact.role,
+        "phone": contact.phone,
+        "email": contact.email,
+        "department": contact.department,
+        "priority": contact.priority
+    } for contact in contacts]
+
+
+@router.get(
+    "/contacts",
+    response_model=Union[List[EmergencyContactSchema], CursorPage[EmergencyContactSchema]]
+)
+async def get_emergency_contacts_async(
+    active_only: bool = Query(True),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Get emergency contacts (offset list, or a cursor page when cursor is given)."""
+    stmt = contacts_statement(active_only)
+    
+    if cursor is not None:
+        stmt = apply_cursor(stmt, CONTACT_SORT_KEYS, cursor).limit(limit + 1)
+        result = await db.execute(stmt)
+        return cursor_page(result.scalars().all(), CONTACT_SORT_KEYS, limit)
+    
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+@router.get(
+    "/alerts",
+    response_model=Union[List[EmergencyAlertSchema], CursorPage[EmergencyAlertSchema]]
+)
+async def get_active_alerts_async(
+    severity: Optional[AlertSeverity] = Query(None),
+    alert_type: Optional[AlertType] = Query(None),
+    active_only: bool = Query(True),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Get emergency alerts (offset list, or a cursor page when cursor is given)."""
+    stmt = alerts_statement(severity, alert_type, active_only)
+    
+    if cursor is not None:
+        stmt = apply_cursor(stmt, ALERT_SORT_KEYS, cursor).limit(limit + 1)
+        result = await db.execute(stmt)
+        return cursor_page(result.scalars().all(), ALERT_SORT_KEYS, limit)
+    
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+@router.post("/alerts", response_model=EmergencyAlertSchema)
+async def create_alert_async(
+    alert_data: EmergencyAlertCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_admin_user_async)
+):
+    """Create a new emergency alert (Admin only)."""
+    db_alert = EmergencyAlert(
+        **alert_data.dict(),
+        created_by=current_user.id
+    )
+    
+    db.add(db_alert)
+    await db.commit()
+    await db.refresh(db_alert)
+    
+    # Add background task to send notifications
+    background_tasks.add_task(send_alert_notifications, db_alert.id)
+    
+    return db_alert
+
+
+@router.put("/alerts/{alert_id}/deactivate", response_model=DataResponse)
+async def deactivate_alert_async(
+    alert_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_admin_user_async)
+):
+    """Deactivate an emergency alert (Admin only)."""
+    alert = await db.get(EmergencyAlert, alert_id)
+    
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alert not found"
+        )
+    
+    alert.is_active = False
+    await db.commit()
+    
+    return {
+        "success": True,
+        "message": "Alert deactivated successfully",
+        "data": {"alert_id": alert_id}
+    }
+
+
+@router.post("/sos", response_model=SOSRequestSchema)
+async def trigger_sos_async(
+    sos_data: SOSRequestCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Trigger an SOS emergency request."""
+    db_sos = SOSRequest(
+        user_id=current_user.id,
+        location=sos_data.location,
+        latitude=sos_data.latitude,
+        longitude=sos_data.longitude,
+        notes=sos_data.notes,
+        status="active"
+    )
+    
+    db.add(db_sos)
+    await db.commit()
+    await db.refresh(db_sos)
+    
+    # Add background task to send emergency notifications
+    background_tasks.add_task(send_sos_notifications, db_sos.id)
+    
+    return db_sos
+
+
+@router.get(
+    "/sos",
+    response_model=Union[List[SOSRequestSchema], CursorPage[SOSRequestSchema]]
+)
+async def get_sos_requests_async(
+    status: Optional[str] = Query(None, regex="^(active|resolved|cancelled)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Get SOS requests (offset list, or a cursor page when cursor is given)."""
+    stmt = sos_statement(current_user, status)
+    
+    if cursor is not None:
+        stmt = apply_cursor(stmt, SOS_SORT_KEYS, cursor).limit(limit + 1)
+        result = await db.execute(stmt)
+        return cursor_page(result.scalars().all(), SOS_SORT_KEYS, limit)
+    
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+@router.put("/sos/{sos_id}/resolve", response_model=DataResponse)
+async def resolve_sos_request_async(
+    sos_id: int,
+    notes: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_admin_user_async)
+):
+    """Resolve an SOS request (Admin only)."""
+    sos_request = await db.get(SOSRequest, sos_id)
+    
+    if not sos_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="SOS request not found"
+        )
+    
+    sos_request.status = "resolved"
+    sos_request.resolved_at = datetime.utcnow()
+    sos_request.resolved_by = current_user.id
+    if notes:
+        sos_request.notes = f"{sos_request.notes or ''}\n\nResolution notes: {notes}"
+    
+    await db.commit()
+    
+    return {
+        "success": True,
+        "message": "SOS request resolved successfully",
+        "data": {"sos_id": sos_id}
+    }
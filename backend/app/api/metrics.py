@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends
+
+from ..core.database import engine, async_engine, replica_router
+from ..core.db_metrics import pool_metrics
+from ..core.security import get_admin_user, hash_pool_stats, principal_cache, token_cache
+from ..models.models import User
+from ..services.analytics import dashboard_cache
+from ..services.module_content import content_cache
+
+router = APIRouter()
+
+
+@router.get("/auth-cache")
+def get_auth_cache_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get principal and token cache sizes and hit/miss counters (Admin only)."""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats()
+    }
+
+
+@router.get("/dashboard-cache")
+def get_dashboard_cache_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get dashboard cache hit/stale/miss counters (Admin only)."""
+    return dashboard_cache.stats()
+
+
+@router.get("/module-content-cache")
+def get_module_content_cache_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get serialized module content cache counters (Admin only)."""
+    return content_cache.stats()
+
+
+@router.get("/password-hashing")
+def get_password_hashing_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get bcrypt worker pool size and queue depth (Admin only)."""
+    return hash_pool_stats()
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics(
+    current_user: User = Depends(get_admin_user)
+):
+    """Get connection pool occupancy, checkout waits and timeouts (Admin only)."""
+    return {
+        "primary": pool_metrics(engine),
+        "async": pool_metrics(async_engine.sync_engine) if async_engine is not None else None,
+        "replicas": [
+            dict(status, pool=pool_metrics(replica_engine))
+            for status, replica_engine in zip(replica_router.status(), replica_router.engines)
+        ] if replica_router is not None else []
+    }
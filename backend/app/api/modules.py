@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
+from ..core.http_cache import cache_headers, current_versions, make_etag, not_modified
 from ..core.security import get_current_active_user, get_admin_user
+from ..models.events import MODULES_SCOPE, questions_scope
 from ..models.models import User, DisasterModule, StudentProgress, QuizQuestion
 from ..models.schemas import (
     DisasterModule as DisasterModuleSchema,
@@ -11,21 +16,114 @@ from ..models.schemas import (
     StudentProgress as StudentProgressSchema,
     StudentProgressUpdate,
     QuizQuestion as QuizQuestionSchema,
+    ModuleContent as ModuleContentSchema,
+    QuizSubmission,
+    QuizResult,
+    ModuleSearchResult,
     DataResponse
 )
+from ..services.module_content import ModuleContentService
+from ..services.quiz import QuizGradingService
+from ..services.search import SearchService
 
 router = APIRouter()
 
 
+# Query builders shared by the sync routes and their async twins
+def progress_statement(user_id: int, module_id: Optional[int] = None):
+    """Build the progress query for a user (optionally a single module)."""
+    stmt = select(StudentProgress).where(StudentProgress.user_id == user_id)
+    
+    if module_id is not None:
+        stmt = stmt.where(StudentProgress.module_id == module_id)
+    
+    return stmt
+
+
+def questions_statement(module_id: int, phase: Optional[str] = None):
+    """Build the quiz question query for a module, in id order."""
+    stmt = select(QuizQuestion).where(QuizQuestion.module_id == module_id)
+    
+    if phase:
+        stmt = stmt.where(QuizQuestion.phase == phase)
+    
+    return stmt.order_by(QuizQuestion.id)
+
+
+def questions_json(db: Session, module_id: int, phase: Optional[str] = None) -> Optional[bytes]:
+    """Render a module's questions as a JSON array inside the database.
+    
+    Returns None on dialects without JSON aggregation, where callers fall
+    back to loading and serializing the rows.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return None
+    
+    questions = questions_statement(module_id, phase).subquery()
+    fields = [
+        "id", questions.c.id,
+        "module_id", questions.c.module_id,
+        "question", questions.c.question,
+        # SQLite stores JSON as text; json() embeds it as a value, not a string
+        "options", questions.c.options if dialect == "postgresql" else func.json(questions.c.options),
+        "phase", questions.c.phase
+    ]
+    
+    if dialect == "postgresql":
+        document = func.json_agg(aggregate_order_by(func.json_build_object(*fields), questions.c.id))
+    else:
+        # The subquery's ORDER BY carries through to json_group_array
+        document = func.json_group_array(func.json_object(*fields))
+    
+    body = db.execute(select(cast(document, Text))).scalar()
+    return (body or "[]").encode()
+
+
+def apply_progress_update(progress: StudentProgress, progress_data: StudentProgressUpdate):
+    """Apply a progress update, stamping completed_at on first completion."""
+    # Set completed_at timestamp if marking as completed
+    if progress_data.completed and not progress.completed:
+        progress.completed_at = datetime.utcnow()
+    
+    # Update fields
+    for field, value in progress_data.dict(exclude_unset=True).items():
+        setattr(progress, field, value)
+
+
+def active_module_version(db: Session, module_id: int) -> int:
+    """Content version of an active module; 404 if it is missing or deleted."""
+    version = ModuleContentService(db).content_version(module_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Module not found"
+        )
+    return version
+
+
+def module_versions(module_id: int, content_version: int) -> dict:
+    """ETag versions for representations derived from one module."""
+    return {f"module:{module_id}": content_version}
+
+
 @router.get("/", response_model=List[DisasterModuleSchema])
 def get_all_modules(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     active_only: bool = Query(True),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all disaster modules."""
+    etag = make_etag(current_versions(db, MODULES_SCOPE))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(cache_headers(etag))
+    
     query = db.query(DisasterModule)
     
     if active_only:
@@ -35,13 +133,33 @@ def get_all_modules(
     return modules
 
 
+# Registered before /{module_id} so "search" is not parsed as a module id
+@router.get("/search", response_model=List[ModuleSearchResult])
+def search_modules(
+    q: str = Query(..., min_length=2, max_length=200, description="Free-text query"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Search module titles, phases, checklists, steps and Q&A, best matches first."""
+    return SearchService(db).search(q, limit=limit)
+
+
 @router.get("/{module_id}", response_model=DisasterModuleSchema)
 def get_module(
     module_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific disaster module."""
+    # Any change to the module row bumps its content_version
+    etag = make_etag(module_versions(module_id, active_module_version(db, module_id)))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
     module = db.query(DisasterModule).filter(
         DisasterModule.id == module_id,
         DisasterModule.is_active == True
@@ -53,6 +171,7 @@ def get_module(
             detail="Module not found"
         )
     
+    response.headers.update(cache_headers(etag))
     return module
 
 
@@ -82,33 +201,108 @@ def create_module(
     return db_module
 
 
+@router.get("/{module_id}/content", response_model=ModuleContentSchema)
+def get_module_content(
+    module_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a module's full before/during/after content tree."""
+    version = active_module_version(db, module_id)
+    etag = make_etag(module_versions(module_id, version))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    body = ModuleContentService(db).content_json(module_id, version)
+    
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Module not found"
+        )
+    
+    # Already serialized (and cached); skip response_model re-validation
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+
+
 @router.get("/{module_id}/questions", response_model=List[QuizQuestionSchema])
 def get_module_questions(
     module_id: int,
+    request: Request,
+    response: Response,
     phase: Optional[str] = Query(None, regex="^(before|during|after)$"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get quiz questions for a module."""
-    # Verify module exists
-    module = db.query(DisasterModule).filter(
-        DisasterModule.id == module_id,
-        DisasterModule.is_active == True
-    ).first()
+    # Existence first, so a stale If-None-Match never turns a 404 into a 304
+    versions = module_versions(module_id, active_module_version(db, module_id))
+    versions.update(current_versions(db, questions_scope(module_id)))
+    etag = make_etag(versions)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     
-    if not module:
+    # The database renders the JSON array itself where it can
+    body = questions_json(db, module_id, phase)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+    
+    # Id order is the order POST /{module_id}/quiz expects answers in
+    questions = db.execute(questions_statement(module_id, phase)).scalars().all()
+    response.headers.update(cache_headers(etag))
+    return questions
+
+
+@router.post("/{module_id}/quiz", response_model=QuizResult)
+def submit_quiz(
+    module_id: int,
+    submission: QuizSubmission,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Submit and grade a module quiz, or one phase of it.
+    
+    Answers are matched to the phase's (or whole module's) questions in
+    ascending id order, as served by GET /{module_id}/questions.
+    """
+    service = QuizGradingService(db)
+    key = service.answer_key(module_id, submission.phase)
+    
+    if key is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Module not found"
+            detail="Module not found or has no quiz"
         )
     
-    query = db.query(QuizQuestion).filter(QuizQuestion.module_id == module_id)
+    if len(submission.answers) != len(key.correct):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Expected {len(key.correct)} answers, got {len(submission.answers)}"
+        )
     
-    if phase:
-        query = query.filter(QuizQuestion.phase == phase)
+    invalid = service.invalid_answers(key, submission.answers)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Answers at positions {invalid} are not valid option indexes"
+        )
     
-    questions = query.all()
-    return questions
+    results = service.grade(key, submission.answers)
+    attempt = service.submit(current_user.id, module_id, submission.answers, results, submission.phase)
+    
+    return {
+        "attempt_id": attempt.id,
+        "module_id": module_id,
+        "phase": attempt.phase,
+        "score": attempt.score,
+        "total_questions": attempt.total_questions,
+        "percentage": round(attempt.score * 100 / attempt.total_questions),
+        "correct": results,
+        "completed_at": attempt.completed_at
+    }
 
 
 @router.get("/{module_id}/progress", response_model=StudentProgressSchema)
@@ -118,10 +312,9 @@ def get_user_module_progress(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user's progress for a specific module."""
-    progress = db.query(StudentProgress).filter(
-        StudentProgress.user_id == current_user.id,
-        StudentProgress.module_id == module_id
-    ).first()
+    progress = db.execute(
+        progress_statement(current_user.id, module_id)
+    ).scalars().first()
     
     if not progress:
         # Create initial progress record
@@ -147,10 +340,9 @@ def update_user_module_progress(
     current_user: User = Depends(get_current_active_user)
 ):
     """Update current user's progress for a specific module."""
-    progress = db.query(StudentProgress).filter(
-        StudentProgress.user_id == current_user.id,
-        StudentProgress.module_id == module_id
-    ).first()
+    progress = db.execute(
+        progress_statement(current_user.id, module_id)
+    ).scalars().first()
     
     if not progress:
         raise HTTPException(
@@ -158,14 +350,7 @@ def update_user_module_progress(
             detail="Progress record not found"
         )
     
-    # Update fields
-    for field, value in progress_data.dict(exclude_unset=True).items():
-        setattr(progress, field, value)
-    
-    # Set completed_at timestamp if marking as completed
-    if progress_data.completed and not progress.completed:
-        from datetime import datetime
-        progress.completed_at = datetime.utcnow()
+    apply_progress_update(progress, progress_data)
     
     db.commit()
     db.refresh(progress)
@@ -176,7 +361,7 @@ def update_user_module_progress(
 @router.get("/user/{user_id}/progress", response_model=List[StudentProgressSchema])
 def get_user_progress(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a user's progress across all modules."""
@@ -187,9 +372,7 @@ def get_user_progress(
             detail="Not enough permissions"
         )
     
-    progress = db.query(StudentProgress).filter(
-        StudentProgress.user_id == user_id
-    ).all()
+    progress = db.execute(progress_statement(user_id)).scalars().all()
     
     return progress
 
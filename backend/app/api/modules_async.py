@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from ..core.database import get_async_db, get_async_read_db
+from ..core.security import get_current_active_user_async
+from ..models.models import User, StudentProgress
+from ..models.schemas import (
+    StudentProgress as StudentProgressSchema,
+    StudentProgressUpdate
+)
+from .modules import progress_statement, apply_progress_update
+
+# Async (AsyncSession) versions of the progress routes, mounted ahead of the
+# sync router when settings.use_async_db is enabled.
+router = APIRouter()
+
+
+@router.get("/{module_id}/progress", response_model=StudentProgressSchema)
+async def get_user_module_progress_async(
+    module_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Get current user's progress for a specific module."""
+    result = await db.execute(progress_statement(current_user.id, module_id))
+    progress = result.scalars().first()
+    
+    if not progress:
+        # Create initial progress record
+        progress = StudentProgress(
+            user_id=current_user.id,
+            module_id=module_id,
+            completed=False,
+            score=0,
+            time_spent=0
+        )
+        db.add(progress)
+        await db.commit()
+        await db.refresh(progress)
+    
+    return progress
+
+
+@router.put("/{module_id}/progress", response_model=StudentProgressSchema)
+async def update_user_module_progress_async(
+    module_id: int,
+    progress_data: StudentProgressUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Update current user's progress for a specific module."""
+    result = await db.execute(progress_statement(current_user.id, module_id))
+    progress = result.scalars().first()
+    
+    if not progress:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Progress record not found"
+        )
+    
+    apply_progress_update(progress, progress_data)
+    
+    await db.commit()
+    await db.refresh(progress)
+    
+    return progress
+
+
+@router.get("/user/{user_id}/progress", response_model=List[StudentProgressSchema])
+async def get_user_progress_async(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async)
+):
+    """Get a user's progress across all modules."""
+    # Check if current user can view this data
+    if current_user.id != user_id and current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    result = await db.execute(progress_statement(user_id))
+    return result.scalars().all()
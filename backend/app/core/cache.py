@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, optionally with an entry-specific time-to-live."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove a key and return its value (None if it was not cached)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry else None
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class StaleWhileRevalidateCache:
+    """Per-key result cache that serves stale values while a refresh runs.
+
+    Fresh entries (younger than ttl) are returned as-is. Entries within the
+    stale window are returned immediately while one background thread
+    recomputes them. On a miss, concurrent callers share one computation.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[Hashable, tuple] = {}
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, float, bool]:
+        """Return (value, computed_at unix time, stale) for key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, computed_at, computed_mono = entry
+                age = time.monotonic() - computed_mono
+                if age < self.ttl:
+                    self.hits += 1
+                    return value, computed_at, False
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._in_flight:
+                        self._in_flight[key] = Future()
+                        threading.Thread(
+                            target=self._compute, args=(key, compute), daemon=True
+                        ).start()
+                    return value, computed_at, True
+
+            self.misses += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+
+        if leader:
+            self._compute(key, compute)
+        value, computed_at = future.result()
+        return value, computed_at, False
+
+    def _compute(self, key: Hashable, compute: Callable[[], Any]) -> None:
+        future = self._in_flight[key]
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(exc)
+            return
+
+        computed_at = time.time()
+        with self._lock:
+            self._entries[key] = (value, computed_at, time.monotonic())
+            del self._in_flight[key]
+            self.refreshes += 1
+        future.set_result((value, computed_at))
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value so the next caller recomputes it."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "in_flight": len(self._in_flight)
+            }
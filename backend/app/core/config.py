@@ -8,9 +8,24 @@ class Settings(BaseSettings):
     app_name: str = "Suraksha Backend"
     app_version: str = "1.0.0"
     debug: bool = True
+    query_stats_enabled: bool = False  # X-DB-Queries/X-DB-Time headers on every response
     
     # Database
     database_url: str
+    use_async_db: bool = False  # serve hot routes through asyncpg/AsyncSession
+    async_database_url: Optional[str] = None  # derived from database_url if unset
+    
+    # Connection pools (sync pool serves the threadpool, async pool the event loop)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_async_pool_size: int = 10
+    db_async_max_overflow: int = 20
+    
+    # Read replicas (read-only routes are spread over these when set)
+    database_replica_urls: List[str] = []
+    replica_health_check_interval_seconds: int = 10
+    read_your_writes_window_seconds: int = 10  # keep a writer's reads on the primary
     
     # Security
     secret_key: str
@@ -18,6 +33,48 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 30
     
+    # Principal cache (authenticated users kept in-process between requests)
+    principal_cache_enabled: bool = True
+    principal_cache_ttl_seconds: int = 60
+    principal_cache_max_size: int = 10000
+    
+    # Verified access-token cache (entries live until the token's exp)
+    token_cache_enabled: bool = True
+    token_cache_max_size: int = 50000
+    
+    # Password hashing worker pool (defaults to one worker per CPU)
+    password_hash_workers: Optional[int] = None
+    password_hash_queue_depth: int = 64
+    
+    # Bulk student import
+    bulk_import_batch_size: int = 1000
+    bulk_import_hash_workers: Optional[int] = None
+    
+    # Token revocation ("memory" or "redis", which uses redis_url)
+    token_revocation_backend: str = "memory"
+    revocation_bloom_capacity: int = 100000
+    revocation_bloom_error_rate: float = 0.001
+    revocation_sync_interval_seconds: float = 5.0
+    
+    # Admin dashboard result cache (stale values are served while one refresh runs)
+    dashboard_cache_ttl_seconds: int = 30
+    dashboard_stale_ttl_seconds: int = 300
+    dashboard_section_timeout_seconds: float = 5.0  # slower sections are reported degraded
+    dashboard_section_workers: int = 8
+    
+    # Serialized module content, keyed by (module id, content_version)
+    module_content_cache_max_size: int = 256
+    
+    # Quiz answer keys, keyed by module and question versions
+    answer_key_cache_max_size: int = 1024
+    
+    # Cache-Control for ETagged module/question reads: browsers reuse them for
+    # max-age, shared caches must revalidate (so auth is still checked)
+    content_cache_control: str = "public, max-age=60, s-maxage=0, proxy-revalidate"
+    
+    # Table exports (rows fetched per server-side cursor batch)
+    export_batch_size: int = 10000
+    
     # CORS
     cors_origins: List[str] = [
         "http://localhost:3000",
@@ -1,15 +1,30 @@
-from sqlalchemy import create_engine
+import hashlib
+import hmac
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
+from .db_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from .query_stats import install as install_query_stats
+from .replicas import ReplicaRouter
 
 # Create database engine
 engine = create_engine(
     settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
     pool_pre_ping=True,
     pool_recycle=3600
 )
 
+install_query_stats(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -17,10 +32,202 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# Optional read replicas for read-only routes
+replica_router = ReplicaRouter(
+    settings.database_replica_urls,
+    health_check_interval=settings.replica_health_check_interval_seconds,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=True,
+    pool_recycle=3600
+) if settings.database_replica_urls else None
+
+if replica_router is not None:
+    for replica_engine in replica_router.engines:
+        install_query_stats(replica_engine)
+
+# Read-your-writes: a request that commits a write hands the client a marker
+# (cookie and response header) holding the commit time. While it is younger
+# than the replica lag window, that client's reads stay on the primary. The
+# marker travels with the client, so it holds across workers and token refreshes.
+# It is signed with the app secret, so clients cannot pin themselves (or
+# anyone else) to the primary with a made-up or far-future timestamp.
+WRITE_MARKER = "X-DB-Write-At"
+WRITE_MARKER_COOKIE = "db_write_at"
+
+
+def _marker_signature(timestamp: str) -> str:
+    return hmac.new(
+        settings.secret_key.encode(), f"{WRITE_MARKER}:{timestamp}".encode(), hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def sign_write_marker(written_at: float) -> str:
+    """Get the signed marker value for a write committed at written_at."""
+    timestamp = f"{written_at:.3f}"
+    return f"{timestamp}:{_marker_signature(timestamp)}"
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_session_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    # Recorded at commit time, before the response reaches the client
+    request = session.info.get("request")
+    if request is not None and session.info.pop("wrote", False):
+        request.state.db_write_at = time.time()
+
+
+def set_write_marker(request: Request, response: Response) -> None:
+    """Attach the write marker to the response if the request committed a write."""
+    written_at = getattr(request.state, "db_write_at", None)
+    if written_at is None:
+        return
+    marker = sign_write_marker(written_at)
+    response.headers[WRITE_MARKER] = marker
+    response.set_cookie(
+        WRITE_MARKER_COOKIE, marker,
+        max_age=settings.read_your_writes_window_seconds, httponly=True, samesite="lax"
+    )
+
+
+def _wrote_recently(request: Request) -> bool:
+    marker = request.headers.get(WRITE_MARKER) or request.cookies.get(WRITE_MARKER_COOKIE)
+    if not marker:
+        return False
+    timestamp, _, signature = marker.partition(":")
+    if not hmac.compare_digest(signature, _marker_signature(timestamp)):
+        return False
+    try:
+        age = time.time() - float(timestamp)
+    except ValueError:
+        return False
+    # Allow a little clock skew between workers, nothing from the future beyond it
+    return -1.0 <= age < settings.read_your_writes_window_seconds
+
+
 # Dependency to get database session
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    if replica_router is not None:
+        db.info["request"] = request
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def open_read_session(use_replica: bool = True) -> Session:
+    """Open a session on a healthy replica, falling back to the primary."""
+    if use_replica and replica_router is not None:
+        index = replica_router.pick()
+        if index is not None:
+            db = replica_router.session_factories[index]()
+            try:
+                db.connection()
+                return db
+            except OperationalError:
+                db.close()
+                replica_router.mark_unhealthy(index)
+    return SessionLocal()
+
+
+# Dependency to get a read-only session, served by a replica when possible
+def get_read_db(request: Request):
+    db = open_read_session(use_replica=not _wrote_recently(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def async_driver_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (asyncpg / aiosqlite)."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def get_async_database_url(url: str) -> str:
+    """Get the async URL of the primary (settings.async_database_url wins)."""
+    if settings.async_database_url:
+        return settings.async_database_url
+    return async_driver_url(url)
+
+
+# Async engines, only created when the async request path is enabled
+async_engine = None
+AsyncSessionLocal = None
+# Async twins of the replica engines; health and round-robin come from replica_router
+async_replica_engines = []
+async_replica_session_factories = []
+
+if settings.use_async_db:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    def _create_async_engine(url: str):
+        new_engine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.db_async_pool_size,
+            max_overflow=settings.db_async_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=True,
+            pool_recycle=3600
+        )
+        install_query_stats(new_engine.sync_engine)
+        return new_engine
+
+    async_engine = _create_async_engine(get_async_database_url(settings.database_url))
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    if replica_router is not None:
+        async_replica_engines = [
+            _create_async_engine(async_driver_url(url))
+            for url in settings.database_replica_urls
+        ]
+        async_replica_session_factories = [
+            async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+            for replica_engine in async_replica_engines
+        ]
+
+
+# Dependency to get an async database session
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        if replica_router is not None:
+            db.info["request"] = request
+        yield db
+
+
+async def open_async_read_session(use_replica: bool = True):
+    """Open an async session on a healthy replica, falling back to the primary."""
+    if use_replica and replica_router is not None and async_replica_session_factories:
+        index = replica_router.pick()
+        if index is not None:
+            db = async_replica_session_factories[index]()
+            try:
+                await db.connection()
+                return db
+            except OperationalError:
+                await db.close()
+                replica_router.mark_unhealthy(index)
+    return AsyncSessionLocal()
+
+
+# Dependency to get a read-only async session, served by a replica when possible
+async def get_async_read_db(request: Request):
+    db = await open_async_read_session(use_replica=not _wrote_recently(request))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        await db.close()
@@ -0,0 +1,97 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Checkout wait histogram and timeout counters for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(CHECKOUT_BUCKETS) + 1)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+        self.peak_in_use = 0
+
+    def observe_checkout(self, seconds: float, in_use: int) -> None:
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.peak_in_use = max(self.peak_in_use, in_use)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        """Get current pool occupancy plus the accumulated wait statistics."""
+        with self._lock:
+            buckets = {
+                f"le_{bound}": count
+                for bound, count in zip(CHECKOUT_BUCKETS, self.bucket_counts)
+            }
+            buckets["le_inf"] = self.bucket_counts[-1]
+            return {
+                "pool_size": pool.size(),
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "peak_in_use": self.peak_in_use,
+                "timeouts": self.timeouts,
+                "checkouts": self.checkouts,
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_histogram": buckets
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        # Keep the counters across engine.dispose()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_metrics(engine) -> Optional[Dict[str, Any]]:
+    """Get metrics for an engine's pool (None if it is not instrumented)."""
+    pool = engine.pool
+    if not hasattr(pool, "metrics"):
+        return None
+    return pool.metrics.snapshot(pool)
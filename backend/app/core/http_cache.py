@@ -0,0 +1,41 @@
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+
+def current_versions(db: Session, *scopes: str) -> Dict[str, int]:
+    """Read content-version counters (0 for scopes never bumped) in one query."""
+    from ..models.models import ContentVersion
+
+    versions = dict(db.execute(
+        select(ContentVersion.scope, ContentVersion.version).where(ContentVersion.scope.in_(scopes))
+    ).all())
+    return {scope: versions.get(scope, 0) for scope in scopes}
+
+
+def make_etag(versions: Dict[str, int]) -> str:
+    """Strong ETag for a representation built from the given versions."""
+    return '"' + "-".join(f"{scope}.{version}" for scope, version in sorted(versions.items())) + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates: Iterable[str] = (candidate.strip() for candidate in if_none_match.split(","))
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return any(candidate == "*" or candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": settings.content_cache_control}
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the client already holds this version, else None."""
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
+    return None
@@ -0,0 +1,162 @@
+import base64
+import binascii
+import enum
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, false, literal, or_, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# A sort key is (column, descending); the last key must be unique (the id).
+# NULLs sort as the greatest value (PostgreSQL's default), on every dialect.
+SortKeys = Sequence[Tuple[Any, bool]]
+
+
+class _instant(FunctionElement):
+    """A timestamp as compared by sort and cursor: the value itself, except on
+    SQLite, where server-default and ORM-written DATETIME text differ in format
+    and are normalized before comparing."""
+    inherit_cache = True
+
+    def __init__(self, expression):
+        super().__init__(expression)
+        self.type = expression.type
+
+
+@compiles(_instant)
+def _compile_instant(element, compiler, **kw):
+    return compiler.process(element.clauses.clauses[0], **kw)
+
+
+@compiles(_instant, "sqlite")
+def _compile_instant_sqlite(element, compiler, **kw):
+    return f"strftime('%Y-%m-%d %H:%M:%f', {compiler.process(element.clauses.clauses[0], **kw)})"
+
+
+def _nullable(column) -> bool:
+    return getattr(column.expression, "nullable", False)
+
+
+def _sort_expression(column):
+    if isinstance(column.type, DateTime):
+        return _instant(column)
+    return column
+
+
+def _bound(column, value):
+    # Bound in the column's own type so it compares like the stored values
+    return _sort_expression(literal(value, column.type))
+
+
+def sort_order(keys: SortKeys) -> list:
+    """Get ORDER BY clauses for a list of sort keys."""
+    clauses = []
+    for column, descending in keys:
+        clause = _sort_expression(column)
+        clause = clause.desc() if descending else clause.asc()
+        if _nullable(column):
+            clause = clause.nulls_first() if descending else clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if issubclass(python_type, enum.Enum):
+        return python_type[value]
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(row: Any, keys: SortKeys) -> str:
+    """Encode the sort-key values of a row as an opaque cursor token."""
+    values = [_encode_value(getattr(row, column.key)) for column, _ in keys]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: SortKeys) -> List[Any]:
+    """Decode a cursor token back into typed sort-key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        return [_decode_value(column, value) for (column, _), value in zip(keys, values)]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def apply_cursor(stmt, keys: SortKeys, cursor: Optional[str]):
+    """Restrict a statement to the rows that sort after the cursor."""
+    if not cursor:
+        return stmt
+    return stmt.where(cursor_condition(keys, decode_cursor(cursor, keys)))
+
+
+def cursor_condition(keys: SortKeys, values: Sequence[Any], inclusive: bool = False):
+    """Condition for the rows that sort after the given key values (or at them, if inclusive)."""
+    directions = {descending for _, descending in keys}
+
+    # Row-value comparison lets the database seek straight into the index. It
+    # skips NULLs, which is only right when they sorted before the cursor.
+    if len(directions) == 1 and None not in values and (
+        directions == {True} or not any(_nullable(column) for column, _ in keys)
+    ):
+        columns = tuple_(*[_sort_expression(column) for column, _ in keys])
+        bounds = tuple_(*[_bound(column, value) for (column, _), value in zip(keys, values)])
+        if directions.pop():
+            return columns <= bounds if inclusive else columns < bounds
+        return columns >= bounds if inclusive else columns > bounds
+
+    # Otherwise: (a > x) OR (a = x AND b < y) OR ...
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [_equal(*keys[j], values[j]) for j in range(i)]
+        clauses.append(and_(*equal, _beyond(column, descending, values[i])))
+    if inclusive:
+        clauses.append(and_(*[_equal(*keys[j], values[j]) for j in range(len(keys))]))
+    return or_(*clauses)
+
+
+def _equal(column, descending: bool, value):
+    if value is None:
+        return column.is_(None)
+    return _sort_expression(column) == _bound(column, value)
+
+
+def _beyond(column, descending: bool, value):
+    """Rows that sort after value in this key alone (NULL is the greatest)."""
+    if value is None:
+        return column.is_not(None) if descending else false()
+    if descending:
+        return _sort_expression(column) < _bound(column, value)
+    beyond = _sort_expression(column) > _bound(column, value)
+    return or_(beyond, column.is_(None)) if _nullable(column) else beyond
+
+
+def cursor_page(rows: Sequence[Any], keys: SortKeys, limit: int) -> dict:
+    """Build the cursor envelope from up to limit + 1 fetched rows."""
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(items[-1], keys) if has_more else None,
+        "has_more": has_more
+    }
@@ -0,0 +1,89 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+
+# Every QueryStats collector active in the current context (request, test, ...)
+_active: ContextVar[Tuple["QueryStats", ...]] = ContextVar("query_stats", default=())
+
+# Collapses "IN (?, ?, ?)" style placeholder lists so they share one shape
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so repeats with different parameters match."""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement)).strip()
+
+
+class QueryStats:
+    """Statement count, total DB time and statement shapes for one unit of work."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        """Get statement shapes run at least threshold times (likely N+1s)."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.2f} ms"]
+        for shape, n in self.repeated():
+            lines.append(f"  {n}x {shape}")
+        return "\n".join(lines)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active.get()
+    if not collectors:
+        return
+    starts = conn.info.get("query_start")
+    duration = time.perf_counter() - starts.pop() if starts else 0.0
+    for stats in collectors:
+        stats.record(statement, duration)
+
+
+def install(engine) -> None:
+    """Attach the statement counter to an engine (sync engine of async ones)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in the current context."""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Test helper: fail if the block runs more than limit statements.
+
+    The failure message lists statement shapes that ran more than once, which
+    is usually where an N+1 loop is hiding.
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.report()}")
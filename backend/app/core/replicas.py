@@ -0,0 +1,79 @@
+import itertools
+import logging
+import threading
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from .db_metrics import InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """Round-robin over healthy read replicas with periodic health checks."""
+
+    def __init__(self, urls: List[str], health_check_interval: float = 10.0, **engine_kwargs):
+        self.engines = [
+            create_engine(url, poolclass=InstrumentedQueuePool, **engine_kwargs)
+            for url in urls
+        ]
+        self.session_factories = [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in self.engines
+        ]
+        self.health_check_interval = health_check_interval
+        self._healthy = [True] * len(self.engines)
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def pick(self) -> Optional[int]:
+        """Get the index of the next healthy replica (None if all are down)."""
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = next(self._cycle)
+                if self._healthy[index]:
+                    return index
+        return None
+
+    def mark_unhealthy(self, index: int) -> None:
+        if self._healthy[index]:
+            logger.warning("Read replica %s marked unhealthy", index)
+        self._healthy[index] = False
+
+    def check(self) -> None:
+        """Ping every replica and update its health flag."""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception:
+                self.mark_unhealthy(index)
+            else:
+                if not self._healthy[index]:
+                    logger.info("Read replica %s is healthy again", index)
+                self._healthy[index] = True
+
+    def start_health_checks(self) -> None:
+        if self._thread is not None or not self.engines:
+            return
+
+        def run():
+            while not self._stop.wait(self.health_check_interval):
+                self.check()
+
+        self._thread = threading.Thread(target=run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop_health_checks(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def status(self) -> List[dict]:
+        return [
+            {"replica": index, "healthy": healthy, "url": engine.url.render_as_string(hide_password=True)}
+            for index, (engine, healthy) in enumerate(zip(self.engines, self._healthy))
+        ]
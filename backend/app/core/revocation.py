@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no deletes; rebuild to shrink)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class InMemoryRevocationBackend:
+    """Pure-Python revocation backend for tests and single-process deployments."""
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[jti] = expires_at
+
+    def contains(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def active(self) -> Iterable[str]:
+        """Drop expired entries and return the jtis that are still revoked."""
+        now = time.time()
+        with self._lock:
+            self._entries = {jti: exp for jti, exp in self._entries.items() if exp > now}
+            return list(self._entries)
+
+
+class RedisRevocationBackend:
+    """Redis (or any Redis-compatible server) revocation backend."""
+
+    def __init__(self, url: str, prefix: str = "revoked:"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def add(self, jti: str, expires_at: float) -> None:
+        # Redis drops the key once the token itself would have expired
+        ttl = max(1, int(math.ceil(expires_at - time.time())))
+        self._client.set(self._prefix + jti, int(expires_at), ex=ttl)
+
+    def contains(self, jti: str) -> bool:
+        return bool(self._client.exists(self._prefix + jti))
+
+    def active(self) -> Iterable[str]:
+        prefix_len = len(self._prefix)
+        return [
+            key.decode()[prefix_len:]
+            for key in self._client.scan_iter(match=self._prefix + "*", count=1000)
+        ]
+
+
+class RevocationStore:
+    """Token denylist with an in-memory Bloom filter in front of a backend.
+
+    Almost every token checked is not revoked; the Bloom filter answers those
+    locally without touching the backend. Possible hits are confirmed against
+    the backend. A background thread rebuilds the filter from the backend
+    every sync interval and swaps it in, which picks up revocations made by
+    other workers and forgets expired ones without a backend scan on the
+    request path.
+    """
+
+    def __init__(self, backend, capacity: int = 100000, error_rate: float = 0.001,
+                 sync_interval: float = 5.0):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        # Revocations made while a rebuild is scanning the backend
+        self._pending: Optional[List[str]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke a token id until its expiry timestamp."""
+        if expires_at <= time.time():
+            return
+        self.backend.add(jti, expires_at)
+        with self._lock:
+            self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check whether a token id has been revoked."""
+        if jti not in self._bloom:
+            return False
+        return self.backend.contains(jti)
+
+    def sync(self) -> None:
+        """Rebuild the Bloom filter from the backend and swap it in."""
+        with self._lock:
+            self._pending = []
+        try:
+            bloom = BloomFilter(self.capacity, self.error_rate)
+            for jti in self.backend.active():
+                bloom.add(jti)
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        # Revocations that landed after the scan started may be missing from it
+        with self._lock:
+            for jti in self._pending:
+                bloom.add(jti)
+            self._pending = None
+            self._bloom = bloom
+
+    def start_sync(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self.sync_interval):
+                try:
+                    self.sync()
+                except Exception:
+                    logger.exception("Revocation filter sync failed; keeping the previous filter")
+
+        self._thread = threading.Thread(target=run, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop_sync(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+
+def create_revocation_store() -> RevocationStore:
+    """Create the revocation store configured in settings."""
+    if settings.token_revocation_backend == "redis":
+        backend = RedisRevocationBackend(settings.redis_url)
+    else:
+        backend = InMemoryRevocationBackend()
+
+    return RevocationStore(
+        backend,
+        capacity=settings.revocation_bloom_capacity,
+        error_rate=settings.revocation_bloom_error_rate,
+        sync_interval=settings.revocation_sync_interval_seconds
+    )
+
+
+revocation_store = create_revocation_store()
@@ -1,12 +1,23 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from ..core.cache import TTLCache
 from ..core.config import settings
-from ..core.database import get_db
+from ..core.database import get_db, get_async_db
+from ..core.revocation import revocation_store
 from ..models.models import User
 from ..models.schemas import TokenData
 
@@ -16,6 +27,45 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Token security
 security = HTTPBearer()
 
+# Authenticated principals keyed by token subject, so polling clients skip the
+# per-request user lookup. Entries are detached from their session.
+# The cache is per process: the listeners below only evict in the worker that
+# made the change, so logout-all, deactivation or a demotion can take up to
+# principal_cache_ttl_seconds to reach the other workers.
+principal_cache = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds
+)
+
+
+# Verified access-token claims keyed by token hash, so repeat requests skip
+# signature verification. Revocation is still checked on every hit.
+token_cache = TTLCache(
+    max_size=settings.token_cache_max_size,
+    ttl=settings.access_token_expire_minutes * 60
+)
+
+
+def invalidate_principal(user: User) -> None:
+    """Drop a cached principal so the next request reloads it."""
+    principal_cache.pop(user.id)
+    principal_cache.pop(user.email)
+
+
+@event.listens_for(User, "before_update")
+def _bump_token_version_on_privilege_change(mapper, connection, target):
+    """Tokens carry the role, so a role or status change must retire them."""
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("role", "is_active")):
+        target.token_version = User.token_version + 1
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal_on_change(mapper, connection, target):
+    """Evict users whose row changes (deactivation, role change, ...)."""
+    invalidate_principal(target)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
@@ -27,6 +77,94 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Dedicated process pool for bcrypt so logins never hold the request threadpool.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_jobs_in_flight = 0
+
+
+def _hash_pool_size() -> int:
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """Get (lazily creating) the bcrypt worker pool."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(max_workers=_hash_pool_size())
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the bcrypt worker pool."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def _run_hash_job(func, *args):
+    """Run a bcrypt job in the worker pool, failing fast when it is saturated."""
+    global _hash_jobs_in_flight
+    if _hash_jobs_in_flight >= _hash_pool_size() + settings.password_hash_queue_depth:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    
+    _hash_jobs_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _hash_jobs_in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the bcrypt worker pool."""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the bcrypt worker pool."""
+    return await _run_hash_job(get_password_hash, password)
+
+
+def hash_pool_stats() -> dict:
+    """Get bcrypt pool size and current queue depth."""
+    return {
+        "workers": _hash_pool_size(),
+        "queue_depth_limit": settings.password_hash_queue_depth,
+        "jobs_in_flight": _hash_jobs_in_flight
+    }
+
+
+def token_claims(user: User) -> dict:
+    """Get the identity claims embedded in a user's access and refresh tokens."""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "role": user.role.value,
+        "tv": user.token_version or 0
+    }
+
+
+def bump_token_version(user: User) -> None:
+    """Invalidate every token issued to a user (takes effect on commit)."""
+    user.token_version = User.token_version + 1
+
+
+def _token_data_from_payload(payload: dict) -> TokenData:
+    return TokenData(
+        email=payload.get("sub"),
+        user_id=payload.get("uid"),
+        role=payload.get("role"),
+        token_version=payload.get("tv"),
+        jti=payload.get("jti"),
+        exp=payload.get("exp")
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -35,7 +173,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
@@ -44,30 +182,113 @@ def create_refresh_token(data: dict):
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
+def _decode_access_token(token: str, credentials_exception) -> TokenData:
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        email: str = payload.get("sub")
+        token_type: str = payload.get("type")
+        
+        if email is None or token_type != "access":
+            raise credentials_exception
+            
+        return _token_data_from_payload(payload)
+    except JWTError:
+        raise credentials_exception
+
+
 def verify_token(token: str, credentials_exception):
     """Verify and decode a JWT token."""
+    if not settings.token_cache_enabled:
+        token_data = _decode_access_token(token, credentials_exception)
+    else:
+        cache_key = hashlib.sha256(token.encode()).digest()
+        token_data = token_cache.get(cache_key)
+        if token_data is None:
+            token_data = _decode_access_token(token, credentials_exception)
+            # Never serve a cached token past its own expiry
+            remaining = (token_data.exp or 0) - time.time()
+            if remaining > 0:
+                token_cache.set(cache_key, token_data, ttl=remaining)
+    
+    if token_data.jti and revocation_store.is_revoked(token_data.jti):
+        raise credentials_exception
+    
+    return token_data
+
+
+def verify_refresh_token(token: str, credentials_exception):
+    """Verify and decode a JWT refresh token."""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
         token_type: str = payload.get("type")
         
-        if email is None or token_type != "access":
+        if email is None or token_type != "refresh":
             raise credentials_exception
             
-        token_data = TokenData(email=email)
+        token_data = _token_data_from_payload(payload)
     except JWTError:
         raise credentials_exception
     
+    if token_data.jti and revocation_store.is_revoked(token_data.jti):
+        raise credentials_exception
+    
     return token_data
 
 
+def revoke_token(token_data: TokenData) -> None:
+    """Revoke a verified token until it would have expired anyway."""
+    if token_data.jti and token_data.exp:
+        revocation_store.revoke(token_data.jti, token_data.exp)
+
+
+def get_token_data(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenData:
+    """Get the verified claims of the request's access token."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    return verify_token(credentials.credentials, credentials_exception)
+
+
+def _principal_cache_key(token_data: TokenData):
+    # Tokens issued before id/version claims existed are keyed by email
+    return token_data.user_id if token_data.user_id is not None else token_data.email
+
+
+def _token_version_matches(token_data: TokenData, user: User) -> bool:
+    if token_data.token_version is None:
+        return True
+    return token_data.token_version == (user.token_version or 0)
+
+
+def _cached_principal(token_data: TokenData) -> Optional[User]:
+    if not settings.principal_cache_enabled:
+        return None
+    user = principal_cache.get(_principal_cache_key(token_data))
+    # A cached row that predates a token version bump must be reloaded
+    if user is not None and _token_version_matches(token_data, user):
+        return user
+    return None
+
+
+def _principal_statement(token_data: TokenData):
+    if token_data.user_id is not None:
+        return select(User).where(User.id == token_data.user_id)
+    return select(User).where(User.email == token_data.email)
+
+
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token_data: TokenData = Depends(get_token_data),
     db: Session = Depends(get_db)
 ):
     """Get the current authenticated user."""
@@ -77,12 +298,46 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token_data = verify_token(credentials.credentials, credentials_exception)
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = _cached_principal(token_data)
+    if user is not None:
+        return user
+    
+    user = db.execute(_principal_statement(token_data)).scalars().first()
+    
+    if user is None or not _token_version_matches(token_data, user):
+        raise credentials_exception
+    
+    if settings.principal_cache_enabled:
+        db.expunge(user)
+        principal_cache.set(_principal_cache_key(token_data), user)
+    
+    return user
+
+
+async def get_current_user_async(
+    token_data: TokenData = Depends(get_token_data),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the current authenticated user through the async session."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    user = _cached_principal(token_data)
+    if user is not None:
+        return user
+    
+    user = (await db.execute(_principal_statement(token_data))).scalars().first()
     
-    if user is None:
+    if user is None or not _token_version_matches(token_data, user):
         raise credentials_exception
     
+    if settings.principal_cache_enabled:
+        db.expunge(user)
+        principal_cache.set(_principal_cache_key(token_data), user)
+    
     return user
 
 
@@ -103,11 +358,36 @@ def get_admin_user(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)):
+    """Get the current active user through the async session."""
+    return get_current_active_user(current_user)
+
+
+async def get_admin_user_async(current_user: User = Depends(get_current_active_user_async)):
+    """Get the current user if they are an admin, through the async session."""
+    return get_admin_user(current_user)
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get a user by email address."""
+    return db.query(User).filter(User.email == email).first()
+
+
 def authenticate_user(db: Session, email: str, password: str):
     """Authenticate a user with email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_email(db, email)
     if not user:
         return False
     if not verify_password(password, user.hashed_password):
         return False
+    return user
+
+
+async def authenticate_user_async(db: Session, email: str, password: str):
+    """Authenticate a user, verifying the password in the bcrypt worker pool."""
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
     return user
\ No newline at end of file
@@ -1,22 +1,51 @@
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
 from .core.config import settings
-from .core.database import engine
+from .core.database import (
+    WRITE_MARKER, engine, async_engine, async_replica_engines, replica_router, set_write_marker
+)
+from .core.query_stats import track_queries
+from .core.revocation import revocation_store
+from .core.security import shutdown_hash_executor
+from .services.analytics import shutdown_section_executor
 from .models import models
-from .api import auth, modules, emergency
+from .api import auth, modules, emergency, analytics, metrics, emergency_async, modules_async
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers on startup; stop them and close async connections on shutdown."""
+    revocation_store.start_sync()
+    if replica_router is not None:
+        replica_router.start_health_checks()
+    try:
+        yield
+    finally:
+        shutdown_hash_executor()
+        shutdown_section_executor()
+        revocation_store.stop_sync()
+        if replica_router is not None:
+            replica_router.stop_health_checks()
+        if async_engine is not None:
+            await async_engine.dispose()
+        for replica_engine in async_replica_engines:
+            await replica_engine.dispose()
+
+
 # Create FastAPI instance
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Digital Disaster Preparedness Platform Backend API",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -26,16 +55,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time", WRITE_MARKER],
 )
 
+
+# Read-your-writes marker for clients whose request committed a write
+if replica_router is not None:
+    @app.middleware("http")
+    async def write_marker(request: Request, call_next):
+        response = await call_next(request)
+        set_write_marker(request, response)
+        return response
+
+
+# Per-request DB statement count and time (opt-in via QUERY_STATS_ENABLED)
+if settings.query_stats_enabled:
+    @app.middleware("http")
+    async def db_query_stats(request: Request, call_next):
+        with track_queries() as stats:
+            response = await call_next(request)
+        response.headers["X-DB-Queries"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.duration * 1000:.2f}"  # milliseconds
+        return response
+
+
 # Static files for uploads
 if os.path.exists(settings.upload_dir):
     app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
 
 # Include routers
+if settings.use_async_db:
+    # Registered first so the async versions of the hot routes take precedence
+    app.include_router(modules_async.router, prefix="/api/modules", tags=["Modules"])
+    app.include_router(emergency_async.router, prefix="/api/emergency", tags=["Emergency"])
+
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(modules.router, prefix="/api/modules", tags=["Modules"])
 app.include_router(emergency.router, prefix="/api/emergency", tags=["Emergency"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
 
 
 @app.get("/")
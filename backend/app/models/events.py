@@ -0,0 +1,546 @@
+"""ORM listeners that keep derived data in step with the rows it summarizes.
+
+Listeners run inside the flush, on the flushing connection, so rollups commit
+or roll back together with the change that caused them. Rollup deltas are
+collected per flush and written at the end of it in ROLLUP_LOCK_ORDER, so two
+transactions never take the shared rollup rows in opposite orders.
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+
+from .models import (
+    DisasterModule, ModulePhase, PhaseChecklist, PhaseStep, PhaseQA, QuizQuestion,
+    ContentVersion, SearchDocument, User, UserRole, StudentProgress, QuizAttempt, SOSRequest, EmergencyAlert,
+    GlobalRollup, ModuleRollup, DepartmentRollup, DailyRollup,
+    CohortRollup, CohortModuleRollup
+)
+
+GLOBAL_ROLLUP_ID = 1
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def bump(connection, model, key: dict, **deltas) -> None:
+    """Add deltas to a rollup row, creating it (from zero) if missing."""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table = model.__table__
+    upsert = _UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        stmt = upsert(table).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: table.c[column] + stmt.excluded[column] for column in deltas}
+        )
+        connection.execute(stmt)
+        return
+
+    result = connection.execute(
+        update(table)
+        .where(*[table.c[column] == value for column, value in key.items()])
+        .values({column: table.c[column] + delta for column, delta in deltas.items()})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**key, **deltas))
+
+
+# Every writer locks rollup rows in this order (and by key within a table)
+ROLLUP_LOCK_ORDER = (
+    GlobalRollup, ModuleRollup, DepartmentRollup, CohortRollup, CohortModuleRollup, DailyRollup
+)
+
+
+class RollupDeltas:
+    """Rollup deltas accumulated per row, applied in lock order."""
+
+    def __init__(self):
+        self._rows = {}
+
+    def add(self, model, key: dict, **deltas) -> None:
+        row = self._rows.setdefault((model, tuple(key.items())), {})
+        for column, delta in deltas.items():
+            row[column] = row.get(column, 0) + delta
+
+    def apply(self, connection) -> None:
+        rows, self._rows = self._rows, {}
+        for (model, key), deltas in sorted(
+            rows.items(),
+            key=lambda item: (ROLLUP_LOCK_ORDER.index(item[0][0]), [value for _, value in item[0][1]])
+        ):
+            bump(connection, model, dict(key), **deltas)
+
+
+def _deltas(target) -> RollupDeltas:
+    return object_session(target).info.setdefault("rollup_deltas", RollupDeltas())
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_deltas(session, flush_context):
+    deltas = session.info.pop("rollup_deltas", None)
+    if deltas is not None:
+        deltas.apply(session.connection())
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rollup_deltas(session, previous_transaction):
+    # A failed flush never reaches after_flush
+    session.info.pop("rollup_deltas", None)
+
+
+def _old_value(target, attribute: str):
+    history = inspect(target).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+
+def _changed(target, *attributes) -> bool:
+    state = inspect(target)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+def _loaded(target, attribute: str):
+    # Server-default columns are not loaded after insert; never refresh mid-flush
+    return inspect(target).dict.get(attribute)
+
+
+def cohorts(department, year_of_study) -> list:
+    """(dimension, cohort) pairs a user belongs to."""
+    return [("department", department or ""), ("year", year_of_study or "")]
+
+
+def _cohorts_of(connection, user_id: int) -> list:
+    row = connection.execute(
+        select(User.department, User.year_of_study).where(User.id == user_id)
+    ).first()
+    return cohorts(*row) if row else cohorts(None, None)
+
+
+def _bump_students(deltas: RollupDeltas, department, year_of_study, delta: int) -> None:
+    deltas.add(DepartmentRollup, {"department": department or ""}, students=delta)
+    for dimension, cohort in cohorts(department, year_of_study):
+        deltas.add(CohortRollup, {"dimension": dimension, "cohort": cohort}, students=delta)
+
+
+def _day(value):
+    return (value or datetime.utcnow()).date()
+
+
+# Load the previous value on assignment so deltas can be computed at flush
+for _attribute in (
+    User.is_active, User.role, User.department, User.year_of_study,
+    StudentProgress.completed, StudentProgress.score,
+    SOSRequest.status
+):
+    event.listen(_attribute, "set", lambda *args: None, active_history=True)
+
+
+# Users
+def _user_counts(is_active, role) -> dict:
+    return {
+        "total_users": 1,
+        "active_users": 1 if is_active in (None, True) else 0,
+        "students": 1 if role == UserRole.STUDENT else 0,
+        "admins": 1 if role == UserRole.ADMIN else 0
+    }
+
+
+@event.listens_for(User, "after_insert")
+def _user_inserted(mapper, connection, target):
+    deltas = _deltas(target)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, **_user_counts(target.is_active, target.role))
+    if target.role == UserRole.STUDENT:
+        _bump_students(deltas, target.department, target.year_of_study, 1)
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    if not _changed(target, "is_active", "role", "department", "year_of_study"):
+        return
+    deltas = _deltas(target)
+    old = _user_counts(_old_value(target, "is_active"), _old_value(target, "role"))
+    new = _user_counts(target.is_active, target.role)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID},
+               **{column: new[column] - old[column] for column in new})
+
+    if old["students"]:
+        _bump_students(deltas, _old_value(target, "department"), _old_value(target, "year_of_study"), -1)
+    if new["students"]:
+        _bump_students(deltas, target.department, target.year_of_study, 1)
+
+    old_cohorts = cohorts(_old_value(target, "department"), _old_value(target, "year_of_study"))
+    new_cohorts = cohorts(target.department, target.year_of_study)
+    if old_cohorts != new_cohorts:
+        _move_activity(connection, deltas, target.id, old_cohorts, new_cohorts)
+
+
+def _user_activity(connection, user_id: int):
+    """Per-module completion and quiz totals plus the SOS count of one user."""
+    modules = {}
+    for module_id, count, scored, score_sum in connection.execute(
+        select(StudentProgress.module_id, func.count(StudentProgress.id), func.count(StudentProgress.score),
+               func.coalesce(func.sum(StudentProgress.score), 0))
+        .where(StudentProgress.user_id == user_id, StudentProgress.completed == True)
+        .group_by(StudentProgress.module_id)
+    ):
+        modules[module_id] = {"completed_count": count, "completed_scored": scored, "completed_score_sum": score_sum}
+    for module_id, count in connection.execute(
+        select(QuizAttempt.module_id, func.count(QuizAttempt.id))
+        .where(QuizAttempt.user_id == user_id).group_by(QuizAttempt.module_id)
+    ):
+        modules.setdefault(module_id, {})["quiz_attempts"] = count
+    sos_requests = connection.execute(
+        select(func.count(SOSRequest.id)).where(SOSRequest.user_id == user_id)
+    ).scalar()
+    return modules, sos_requests
+
+
+def _move_activity(connection, deltas: RollupDeltas, user_id: int, old_cohorts, new_cohorts) -> None:
+    """Move a user's activity counts from their old cohorts to their new ones."""
+    modules, sos_requests = _user_activity(connection, user_id)
+    totals = {"completed_count": 0, "completed_scored": 0, "completed_score_sum": 0, "quiz_attempts": 0}
+    for values in modules.values():
+        for column, value in values.items():
+            totals[column] += value
+
+    # Unchanged cohorts net out to zero and are never written
+    for sign, user_cohorts in ((-1, old_cohorts), (1, new_cohorts)):
+        deltas.add(DepartmentRollup, {"department": dict(user_cohorts)["department"]},
+                   sos_requests=sign * sos_requests,
+                   **{column: sign * value for column, value in totals.items()})
+        for dimension, cohort in user_cohorts:
+            for module_id, values in modules.items():
+                deltas.add(CohortModuleRollup,
+                           {"dimension": dimension, "cohort": cohort, "module_id": module_id},
+                           **{column: sign * value for column, value in values.items()})
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    deltas = _deltas(target)
+    counts = _user_counts(target.is_active, target.role)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID},
+               **{column: -count for column, count in counts.items()})
+    if counts["students"]:
+        _bump_students(deltas, target.department, target.year_of_study, -1)
+
+
+def record_users_added(connection, users) -> None:
+    """Update rollups for users inserted in bulk (bypassing ORM events)."""
+    deltas = RollupDeltas()
+    for user in users:
+        deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, **_user_counts(user.get("is_active"), user.get("role")))
+        if user.get("role") == UserRole.STUDENT:
+            _bump_students(deltas, user.get("department"), user.get("year_of_study"), 1)
+    deltas.apply(connection)
+
+
+# Progress
+def _completion(completed, score):
+    """(completed count, scored count, score sum) a progress row contributes."""
+    if not completed:
+        return 0, 0, 0
+    return 1, int(score is not None), score or 0
+
+
+def _apply_completion_delta(connection, deltas: RollupDeltas, user_id: int, module_id: int,
+                            count: int, scored: int, score_sum: int) -> None:
+    if not count and not scored and not score_sum:
+        return
+    values = {"completed_count": count, "completed_scored": scored, "completed_score_sum": score_sum}
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, completed_progress=count)
+    deltas.add(ModuleRollup, {"module_id": module_id}, **values)
+    user_cohorts = _cohorts_of(connection, user_id)
+    deltas.add(DepartmentRollup, {"department": dict(user_cohorts)["department"]}, **values)
+    for dimension, cohort in user_cohorts:
+        deltas.add(CohortModuleRollup,
+                   {"dimension": dimension, "cohort": cohort, "module_id": module_id}, **values)
+
+
+def _stored_row(connection, target, *columns):
+    """Column values of a row as stored, read before it is deleted.
+
+    The instance may be expired or edited in memory; the rollups counted what
+    the database holds.
+    """
+    table = type(target).__table__
+    return connection.execute(
+        select(*[table.c[column] for column in columns]).where(table.c.id == target.id)
+    ).first()
+
+
+@event.listens_for(StudentProgress, "after_insert")
+def _progress_inserted(mapper, connection, target):
+    deltas = _deltas(target)
+    count, scored, score_sum = _completion(target.completed, target.score)
+    _apply_completion_delta(connection, deltas, target.user_id, target.module_id, count, scored, score_sum)
+    if count:
+        deltas.add(DailyRollup, {"day": _day(_loaded(target, "completed_at"))}, completions=1)
+
+
+@event.listens_for(StudentProgress, "after_update")
+def _progress_updated(mapper, connection, target):
+    if not _changed(target, "completed", "score"):
+        return
+    deltas = _deltas(target)
+    old = _completion(_old_value(target, "completed"), _old_value(target, "score"))
+    new = _completion(target.completed, target.score)
+    _apply_completion_delta(connection, deltas, target.user_id, target.module_id,
+                            *[after - before for before, after in zip(old, new)])
+    if new[0] > old[0]:
+        deltas.add(DailyRollup, {"day": _day(_loaded(target, "completed_at"))}, completions=1)
+
+
+@event.listens_for(StudentProgress, "before_delete")
+def _progress_deleted(mapper, connection, target):
+    row = _stored_row(connection, target, "user_id", "module_id", "completed", "score", "completed_at")
+    if row is None:
+        return
+    deltas = _deltas(target)
+    count, scored, score_sum = _completion(row.completed, row.score)
+    _apply_completion_delta(connection, deltas, row.user_id, row.module_id, -count, -scored, -score_sum)
+    if count:
+        deltas.add(DailyRollup, {"day": _day(row.completed_at)}, completions=-1)
+
+
+# Quiz attempts
+def _count_quiz_attempt(connection, deltas: RollupDeltas, user_id: int, module_id: int,
+                        completed_at, sign: int) -> None:
+    deltas.add(ModuleRollup, {"module_id": module_id}, quiz_attempts=sign)
+    user_cohorts = _cohorts_of(connection, user_id)
+    deltas.add(DepartmentRollup, {"department": dict(user_cohorts)["department"]}, quiz_attempts=sign)
+    for dimension, cohort in user_cohorts:
+        deltas.add(CohortModuleRollup,
+                   {"dimension": dimension, "cohort": cohort, "module_id": module_id},
+                   quiz_attempts=sign)
+    deltas.add(DailyRollup, {"day": _day(completed_at)}, quiz_attempts=sign)
+
+
+@event.listens_for(QuizAttempt, "after_insert")
+def _quiz_attempt_inserted(mapper, connection, target):
+    _count_quiz_attempt(connection, _deltas(target), target.user_id, target.module_id,
+                        _loaded(target, "completed_at"), 1)
+
+
+@event.listens_for(QuizAttempt, "before_delete")
+def _quiz_attempt_deleted(mapper, connection, target):
+    row = _stored_row(connection, target, "user_id", "module_id", "completed_at")
+    if row is not None:
+        _count_quiz_attempt(connection, _deltas(target), row.user_id, row.module_id, row.completed_at, -1)
+
+
+# SOS requests
+def _sos_is_active(status) -> bool:
+    return status in (None, "active")
+
+
+@event.listens_for(SOSRequest, "after_insert")
+def _sos_inserted(mapper, connection, target):
+    deltas = _deltas(target)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, active_sos=int(_sos_is_active(target.status)))
+    deltas.add(DepartmentRollup, {"department": dict(_cohorts_of(connection, target.user_id))["department"]},
+               sos_requests=1)
+    deltas.add(DailyRollup, {"day": _day(_loaded(target, "created_at"))}, sos_created=1)
+    if target.status == "resolved" and target.resolved_at is not None:
+        deltas.add(DailyRollup, {"day": _day(target.resolved_at)}, sos_resolved=1)
+
+
+@event.listens_for(SOSRequest, "after_update")
+def _sos_updated(mapper, connection, target):
+    if not _changed(target, "status"):
+        return
+    was_active = _sos_is_active(_old_value(target, "status"))
+    is_active = _sos_is_active(target.status)
+    deltas = _deltas(target)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, active_sos=int(is_active) - int(was_active))
+    if was_active and target.status == "resolved":
+        deltas.add(DailyRollup, {"day": _day(_loaded(target, "resolved_at"))}, sos_resolved=1)
+
+
+@event.listens_for(SOSRequest, "before_delete")
+def _sos_deleted(mapper, connection, target):
+    row = _stored_row(connection, target, "user_id", "status", "created_at", "resolved_at")
+    if row is None:
+        return
+    deltas = _deltas(target)
+    deltas.add(GlobalRollup, {"id": GLOBAL_ROLLUP_ID}, active_sos=-int(_sos_is_active(row.status)))
+    deltas.add(DepartmentRollup, {"department": dict(_cohorts_of(connection, row.user_id))["department"]},
+               sos_requests=-1)
+    deltas.add(DailyRollup, {"day": _day(row.created_at)}, sos_created=-1)
+    if row.status == "resolved" and row.resolved_at is not None:
+        deltas.add(DailyRollup, {"day": _day(row.resolved_at)}, sos_resolved=-1)
+
+
+# Alerts
+@event.listens_for(EmergencyAlert, "after_insert")
+def _alert_inserted(mapper, connection, target):
+    _deltas(target).add(DailyRollup, {"day": _day(_loaded(target, "created_at"))}, alerts_created=1)
+
+
+# Module content versions: any change to a module or its phase tree bumps
+# disaster_modules.content_version, which keys the serialized content cache
+_MODULE_VERSION_IGNORED = {"content_version", "updated_at"}
+
+
+def _bump_content_version(connection, module_ids) -> None:
+    module_ids = {module_id for module_id in module_ids if module_id is not None}
+    if not module_ids:
+        return
+    table = DisasterModule.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.id.in_(module_ids))
+        .values(content_version=table.c.content_version + 1)
+    )
+
+
+@event.listens_for(DisasterModule, "before_update")
+def _module_updated(mapper, connection, target):
+    changed = [
+        attribute.key for attribute in mapper.column_attrs
+        if attribute.key not in _MODULE_VERSION_IGNORED
+    ]
+    if _changed(target, *changed):
+        target.content_version = DisasterModule.content_version + 1
+
+
+def _phase_modules(target) -> list:
+    return [_old_value(target, "module_id"), target.module_id]
+
+
+def _phase_child_modules(connection, target) -> list:
+    phase_ids = {_old_value(target, "phase_id"), target.phase_id}
+    return connection.execute(
+        select(ModulePhase.module_id).where(ModulePhase.id.in_(phase_ids))
+    ).scalars().all()
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(
+        ModulePhase, _event,
+        lambda mapper, connection, target: _bump_content_version(connection, _phase_modules(target))
+    )
+    for _model in (PhaseChecklist, PhaseStep, PhaseQA):
+        event.listen(
+            _model, _event,
+            lambda mapper, connection, target: _bump_content_version(
+                connection, _phase_child_modules(connection, target)
+            )
+        )
+
+
+# HTTP content-version scopes (see core/http_cache.py)
+MODULES_SCOPE = "modules"
+
+
+def questions_scope(module_id: int) -> str:
+    return f"questions:{module_id}"
+
+
+def _bump_scope(connection, scope: str) -> None:
+    bump(connection, ContentVersion, {"scope": scope}, version=1)
+
+
+def _modules_changed(mapper, connection, target):
+    _bump_scope(connection, MODULES_SCOPE)
+
+
+def _question_changed(mapper, connection, target):
+    for module_id in {_old_value(target, "module_id"), target.module_id}:
+        _bump_scope(connection, questions_scope(module_id))
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(DisasterModule, _event, _modules_changed)
+    event.listen(ModulePhase, _event, _modules_changed)
+    event.listen(QuizQuestion, _event, _question_changed)
+
+
+# Search documents: (kind, title attribute, body attribute) per content model
+SEARCH_SOURCES = {
+    DisasterModule: ("module", "title", "description"),
+    ModulePhase: ("phase", "title", "content_focus"),
+    PhaseChecklist: ("checklist", None, "item"),
+    PhaseStep: ("step", "step", "description"),
+    PhaseQA: ("qa", "question", "answer")
+}
+
+
+def search_document(target, module_id: int, model=None) -> dict:
+    """Search document values for a content row (an instance, or a row of model)."""
+    kind, title, body = SEARCH_SOURCES[model or type(target)]
+    return {
+        "kind": kind,
+        "source_id": target.id,
+        "module_id": module_id,
+        "phase_id": target.id if kind == "phase" else getattr(target, "phase_id", None),
+        "title": (getattr(target, title) if title else None) or "",
+        "body": getattr(target, body) or ""
+    }
+
+
+def _search_module_id(connection, target) -> int:
+    if isinstance(target, DisasterModule):
+        return target.id
+    if isinstance(target, ModulePhase):
+        return target.module_id
+    return connection.execute(
+        select(ModulePhase.module_id).where(ModulePhase.id == target.phase_id)
+    ).scalar()
+
+
+def _index_document(mapper, connection, target):
+    values = search_document(target, _search_module_id(connection, target))
+    table = SearchDocument.__table__
+    upsert = _UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        stmt = upsert(table).values(**values)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=["kind", "source_id"],
+            set_={column: stmt.excluded[column] for column in ("module_id", "phase_id", "title", "body")}
+        ))
+        return
+
+    result = connection.execute(
+        update(table)
+        .where(table.c.kind == values["kind"], table.c.source_id == values["source_id"])
+        .values(values)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(values))
+
+
+def _unindex_document(mapper, connection, target):
+    table = SearchDocument.__table__
+    connection.execute(
+        delete(table).where(
+            table.c.kind == SEARCH_SOURCES[type(target)][0],
+            table.c.source_id == target.id
+        )
+    )
+
+
+@event.listens_for(ModulePhase, "after_update")
+def _reindex_moved_phase(mapper, connection, target):
+    """Children of a phase moved to another module follow it (the phase's own
+    document is re-indexed by _index_document)."""
+    if not _changed(target, "module_id"):
+        return
+    table = SearchDocument.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.phase_id == target.id, table.c.kind != SEARCH_SOURCES[ModulePhase][0])
+        .values(module_id=target.module_id)
+    )
+
+
+for _model in SEARCH_SOURCES:
+    event.listen(_model, "after_insert", _index_document)
+    event.listen(_model, "after_update", _index_document)
+    event.listen(_model, "after_delete", _unindex_document)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Boolean, Text, Float, ForeignKey, Enum, Index, JSON, UniqueConstraint, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
 import datetime
 from ..core.database import Base
 
+# Native JSON column: JSONB on PostgreSQL, JSON (text affinity) elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class UserRole(PyEnum):
     STUDENT = "student"
@@ -36,6 +40,7 @@ class User(Base):
     name = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.STUDENT)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped to revoke all tokens
     profile_image = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     department = Column(String, nullable=True)
@@ -60,6 +65,7 @@ class DisasterModule(Base):
     icon = Column(String, nullable=False)
     color = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    content_version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on any content change
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -73,7 +79,7 @@ class ModulePhase(Base):
     __tablename__ = "module_phases"
     
     id = Column(Integer, primary_key=True, index=True)
-    module_id = Column(Integer, ForeignKey("disaster_modules.id"), nullable=False)
+    module_id = Column(Integer, ForeignKey("disaster_modules.id"), nullable=False, index=True)
     phase_type = Column(String, nullable=False)  # 'before', 'during', 'after'
     title = Column(String, nullable=False)
     content_focus = Column(Text, nullable=False)
@@ -81,8 +87,8 @@ class ModulePhase(Base):
     
     # Relationships
     module = relationship("DisasterModule", back_populates="phases")
-    checklists = relationship("PhaseChecklist", back_populates="phase")
-    steps = relationship("PhaseStep", back_populates="phase")
+    checklists = relationship("PhaseChecklist", back_populates="phase", order_by="PhaseChecklist.order_index")
+    steps = relationship("PhaseStep", back_populates="phase", order_by="PhaseStep.order_index")
     qa_items = relationship("PhaseQA", back_populates="phase")
 
 
@@ -90,7 +96,7 @@ class PhaseChecklist(Base):
     __tablename__ = "phase_checklists"
     
     id = Column(Integer, primary_key=True, index=True)
-    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False, index=True)
     item = Column(Text, nullable=False)
     order_index = Column(Integer, nullable=False)
     
@@ -102,7 +108,7 @@ class PhaseStep(Base):
     __tablename__ = "phase_steps"
     
     id = Column(Integer, primary_key=True, index=True)
-    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False, index=True)
     step = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     animation = Column(String, nullable=True)
@@ -117,7 +123,7 @@ class PhaseQA(Base):
     __tablename__ = "phase_qa"
     
     id = Column(Integer, primary_key=True, index=True)
-    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("module_phases.id"), nullable=False, index=True)
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     category = Column(String, nullable=False)
@@ -132,12 +138,16 @@ class QuizQuestion(Base):
     id = Column(Integer, primary_key=True, index=True)
     module_id = Column(Integer, ForeignKey("disaster_modules.id"), nullable=False)
     question = Column(Text, nullable=False)
-    options = Column(Text, nullable=False)  # JSON string of options
+    options = Column(JSONDocument, nullable=False)  # list of option strings
     correct_answer = Column(Integer, nullable=False)
     phase = Column(String, nullable=False)  # 'before', 'during', 'after'
     
     # Relationships
     module = relationship("DisasterModule", back_populates="quiz_questions")
+    
+    __table_args__ = (
+        Index("ix_quiz_questions_module_phase", module_id, phase),
+    )
 
 
 class StudentProgress(Base):
@@ -155,6 +165,17 @@ class StudentProgress(Base):
     # Relationships
     user = relationship("User", back_populates="progress")
     module = relationship("DisasterModule", back_populates="progress")
+    
+    __table_args__ = (
+        # One row per user and module; quiz grading upserts against it
+        Index("ix_student_progress_user_module", user_id, module_id, unique=True),
+        Index("ix_student_progress_module_completed", module_id, completed),
+        # Recent-completions feed only ever reads completed rows
+        Index(
+            "ix_student_progress_completed_at", completed_at,
+            postgresql_where=(completed == True), sqlite_where=(completed == True)
+        ),
+    )
 
 
 class QuizAttempt(Base):
@@ -165,11 +186,16 @@ class QuizAttempt(Base):
     module_id = Column(Integer, ForeignKey("disaster_modules.id"), nullable=False)
     score = Column(Integer, nullable=False)
     total_questions = Column(Integer, nullable=False)
-    answers = Column(Text, nullable=False)  # JSON string of answers
+    answers = Column(JSONDocument, nullable=False)  # list of chosen option indexes
+    phase = Column(String, nullable=True)  # phase graded, None for the whole module
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="quiz_attempts")
+    
+    __table_args__ = (
+        Index("ix_quiz_attempts_module_id", module_id),
+    )
 
 
 class EmergencyAlert(Base):
@@ -186,6 +212,15 @@ class EmergencyAlert(Base):
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        Index("ix_emergency_alerts_active", is_active, expires_at, severity, created_at),
+        Index(
+            "ix_emergency_alerts_active_severity", severity, created_at,
+            postgresql_where=(is_active == True), sqlite_where=(is_active == True)
+        ),
+        Index("ix_emergency_alerts_created_at", created_at),
+    )
 
 
 class SOSRequest(Base):
@@ -205,6 +240,12 @@ class SOSRequest(Base):
     # Relationships with explicit foreign_keys
     user = relationship("User", foreign_keys=[user_id], back_populates="sos_requests")
     resolver = relationship("User", foreign_keys=[resolved_by], back_populates="resolved_requests")
+    
+    __table_args__ = (
+        Index("ix_sos_requests_status_created_at", status, created_at),
+        Index("ix_sos_requests_user_created_at", user_id, created_at),
+        Index("ix_sos_requests_created_at", created_at),
+    )
 
 
 class CampusLocation(Base):
@@ -251,6 +292,14 @@ class EmergencyContact(Base):
     priority = Column(Integer, default=1)  # 1 = highest priority
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_emergency_contacts_active_priority", is_active, priority, name),
+        Index(
+            "ix_emergency_contacts_active", priority, name,
+            postgresql_where=(is_active == True), sqlite_where=(is_active == True)
+        ),
+    )
 
 
 class DrillSession(Base):
@@ -284,4 +333,133 @@ class WeatherAlert(Base):
     is_active = Column(Boolean, default=True)
     recommendations = Column(Text, nullable=True)  # JSON string
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Analytics rollups, kept current in the same transaction as the rows they
+# summarize (see events.py) and rebuilt with rebuild_rollups.py
+class GlobalRollup(Base):
+    __tablename__ = "analytics_global_rollup"
+    
+    id = Column(Integer, primary_key=True)  # single row, id = 1
+    total_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    students = Column(Integer, nullable=False, default=0)
+    admins = Column(Integer, nullable=False, default=0)
+    completed_progress = Column(Integer, nullable=False, default=0)
+    active_sos = Column(Integer, nullable=False, default=0)
+
+
+class ModuleRollup(Base):
+    __tablename__ = "analytics_module_rollup"
+    
+    module_id = Column(Integer, ForeignKey("disaster_modules.id"), primary_key=True)
+    completed_count = Column(Integer, nullable=False, default=0)
+    completed_scored = Column(Integer, nullable=False, default=0)  # completions with a score
+    completed_score_sum = Column(BigInteger, nullable=False, default=0)
+    quiz_attempts = Column(Integer, nullable=False, default=0)
+
+
+class DepartmentRollup(Base):
+    __tablename__ = "analytics_department_rollup"
+    
+    department = Column(String, primary_key=True)  # '' for users without one
+    students = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    completed_scored = Column(Integer, nullable=False, default=0)  # completions with a score
+    completed_score_sum = Column(BigInteger, nullable=False, default=0)
+    quiz_attempts = Column(Integer, nullable=False, default=0)
+    sos_requests = Column(Integer, nullable=False, default=0)
+
+
+class DailyRollup(Base):
+    __tablename__ = "analytics_daily_rollup"
+    
+    day = Column(Date, primary_key=True)
+    completions = Column(Integer, nullable=False, default=0)
+    quiz_attempts = Column(Integer, nullable=False, default=0)
+    sos_created = Column(Integer, nullable=False, default=0)
+    sos_resolved = Column(Integer, nullable=False, default=0)
+    alerts_created = Column(Integer, nullable=False, default=0)
+
+
+# Cohort rollups: dimension is "department" or "year" (year_of_study);
+# cohort is the user's value for it ('' if unset)
+class CohortRollup(Base):
+    __tablename__ = "analytics_cohort_rollup"
+    
+    dimension = Column(String, primary_key=True)
+    cohort = Column(String, primary_key=True)
+    students = Column(Integer, nullable=False, default=0)
+
+
+class CohortModuleRollup(Base):
+    __tablename__ = "analytics_cohort_module_rollup"
+    
+    dimension = Column(String, primary_key=True)
+    cohort = Column(String, primary_key=True)
+    module_id = Column(Integer, ForeignKey("disaster_modules.id"), primary_key=True)
+    completed_count = Column(Integer, nullable=False, default=0)
+    completed_scored = Column(Integer, nullable=False, default=0)  # completions with a score
+    completed_score_sum = Column(BigInteger, nullable=False, default=0)
+    quiz_attempts = Column(Integer, nullable=False, default=0)
+
+
+# Version counters per content scope ("modules", "questions:<module id>"),
+# bumped by events.py and used to derive ETags
+class ContentVersion(Base):
+    __tablename__ = "content_versions"
+    
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Full-text search documents, one per searchable content row (kind + source
+# id), kept current by events.py. The text index is dialect-specific DDL.
+class SearchDocument(Base):
+    __tablename__ = "search_documents"
+    
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)  # module, phase, checklist, step, qa
+    source_id = Column(Integer, nullable=False)
+    module_id = Column(Integer, nullable=False, index=True)
+    phase_id = Column(Integer, nullable=True)
+    title = Column(Text, nullable=False, default="")
+    body = Column(Text, nullable=False, default="")
+    
+    __table_args__ = (
+        UniqueConstraint(kind, source_id, name="uq_search_documents_source"),
+    )
+
+
+def search_tsvector(prefix: str = "") -> str:
+    """Document text as indexed on PostgreSQL; queries must use the same expression."""
+    return f"to_tsvector('english', {prefix}title || ' ' || {prefix}body)"
+
+
+SEARCH_INDEX_DDL = {
+    "postgresql": [
+        f"CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING gin ({search_tsvector()})"
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+        "title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); END",
+        "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+        "INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) "
+        "VALUES ('delete', old.id, old.title, old.body); "
+        "INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+    ]
+}
+
+for _dialect, _statements in SEARCH_INDEX_DDL.items():
+    for _statement in _statements:
+        event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# Register ORM listeners that maintain derived tables
+from . import events  # noqa: E402,F401
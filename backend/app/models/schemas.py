@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Generic, Optional, List, TypeVar
 from datetime import datetime
 from enum import Enum
 
@@ -67,6 +67,11 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[int] = None
+    role: Optional[str] = None
+    token_version: Optional[int] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
 
 
 class LoginRequest(BaseModel):
@@ -97,6 +102,70 @@ class DisasterModule(DisasterModuleBase):
         from_attributes = True
 
 
+# Module Content Schemas
+class PhaseChecklistItem(BaseModel):
+    item: str
+    order_index: int
+
+    class Config:
+        from_attributes = True
+
+
+class PhaseStepItem(BaseModel):
+    step: str
+    description: str
+    animation: Optional[str] = None
+    location: Optional[str] = None
+    order_index: int
+
+    class Config:
+        from_attributes = True
+
+
+class PhaseQAItem(BaseModel):
+    question: str
+    answer: str
+    category: str
+
+    class Config:
+        from_attributes = True
+
+
+class ModulePhaseContent(BaseModel):
+    id: int
+    phase_type: str
+    title: str
+    content_focus: str
+    format: str
+    checklists: List[PhaseChecklistItem]
+    steps: List[PhaseStepItem]
+    qa_items: List[PhaseQAItem]
+
+    class Config:
+        from_attributes = True
+
+
+class ModuleContent(DisasterModuleBase):
+    id: int
+    content_version: int
+    phases: List[ModulePhaseContent]
+
+    class Config:
+        from_attributes = True
+
+
+class ModuleSearchResult(BaseModel):
+    kind: str  # module, phase, checklist, step or qa
+    source_id: int
+    module_id: int
+    module_title: str
+    phase_id: Optional[int] = None
+    phase_type: Optional[str] = None
+    title: str
+    snippet: str  # matched terms wrapped in <b></b>
+    rank: float
+
+
 # Progress Schemas
 class StudentProgressBase(BaseModel):
     module_id: int
@@ -127,9 +196,9 @@ class StudentProgress(StudentProgressBase):
 
 # Quiz Schemas
 class QuizQuestionBase(BaseModel):
+    # correct_answer never leaves the server; submissions are graded there
     question: str
     options: List[str]
-    correct_answer: int
     phase: str
 
 
@@ -159,12 +228,29 @@ class QuizAttempt(BaseModel):
     score: int
     total_questions: int
     answers: List[int]
+    phase: Optional[str] = None
     completed_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class QuizSubmission(BaseModel):
+    answers: List[int]  # chosen option per question, in question id order
+    phase: Optional[str] = Field(None, pattern="^(before|during|after)$")  # None = whole module
+
+
+class QuizResult(BaseModel):
+    attempt_id: int
+    module_id: int
+    phase: Optional[str] = None
+    score: int
+    total_questions: int
+    percentage: int  # whole-module submissions also store it as the progress score
+    correct: List[bool]
+    completed_at: datetime
+
+
 # Emergency Alert Schemas
 class EmergencyAlertBase(BaseModel):
     alert_type: AlertType
@@ -288,6 +374,7 @@ class EmergencyContactBase(BaseModel):
 
 class EmergencyContact(EmergencyContactBase):
     id: int
+    priority: Optional[int] = None  # nullable in the table
     created_at: datetime
 
     class Config:
@@ -312,10 +399,15 @@ class ModuleAnalytics(BaseModel):
 
 
 class DashboardAnalytics(BaseModel):
-    user_analytics: UserAnalytics
+    user_analytics: Optional[UserAnalytics] = None  # None if the section timed out
     module_analytics: List[ModuleAnalytics]
     recent_activities: List[dict]
     alert_summary: dict
+    generated_at: Optional[datetime] = None
+    age_seconds: float = 0  # how old the (possibly cached) data is
+    stale: bool = False  # served while a refresh runs in the background
+    degraded: bool = False  # some sections failed or timed out
+    degraded_sections: List[str] = []
 
 
 # Response Schemas
@@ -332,4 +424,13 @@ class ListResponse(ResponseBase):
     data: List[dict]
     total: int
     page: int = 1
-    per_page: int = 10
\ No newline at end of file
+    per_page: int = 10
+
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
\ No newline at end of file
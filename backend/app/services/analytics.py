@@ -1,12 +1,59 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Dict, List, Any
+from sqlalchemy import DateTime, Integer, String, and_, cast, column, extract, func, literal, null, select, text, union_all
+from typing import Dict, List, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+import logging
+import time
+
+import numpy as np
 
 from ..models.models import (
-    User, DisasterModule, StudentProgress, QuizAttempt, 
-    EmergencyAlert, SOSRequest, UserRole
+    User, DisasterModule, StudentProgress,
+    EmergencyAlert, SOSRequest, GlobalRollup, ModuleRollup,
+    CohortRollup, CohortModuleRollup
 )
+from ..core.cache import StaleWhileRevalidateCache
+from ..core.config import settings
+from ..core.database import open_read_session
+from ..core.pagination import cursor_condition, cursor_page, decode_cursor, sort_order
+from ..models.events import GLOBAL_ROLLUP_ID
+
+logger = logging.getLogger(__name__)
+
+# Activity feed order; the type breaks ties between progress and SOS ids
+ACTIVITY_SORT_KEYS = [
+    (column("timestamp", DateTime), True),
+    (column("type", String), True),
+    (column("id", Integer), True)
+]
+
+
+def _activities_after(stmt, activity_type: str, timestamp, id_column, values):
+    """Restrict one feed branch to the activities that sort after the cursor values."""
+    after_timestamp, after_type, after_id = values
+    if activity_type == after_type:
+        return stmt.where(cursor_condition([(timestamp, True), (id_column, True)], [after_timestamp, after_id]))
+    # Types sort descending: at the cursor's timestamp, lesser types come after it
+    return stmt.where(cursor_condition([(timestamp, True)], [after_timestamp], inclusive=activity_type < after_type))
+
+
+# Time-to-resolve histogram edges, in hours (last bucket is open-ended)
+SLA_HOUR_BINS = np.array([0, 1, 2, 4, 8, 12, 24, 48, np.inf])
+
+
+def _duration_stats(durations: np.ndarray) -> Dict[str, Any]:
+    if not durations.size:
+        return {"resolved": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None}
+    p50, p90, p99 = np.percentile(durations, [50, 90, 99])
+    return {
+        "resolved": int(durations.size),
+        "mean": round(float(durations.mean()), 1),
+        "p50": round(float(p50), 1),
+        "p90": round(float(p90), 1),
+        "p99": round(float(p99), 1),
+        "max": round(float(durations.max()), 1)
+    }
 
 
 class AnalyticsService:
@@ -15,108 +62,150 @@ class AnalyticsService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _global_rollup(self) -> Optional[GlobalRollup]:
+        return self.db.get(GlobalRollup, GLOBAL_ROLLUP_ID)
+    
     def get_user_analytics(self) -> Dict[str, Any]:
-        """Get user-related analytics."""
-        total_users = self.db.query(User).count()
-        active_users = self.db.query(User).filter(User.is_active == True).count()
-        students = self.db.query(User).filter(User.role == UserRole.STUDENT).count()
-        admins = self.db.query(User).filter(User.role == UserRole.ADMIN).count()
+        """Get user-related analytics from the global rollup."""
+        rollup = self._global_rollup()
+        students = rollup.students if rollup else 0
+        completed_progress = rollup.completed_progress if rollup else 0
         
         # Calculate completion rate
-        total_modules = self.db.query(DisasterModule).filter(DisasterModule.is_active == True).count()
+        total_modules = self.db.scalar(
+            select(func.count(DisasterModule.id)).where(DisasterModule.is_active == True)
+        )
         if total_modules > 0:
-            completed_progress = self.db.query(StudentProgress).filter(
-                StudentProgress.completed == True
-            ).count()
             completion_rate = (completed_progress / (students * total_modules)) * 100 if students > 0 else 0
         else:
             completion_rate = 0
         
         return {
-            "total_users": total_users,
-            "active_users": active_users,
+            "total_users": rollup.total_users if rollup else 0,
+            "active_users": rollup.active_users if rollup else 0,
             "students": students,
-            "admins": admins,
+            "admins": rollup.admins if rollup else 0,
             "completion_rate": round(completion_rate, 2)
         }
     
     def get_module_analytics(self) -> List[Dict[str, Any]]:
-        """Get module-specific analytics."""
-        modules = self.db.query(DisasterModule).filter(DisasterModule.is_active == True).all()
-        analytics = []
-        
-        for module in modules:
-            # Get completion stats
-            total_students = self.db.query(User).filter(User.role == UserRole.STUDENT).count()
-            completed_count = self.db.query(StudentProgress).filter(
-                StudentProgress.module_id == module.id,
-                StudentProgress.completed == True
-            ).count()
-            
-            completion_rate = (completed_count / total_students * 100) if total_students > 0 else 0
-            
-            # Get average score
-            avg_score = self.db.query(func.avg(StudentProgress.score)).filter(
-                StudentProgress.module_id == module.id,
-                StudentProgress.completed == True
-            ).scalar()
-            
-            # Get total attempts
-            total_attempts = self.db.query(QuizAttempt).filter(
-                QuizAttempt.module_id == module.id
-            ).count()
-            
-            analytics.append({
-                "module_id": module.id,
-                "module_title": module.title,
-                "completion_rate": round(completion_rate, 2),
-                "average_score": round(avg_score or 0, 2),
-                "total_attempts": total_attempts
-            })
+        """Get module-specific analytics from the module rollups."""
+        rollup = self._global_rollup()
+        total_students = rollup.students if rollup else 0
+        
+        rows = self.db.execute(
+            select(
+                DisasterModule.id,
+                DisasterModule.title,
+                func.coalesce(ModuleRollup.completed_count, 0).label("completed_count"),
+                func.coalesce(ModuleRollup.completed_scored, 0).label("completed_scored"),
+                func.coalesce(ModuleRollup.completed_score_sum, 0).label("completed_score_sum"),
+                func.coalesce(ModuleRollup.quiz_attempts, 0).label("total_attempts")
+            )
+            .outerjoin(ModuleRollup, ModuleRollup.module_id == DisasterModule.id)
+            .where(DisasterModule.is_active == True)
+            .order_by(DisasterModule.id)
+        ).all()
         
-        return analytics
+        return [
+            {
+                "module_id": row.id,
+                "module_title": row.title,
+                "completion_rate": round(row.completed_count / total_students * 100, 2) if total_students else 0,
+                "average_score": round(row.completed_score_sum / row.completed_scored, 2) if row.completed_scored else 0,
+                "total_attempts": row.total_attempts
+            }
+            for row in rows
+        ]
     
-    def get_recent_activities(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent user activities."""
-        activities = []
+    def get_recent_activities(
+        self, limit: int = 10, cursor: Optional[str] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Get recent user activities, newest first.
         
-        # Recent completions
-        recent_completions = self.db.query(StudentProgress).filter(
+        Returns a plain list, or a cursor page (see core/pagination.py) when a
+        cursor is given; an empty cursor starts from the newest activity.
+        """
+        values = decode_cursor(cursor, ACTIVITY_SORT_KEYS) if cursor else None
+        fetch = limit + 1 if cursor is not None else limit
+        
+        # Each branch is ordered and limited on its own index before the merge
+        completions = select(
+            literal("module_completion").label("type"),
+            StudentProgress.id.label("id"),
+            func.coalesce(User.name, "Unknown").label("user_name"),
+            func.coalesce(DisasterModule.title, "Unknown").label("module_title"),
+            StudentProgress.score.label("score"),
+            cast(null(), String).label("status"),
+            cast(null(), String).label("location"),
+            StudentProgress.completed_at.label("timestamp")
+        ).select_from(StudentProgress).outerjoin(
+            User, User.id == StudentProgress.user_id
+        ).outerjoin(
+            DisasterModule, DisasterModule.id == StudentProgress.module_id
+        ).where(
             StudentProgress.completed == True,
             StudentProgress.completed_at != None
-        ).order_by(StudentProgress.completed_at.desc()).limit(limit).all()
-        
-        for completion in recent_completions:
-            user = self.db.query(User).filter(User.id == completion.user_id).first()
-            module = self.db.query(DisasterModule).filter(DisasterModule.id == completion.module_id).first()
-            
-            activities.append({
-                "type": "module_completion",
-                "user_name": user.name if user else "Unknown",
-                "module_title": module.title if module else "Unknown",
-                "score": completion.score,
-                "timestamp": completion.completed_at
-            })
+        )
         
-        # Recent SOS requests
-        recent_sos = self.db.query(SOSRequest).order_by(
-            SOSRequest.created_at.desc()
-        ).limit(5).all()
-        
-        for sos in recent_sos:
-            user = self.db.query(User).filter(User.id == sos.user_id).first()
-            
-            activities.append({
-                "type": "sos_request",
-                "user_name": user.name if user else "Unknown",
-                "status": sos.status,
-                "location": sos.location,
-                "timestamp": sos.created_at
-            })
+        sos_requests = select(
+            literal("sos_request").label("type"),
+            SOSRequest.id.label("id"),
+            func.coalesce(User.name, "Unknown").label("user_name"),
+            cast(null(), String).label("module_title"),
+            cast(null(), Integer).label("score"),
+            SOSRequest.status.label("status"),
+            SOSRequest.location.label("location"),
+            SOSRequest.created_at.label("timestamp")
+        ).select_from(SOSRequest).outerjoin(
+            User, User.id == SOSRequest.user_id
+        )
         
-        # Sort by timestamp and limit
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        return activities[:limit]
+        if values is not None:
+            completions = _activities_after(
+                completions, "module_completion", StudentProgress.completed_at, StudentProgress.id, values
+            )
+            sos_requests = _activities_after(
+                sos_requests, "sos_request", SOSRequest.created_at, SOSRequest.id, values
+            )
+        
+        completions = completions.order_by(
+            *sort_order([(StudentProgress.completed_at, True), (StudentProgress.id, True)])
+        ).limit(fetch).subquery()
+        sos_requests = sos_requests.order_by(
+            *sort_order([(SOSRequest.created_at, True), (SOSRequest.id, True)])
+        ).limit(fetch).subquery()
+        
+        feed = union_all(select(completions), select(sos_requests)).subquery()
+        feed_keys = [(feed.c[key.name], descending) for key, descending in ACTIVITY_SORT_KEYS]
+        rows = self.db.execute(
+            select(feed).order_by(*sort_order(feed_keys)).limit(fetch)
+        ).all()
+        
+        if cursor is None:
+            return [self._activity(row) for row in rows]
+        
+        page = cursor_page(rows, ACTIVITY_SORT_KEYS, limit)
+        page["items"] = [self._activity(row) for row in page["items"]]
+        return page
+    
+    @staticmethod
+    def _activity(row) -> Dict[str, Any]:
+        if row.type == "module_completion":
+            return {
+                "type": row.type,
+                "user_name": row.user_name,
+                "module_title": row.module_title,
+                "score": row.score,
+                "timestamp": row.timestamp
+            }
+        return {
+            "type": row.type,
+            "user_name": row.user_name,
+            "status": row.status,
+            "location": row.location,
+            "timestamp": row.timestamp
+        }
     
     def get_alert_summary(self) -> Dict[str, Any]:
         """Get emergency alerts summary."""
@@ -135,10 +224,9 @@ class AnalyticsService:
             (EmergencyAlert.expires_at == None) | (EmergencyAlert.expires_at > now)
         ).count()
         
-        # Active SOS requests
-        active_sos = self.db.query(SOSRequest).filter(
-            SOSRequest.status == "active"
-        ).count()
+        # Active SOS requests (alert counts stay live: expiry is time-based)
+        rollup = self._global_rollup()
+        active_sos = rollup.active_sos if rollup else 0
         
         # Recent alerts (last 24 hours)
         last_24h = now - timedelta(hours=24)
@@ -153,11 +241,216 @@ class AnalyticsService:
             "recent_alerts_24h": recent_alerts
         }
     
+    def get_cohort_analytics(self, dimension: str) -> Dict[str, Any]:
+        """Get cohort x module completion, score and attempt figures.
+        
+        dimension is "department" or "year"; one query over the cohort rollups.
+        """
+        rows = self.db.execute(
+            select(
+                CohortRollup.cohort,
+                CohortRollup.students,
+                DisasterModule.id.label("module_id"),
+                DisasterModule.title.label("module_title"),
+                func.coalesce(CohortModuleRollup.completed_count, 0).label("completed_count"),
+                func.coalesce(CohortModuleRollup.completed_scored, 0).label("completed_scored"),
+                func.coalesce(CohortModuleRollup.completed_score_sum, 0).label("completed_score_sum"),
+                func.coalesce(CohortModuleRollup.quiz_attempts, 0).label("quiz_attempts")
+            )
+            .select_from(CohortRollup)
+            .join(DisasterModule, DisasterModule.is_active == True)
+            .outerjoin(CohortModuleRollup, and_(
+                CohortModuleRollup.dimension == CohortRollup.dimension,
+                CohortModuleRollup.cohort == CohortRollup.cohort,
+                CohortModuleRollup.module_id == DisasterModule.id
+            ))
+            .where(CohortRollup.dimension == dimension, CohortRollup.students > 0)
+            .order_by(CohortRollup.cohort, DisasterModule.id)
+        ).all()
+        
+        cohorts: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            cohort = cohorts.setdefault(row.cohort, {
+                "cohort": row.cohort or None,
+                "students": row.students,
+                "modules": []
+            })
+            cohort["modules"].append({
+                "module_id": row.module_id,
+                "module_title": row.module_title,
+                "completion_rate": round(row.completed_count / row.students * 100, 2),
+                "average_score": round(row.completed_score_sum / row.completed_scored, 2) if row.completed_scored else 0,
+                "total_attempts": row.quiz_attempts
+            })
+        
+        return {"dimension": dimension, "cohorts": list(cohorts.values())}
+    
+    def _epoch_seconds(self, column):
+        """SQL expression for a timestamp as (float) seconds since the epoch."""
+        if self.db.get_bind().dialect.name == "sqlite":
+            return (func.julianday(column) - 2440587.5) * 86400.0
+        return extract("epoch", column)
+    
+    def get_sos_response_times(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Get SOS time-to-resolve percentiles, histograms and per-resolver stats.
+        
+        Covers requests created in [start, end). Columns are fetched in one
+        query and aggregated with NumPy.
+        """
+        created = self._epoch_seconds(SOSRequest.created_at)
+        resolved = self._epoch_seconds(SOSRequest.resolved_at)
+        rows = self.db.execute(
+            select(
+                created,
+                resolved,
+                func.coalesce(SOSRequest.resolved_by, -1)
+            ).where(
+                SOSRequest.created_at >= start,
+                SOSRequest.created_at < end
+            )
+        ).all()
+        
+        data = np.array(rows, dtype=float).reshape(-1, 3)
+        created_at, resolved_at, resolver_ids = data[:, 0], data[:, 1], data[:, 2].astype(np.int64)
+        is_resolved = ~np.isnan(resolved_at)
+        durations = resolved_at[is_resolved] - created_at[is_resolved]
+        resolvers = resolver_ids[is_resolved]
+        
+        created_by_hour = np.bincount(
+            ((created_at // 3600) % 24).astype(np.int64), minlength=24
+        )
+        resolve_hours_histogram = np.bincount(
+            np.searchsorted(SLA_HOUR_BINS[1:-1], durations / 3600, side="right"),
+            minlength=SLA_HOUR_BINS.size - 1
+        )
+        
+        by_resolver = []
+        if durations.size:
+            order = np.argsort(resolvers, kind="stable")
+            ids, starts = np.unique(resolvers[order], return_index=True)
+            names = dict(self.db.execute(
+                select(User.id, User.name).where(User.id.in_([int(i) for i in ids if i >= 0]))
+            ).all())
+            for resolver_id, group in zip(ids, np.split(durations[order], starts[1:])):
+                by_resolver.append({
+                    "resolver_id": int(resolver_id) if resolver_id >= 0 else None,
+                    "resolver_name": names.get(int(resolver_id)),
+                    **_duration_stats(group)
+                })
+            by_resolver.sort(key=lambda item: item["resolved"], reverse=True)
+        
+        return {
+            "start": start,
+            "end": end,
+            "total_requests": int(created_at.size),
+            "open_requests": int(created_at.size - durations.size),
+            "time_to_resolve_seconds": _duration_stats(durations),
+            "created_by_hour_utc": created_by_hour.tolist(),
+            "time_to_resolve_histogram": [
+                {"hours_from": int(low), "hours_to": None if np.isinf(high) else int(high), "count": int(count)}
+                for low, high, count in zip(SLA_HOUR_BINS[:-1], SLA_HOUR_BINS[1:], resolve_hours_histogram)
+            ],
+            "by_resolver": by_resolver
+        }
+    
     def get_dashboard_analytics(self) -> Dict[str, Any]:
-        """Get comprehensive dashboard analytics."""
+        """Get comprehensive dashboard analytics sequentially on this session."""
         return {
             "user_analytics": self.get_user_analytics(),
             "module_analytics": self.get_module_analytics(),
             "recent_activities": self.get_recent_activities(),
             "alert_summary": self.get_alert_summary()
-        }
\ No newline at end of file
+        }
+
+
+# Dashboard sections, their method and the value reported if they time out
+DASHBOARD_SECTIONS = {
+    "user_analytics": ("get_user_analytics", None),
+    "module_analytics": ("get_module_analytics", []),
+    "recent_activities": ("get_recent_activities", []),
+    "alert_summary": ("get_alert_summary", {})
+}
+
+_section_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_section_executor() -> ThreadPoolExecutor:
+    """Get (lazily creating) the thread pool that runs dashboard sections."""
+    global _section_executor
+    if _section_executor is None:
+        _section_executor = ThreadPoolExecutor(
+            max_workers=settings.dashboard_section_workers,
+            thread_name_prefix="dashboard"
+        )
+    return _section_executor
+
+
+def shutdown_section_executor() -> None:
+    """Stop the dashboard section pool."""
+    global _section_executor
+    if _section_executor is not None:
+        _section_executor.shutdown(wait=False, cancel_futures=True)
+        _section_executor = None
+
+
+def _run_section(method: str) -> Any:
+    # Each section gets its own pooled connection
+    db = open_read_session()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            # Stop overrunning queries server-side instead of letting them hold a connection
+            timeout_ms = int(settings.dashboard_section_timeout_seconds * 1000)
+            db.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+        return getattr(AnalyticsService(db), method)()
+    finally:
+        db.close()
+
+
+def compute_dashboard() -> Dict[str, Any]:
+    """Compute every dashboard section concurrently, each with a timeout.
+    
+    Sections that fail or overrun are reported empty and listed in
+    degraded_sections instead of holding up the rest of the dashboard.
+    """
+    executor = get_section_executor()
+    futures = {
+        name: executor.submit(_run_section, method)
+        for name, (method, _) in DASHBOARD_SECTIONS.items()
+    }
+    wait(futures.values(), timeout=settings.dashboard_section_timeout_seconds)
+    
+    dashboard = {}
+    degraded_sections = []
+    for name, future in futures.items():
+        if future.done() and future.exception() is None:
+            dashboard[name] = future.result()
+            continue
+        if future.done():
+            logger.warning("Dashboard section %s failed: %r", name, future.exception())
+        else:
+            future.cancel()
+            logger.warning("Dashboard section %s timed out", name)
+        dashboard[name] = DASHBOARD_SECTIONS[name][1]
+        degraded_sections.append(name)
+    
+    dashboard["degraded"] = bool(degraded_sections)
+    dashboard["degraded_sections"] = degraded_sections
+    return dashboard
+
+
+# Dashboard results shared by every admin
+dashboard_cache = StaleWhileRevalidateCache(
+    ttl=settings.dashboard_cache_ttl_seconds,
+    stale_ttl=settings.dashboard_stale_ttl_seconds
+)
+
+
+def get_cached_dashboard() -> Dict[str, Any]:
+    """Get dashboard analytics from the shared cache, with the data's age."""
+    dashboard, computed_at, stale = dashboard_cache.get("dashboard", compute_dashboard)
+    return {
+        **dashboard,
+        "generated_at": datetime.utcfromtimestamp(computed_at),
+        "age_seconds": round(max(0.0, time.time() - computed_at), 3),
+        "stale": stale
+    }
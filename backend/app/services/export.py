@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+from typing import Any, Dict, IO, Iterator, List
+
+from sqlalchemy import JSON, BigInteger, Boolean, Date, DateTime, Float, Integer, select
+from sqlalchemy.engine import Connection
+
+from ..core.config import settings
+from ..models.models import StudentProgress, QuizAttempt, SOSRequest
+
+# Tables that can be exported, by name
+EXPORT_TABLES = {
+    "student_progress": StudentProgress.__table__,
+    "quiz_attempts": QuizAttempt.__table__,
+    "sos_requests": SOSRequest.__table__
+}
+
+EXPORT_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv"
+}
+
+
+def pyarrow_available() -> bool:
+    """Whether the optional pyarrow dependency is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained between batches."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(column):
+    import pyarrow as pa
+
+    column_type = column.type
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+class TableExporter:
+    """Streams a table out of a server-side cursor as Parquet or CSV."""
+
+    def __init__(self, connection: Connection, table_name: str, batch_size: int = None):
+        self.connection = connection
+        self.table = EXPORT_TABLES[table_name]
+        self.batch_size = batch_size or settings.export_batch_size
+        self._json_columns = {
+            column.name for column in self.table.columns if isinstance(column.type, JSON)
+        }
+
+    def iter_row_batches(self) -> Iterator[List[Any]]:
+        """Yield lists of rows, holding at most one batch in memory."""
+        result = self.connection.execution_options(yield_per=self.batch_size).execute(
+            select(self.table).order_by(*self.table.primary_key.columns)
+        )
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+
+    def _columns(self, rows) -> Dict[str, list]:
+        columns = {}
+        for index, column in enumerate(self.table.columns):
+            values = [row[index] for row in rows]
+            if column.name in self._json_columns:
+                values = [None if value is None else json.dumps(value) for value in values]
+            columns[column.name] = values
+        return columns
+
+    def iter_record_batches(self):
+        """Yield Arrow record batches (requires pyarrow)."""
+        import pyarrow as pa
+
+        schema = self.schema()
+        for rows in self.iter_row_batches():
+            yield pa.RecordBatch.from_pydict(self._columns(rows), schema=schema)
+
+    def schema(self):
+        """Arrow schema derived from the table's column types."""
+        import pyarrow as pa
+
+        return pa.schema([
+            pa.field(column.name, _arrow_type(column), nullable=column.nullable)
+            for column in self.table.columns
+        ])
+
+    def iter_bytes(self, fmt: str) -> Iterator[bytes]:
+        """Yield the encoded export chunk by chunk."""
+        if fmt == "parquet":
+            return self._iter_parquet()
+        if pyarrow_available():
+            return self._iter_arrow_csv()
+        return self._iter_plain_csv()
+
+    def write(self, fmt: str, stream: IO[bytes]) -> None:
+        """Write the whole export to a binary stream."""
+        for chunk in self.iter_bytes(fmt):
+            stream.write(chunk)
+
+    def _iter_parquet(self) -> Iterator[bytes]:
+        import pyarrow.parquet as pq
+
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, self.schema(), compression="zstd") as writer:
+            for batch in self.iter_record_batches():
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def _iter_arrow_csv(self) -> Iterator[bytes]:
+        import pyarrow.csv as pa_csv
+
+        sink = _ChunkSink()
+        with pa_csv.CSVWriter(sink, self.schema()) as writer:
+            for batch in self.iter_record_batches():
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def _iter_plain_csv(self) -> Iterator[bytes]:
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow([column.name for column in self.table.columns])
+        for rows in self.iter_row_batches():
+            columns = self._columns(rows)
+            writer.writerows(zip(*columns.values()))
+            yield text.getvalue().encode()
+            text.seek(0)
+            text.truncate()
+        yield text.getvalue().encode()
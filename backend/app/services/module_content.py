@@ -0,0 +1,68 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models.models import DisasterModule, ModulePhase
+from ..models.schemas import ModuleContent
+
+PHASE_ORDER = {"before": 0, "during": 1, "after": 2}
+
+# Serialized content per (module id, content_version); a new version is a new
+# key, so entries never need invalidating and the TTL only bounds memory
+content_cache = TTLCache(max_size=settings.module_content_cache_max_size, ttl=24 * 3600)
+
+
+class ModuleContentService:
+    """Service for serving a module's full before/during/after content tree."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def content_version(self, module_id: int) -> Optional[int]:
+        """Current content version of an active module (None if not found)."""
+        return self.db.execute(
+            select(DisasterModule.content_version).where(
+                DisasterModule.id == module_id,
+                DisasterModule.is_active == True
+            )
+        ).scalar()
+
+    def load_tree(self, module_id: int) -> Optional[DisasterModule]:
+        """Load a module with every phase and phase item (five queries)."""
+        return self.db.execute(
+            select(DisasterModule)
+            .where(DisasterModule.id == module_id, DisasterModule.is_active == True)
+            .options(
+                selectinload(DisasterModule.phases).selectinload(ModulePhase.checklists),
+                selectinload(DisasterModule.phases).selectinload(ModulePhase.steps),
+                selectinload(DisasterModule.phases).selectinload(ModulePhase.qa_items)
+            )
+        ).scalar_one_or_none()
+
+    def serialize(self, module: DisasterModule) -> bytes:
+        content = ModuleContent.model_validate(module)
+        content.phases.sort(key=lambda phase: (PHASE_ORDER.get(phase.phase_type, len(PHASE_ORDER)), phase.id))
+        return content.model_dump_json().encode()
+
+    def content_json(self, module_id: int, version: Optional[int] = None) -> Optional[bytes]:
+        """Serialized content tree, from the cache when the version matches.
+
+        Pass the version when the caller has already read it.
+        """
+        if version is None:
+            version = self.content_version(module_id)
+        if version is None:
+            return None
+
+        body = content_cache.get((module_id, version))
+        if body is None:
+            module = self.load_tree(module_id)
+            if module is None:
+                return None
+            body = self.serialize(module)
+            # Key by the version that was loaded; it may be newer than the one checked
+            content_cache.set((module_id, module.content_version), body)
+        return body
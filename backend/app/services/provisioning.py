@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, IO, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.security import get_password_hash
+from ..models.events import record_users_added
+from ..models.models import User, UserRole
+from ..models.schemas import UserCreate, UserRole as UserRoleSchema
+
+# Columns written by the bulk insert, in COPY order
+_COPY_COLUMNS = (
+    "email", "hashed_password", "name", "role", "is_active",
+    "token_version", "phone", "department", "year_of_study"
+)
+
+
+class BulkProvisioningService:
+    """Service for importing large batches of student accounts."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.batch_size = settings.bulk_import_batch_size
+        self.hash_workers = settings.bulk_import_hash_workers or os.cpu_count() or 1
+
+    def read_rows(self, stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (row number, raw record) pairs from a CSV or NDJSON upload."""
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        if fmt == "csv":
+            for row_number, record in enumerate(csv.DictReader(text), start=1):
+                yield row_number, record
+            return
+
+        for row_number, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except ValueError:
+                yield row_number, None
+
+    def import_rows(self, rows: Iterator[Tuple[int, Any]]) -> Iterator[Dict[str, Any]]:
+        """Import rows batch by batch, yielding one result per row and a summary.
+
+        The summary line is always the last one, even if the import stops early.
+        """
+        summary = {"created": 0, "exists": 0, "duplicate": 0, "invalid": 0, "error": 0}
+        seen_emails = set()
+
+        try:
+            # A dedicated pool keeps imports from queueing behind (or ahead of) logins
+            with ProcessPoolExecutor(max_workers=self.hash_workers) as executor:
+                batch: List[Tuple[int, Any]] = []
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= self.batch_size:
+                        yield from self._report_batch(batch, seen_emails, executor, summary)
+                        batch = []
+                if batch:
+                    yield from self._report_batch(batch, seen_emails, executor, summary)
+        except Exception as exc:
+            # e.g. an upload that is not valid UTF-8; rows already reported stand
+            self.db.rollback()
+            yield {"status": "error", "detail": f"Import stopped: {exc.__class__.__name__}"}
+
+        yield {"summary": summary}
+
+    def _report_batch(self, batch, seen_emails, executor, summary) -> Iterator[Dict[str, Any]]:
+        try:
+            results = self._import_batch(batch, seen_emails, executor)
+        except Exception as exc:
+            self.db.rollback()
+            detail = f"Batch failed: {exc.__class__.__name__}"
+            results = [{"row": row_number, "status": "error", "detail": detail} for row_number, _ in batch]
+
+        for result in results:
+            summary[result["status"]] += 1
+            yield result
+
+    def _import_batch(self, batch, seen_emails, executor) -> List[Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        candidates: List[Tuple[int, UserCreate]] = []
+
+        for row_number, record in batch:
+            user_data, error = self._validate(record)
+            if error:
+                results[row_number] = {"row": row_number, "status": "invalid", "detail": error}
+            elif user_data.email in seen_emails:
+                results[row_number] = {"row": row_number, "email": user_data.email,
+                                       "status": "duplicate", "detail": "Duplicate email in upload"}
+            else:
+                seen_emails.add(user_data.email)
+                candidates.append((row_number, user_data))
+
+        # One set-based lookup for every email in the batch
+        existing = set()
+        if candidates:
+            existing = {
+                email for (email,) in self.db.query(User.email).filter(
+                    User.email.in_([user_data.email for _, user_data in candidates])
+                )
+            }
+
+        new_users = []
+        for row_number, user_data in candidates:
+            if user_data.email in existing:
+                results[row_number] = {"row": row_number, "email": user_data.email,
+                                       "status": "exists", "detail": "Email already registered"}
+            else:
+                new_users.append((row_number, user_data))
+
+        # Hashes are collected per row, so one unhashable password fails only its row
+        futures = [
+            (row_number, user_data, executor.submit(get_password_hash, user_data.password))
+            for row_number, user_data in new_users
+        ]
+        hashed_users = []
+        for row_number, user_data, future in futures:
+            try:
+                hashed_users.append((row_number, user_data, future.result()))
+            except Exception as exc:
+                results[row_number] = {"row": row_number, "email": user_data.email, "status": "error",
+                                       "detail": f"Password hashing failed: {exc.__class__.__name__}"}
+
+        if hashed_users:
+            records = [
+                {
+                    "email": user_data.email,
+                    "hashed_password": hashed_password,
+                    "name": user_data.name,
+                    "role": UserRole.STUDENT,
+                    "is_active": True,
+                    "token_version": 0,
+                    "phone": user_data.phone,
+                    "department": user_data.department,
+                    "year_of_study": user_data.year_of_study
+                }
+                for _, user_data, hashed_password in hashed_users
+            ]
+
+            try:
+                self._insert(records)
+                record_users_added(self.db.connection(), records)
+                self.db.commit()
+                status, detail = "created", None
+            except Exception as exc:
+                self.db.rollback()
+                status, detail = "error", f"Batch insert failed: {exc.__class__.__name__}"
+
+            for row_number, user_data, _ in hashed_users:
+                results[row_number] = {"row": row_number, "email": user_data.email,
+                                       "status": status, "detail": detail}
+
+        return [results[row_number] for row_number, _ in batch]
+
+    def _validate(self, record: Any):
+        if not isinstance(record, dict):
+            return None, "Malformed row"
+
+        try:
+            user_data = UserCreate(**{
+                key: value for key, value in record.items()
+                if key and value not in (None, "")
+            })
+        except ValidationError as exc:
+            return None, "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            )
+
+        if user_data.role != UserRoleSchema.STUDENT:
+            return None, "Only student accounts can be bulk imported"
+
+        return user_data, None
+
+    def _insert(self, records: List[Dict[str, Any]]) -> None:
+        """Insert with COPY on PostgreSQL and executemany elsewhere."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            self.db.execute(insert(User), records)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerow([
+                record["role"].name if column == "role" else record[column]
+                for column in _COPY_COLUMNS
+            ])
+        buffer.seek(0)
+
+        # psycopg2 COPY on the session's own connection, inside its transaction
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY users ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
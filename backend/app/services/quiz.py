@@ -0,0 +1,149 @@
+import logging
+from array import array
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.http_cache import current_versions
+from ..models.events import MODULES_SCOPE, questions_scope
+from ..models.models import DisasterModule, QuizAttempt, QuizQuestion, StudentProgress
+
+
+logger = logging.getLogger(__name__)
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+class AnswerKey(NamedTuple):
+    question_ids: array  # question ids in submission order (ascending id)
+    correct: array  # correct option index per question
+    option_counts: array  # number of options per question
+
+
+# Answer keys per (module id, phase, modules version, questions version); edits
+# move to a new key, so cached keys never need invalidating
+answer_key_cache = TTLCache(max_size=settings.answer_key_cache_max_size, ttl=24 * 3600)
+
+
+class QuizGradingService:
+    """Service for grading quiz submissions server-side."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def answer_key(self, module_id: int, phase: Optional[str] = None) -> Optional[AnswerKey]:
+        """Answer key for an active module, or one of its phases (None if it has no quiz)."""
+        versions = current_versions(self.db, MODULES_SCOPE, questions_scope(module_id))
+        cache_key = (module_id, phase, *versions.values())
+        key = answer_key_cache.get(cache_key)
+        if key is not None:
+            return key
+
+        stmt = (
+            select(QuizQuestion.id, QuizQuestion.correct_answer, QuizQuestion.options)
+            .join(DisasterModule, DisasterModule.id == QuizQuestion.module_id)
+            .where(QuizQuestion.module_id == module_id, DisasterModule.is_active == True)
+            .order_by(QuizQuestion.id)
+        )
+        if phase:
+            stmt = stmt.where(QuizQuestion.phase == phase)
+        rows = self.db.execute(stmt).all()
+        if not rows:
+            return None
+
+        option_counts = [len(row.options or []) for row in rows]
+        for row, count in zip(rows, option_counts):
+            if not 0 <= row.correct_answer < count:
+                # Nothing can match it, so the question always grades as wrong
+                logger.warning("Quiz question %s has correct_answer %s but %s options",
+                               row.id, row.correct_answer, count)
+
+        key = AnswerKey(
+            array("l", (row.id for row in rows)),
+            array("l", (row.correct_answer for row in rows)),
+            array("l", option_counts)
+        )
+        answer_key_cache.set(cache_key, key)
+        return key
+
+    @staticmethod
+    def invalid_answers(key: AnswerKey, answers: List[int]) -> List[int]:
+        """Positions of answers that are not an option index of their question."""
+        return [
+            position for position, (given, count) in enumerate(zip(answers, key.option_counts))
+            if not 0 <= given < count
+        ]
+
+    @staticmethod
+    def grade(key: AnswerKey, answers: List[int]) -> List[bool]:
+        """Per-question correctness of a submission."""
+        return [given == expected for given, expected in zip(answers, key.correct)]
+
+    def submit(
+        self,
+        user_id: int,
+        module_id: int,
+        answers: List[int],
+        results: List[bool],
+        phase: Optional[str] = None
+    ) -> QuizAttempt:
+        """Record an attempt, and for whole-module submissions the progress score.
+
+        A single phase only covers part of the quiz, so it never overwrites
+        the module score.
+        """
+        total = len(results)
+        correct = sum(results)
+
+        attempt = QuizAttempt(
+            user_id=user_id,
+            module_id=module_id,
+            phase=phase,
+            score=correct,
+            total_questions=total,
+            answers=answers
+        )
+        self.db.add(attempt)
+
+        if phase is None:
+            progress = self._lock_progress(user_id, module_id)
+            progress.score = round(correct * 100 / total)
+
+        self.db.commit()
+        self.db.refresh(attempt)
+        return attempt
+
+    def _lock_progress(self, user_id: int, module_id: int) -> StudentProgress:
+        """Get the user's progress row for a module, creating it if missing.
+
+        The row is created with INSERT ... ON CONFLICT DO NOTHING against the
+        unique (user_id, module_id) index, so concurrent first submissions
+        share one row. A new row is not completed, so skipping the ORM insert
+        listeners leaves the rollups unchanged; the score itself is set through
+        the ORM so the update listeners see it.
+        """
+        values = {"user_id": user_id, "module_id": module_id, "completed": False, "score": 0, "time_spent": 0}
+        upsert = _UPSERTS.get(self.db.get_bind().dialect.name)
+        if upsert is not None:
+            self.db.execute(
+                upsert(StudentProgress).values(**values)
+                .on_conflict_do_nothing(index_elements=["user_id", "module_id"])
+            )
+        else:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(StudentProgress).values(**values))
+            except IntegrityError:
+                pass
+
+        return self.db.execute(
+            select(StudentProgress)
+            .where(StudentProgress.user_id == user_id, StudentProgress.module_id == module_id)
+            .with_for_update()
+        ).scalars().one()
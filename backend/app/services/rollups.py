@@ -0,0 +1,194 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlalchemy.engine import Connection
+
+from ..models.events import GLOBAL_ROLLUP_ID, ROLLUP_LOCK_ORDER
+from ..models.models import (
+    User, UserRole, StudentProgress, QuizAttempt, SOSRequest, EmergencyAlert,
+    GlobalRollup, ModuleRollup, DepartmentRollup, DailyRollup,
+    CohortRollup, CohortModuleRollup
+)
+
+ROLLUP_MODELS = (
+    GlobalRollup, ModuleRollup, DepartmentRollup, DailyRollup,
+    CohortRollup, CohortModuleRollup
+)
+
+# Cohort dimensions and the user column behind each
+COHORT_COLUMNS = {"department": User.department, "year": User.year_of_study}
+
+
+def _as_date(value) -> date:
+    # SQLite returns DATE() results as strings
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def compute_rollups(connection: Connection) -> Dict[Any, List[Dict[str, Any]]]:
+    """Recompute every rollup row from the live tables."""
+    department = func.coalesce(User.department, "")
+    completed = StudentProgress.completed == True
+
+    users = connection.execute(select(
+        func.count(User.id),
+        # NULL is_active / status count as active, as in the listeners
+        func.count(User.id).filter(or_(User.is_active == True, User.is_active == None)),
+        func.count(User.id).filter(User.role == UserRole.STUDENT),
+        func.count(User.id).filter(User.role == UserRole.ADMIN)
+    )).one()
+    completed_progress = connection.execute(
+        select(func.count(StudentProgress.id)).where(completed)
+    ).scalar()
+    active_sos = connection.execute(
+        select(func.count(SOSRequest.id)).where(or_(SOSRequest.status == "active", SOSRequest.status == None))
+    ).scalar()
+    global_row = {
+        "id": GLOBAL_ROLLUP_ID, "total_users": users[0], "active_users": users[1],
+        "students": users[2], "admins": users[3],
+        "completed_progress": completed_progress, "active_sos": active_sos
+    }
+
+    # count(score) skips NULL scores, which the averages leave out
+    scored = func.count(StudentProgress.score)
+    score_sum = func.coalesce(func.sum(StudentProgress.score), 0)
+
+    modules = defaultdict(lambda: {"completed_count": 0, "completed_scored": 0, "completed_score_sum": 0,
+                                   "quiz_attempts": 0})
+    for module_id, count, scored_count, total in connection.execute(
+        select(StudentProgress.module_id, func.count(StudentProgress.id), scored, score_sum)
+        .where(completed).group_by(StudentProgress.module_id)
+    ):
+        modules[module_id].update(completed_count=count, completed_scored=scored_count, completed_score_sum=total)
+    for module_id, count in connection.execute(
+        select(QuizAttempt.module_id, func.count(QuizAttempt.id)).group_by(QuizAttempt.module_id)
+    ):
+        modules[module_id]["quiz_attempts"] = count
+
+    departments = defaultdict(lambda: {"students": 0, "completed_count": 0, "completed_scored": 0,
+                                       "completed_score_sum": 0, "quiz_attempts": 0, "sos_requests": 0})
+    for name, count in connection.execute(
+        select(department, func.count(User.id)).where(User.role == UserRole.STUDENT).group_by(department)
+    ):
+        departments[name]["students"] = count
+    for name, count, scored_count, total in connection.execute(
+        select(department, func.count(StudentProgress.id), scored, score_sum)
+        .join(User, User.id == StudentProgress.user_id).where(completed).group_by(department)
+    ):
+        departments[name].update(completed_count=count, completed_scored=scored_count, completed_score_sum=total)
+    for model, column in ((QuizAttempt, "quiz_attempts"), (SOSRequest, "sos_requests")):
+        for name, count in connection.execute(
+            select(department, func.count(model.id)).join(User, User.id == model.user_id).group_by(department)
+        ):
+            departments[name][column] = count
+
+    days = defaultdict(lambda: {"completions": 0, "quiz_attempts": 0, "sos_created": 0,
+                                "sos_resolved": 0, "alerts_created": 0})
+    for timestamp, column, *conditions in (
+        (StudentProgress.completed_at, "completions", completed),
+        (QuizAttempt.completed_at, "quiz_attempts"),
+        (SOSRequest.created_at, "sos_created"),
+        (SOSRequest.resolved_at, "sos_resolved", SOSRequest.status == "resolved"),
+        (EmergencyAlert.created_at, "alerts_created")
+    ):
+        day = func.date(timestamp)
+        for value, count in connection.execute(
+            select(day, func.count()).where(timestamp != None, *conditions).group_by(day)
+        ):
+            days[_as_date(value)][column] = count
+
+    cohort_students = []
+    cohort_modules = defaultdict(lambda: {"completed_count": 0, "completed_scored": 0, "completed_score_sum": 0,
+                                          "quiz_attempts": 0})
+    for dimension, column in COHORT_COLUMNS.items():
+        cohort = func.coalesce(column, "")
+        for name, count in connection.execute(
+            select(cohort, func.count(User.id)).where(User.role == UserRole.STUDENT).group_by(cohort)
+        ):
+            cohort_students.append({"dimension": dimension, "cohort": name, "students": count})
+        for name, module_id, count, scored_count, total in connection.execute(
+            select(cohort, StudentProgress.module_id, func.count(StudentProgress.id), scored, score_sum)
+            .join(User, User.id == StudentProgress.user_id).where(completed)
+            .group_by(cohort, StudentProgress.module_id)
+        ):
+            cohort_modules[dimension, name, module_id].update(
+                completed_count=count, completed_scored=scored_count, completed_score_sum=total
+            )
+        for name, module_id, count in connection.execute(
+            select(cohort, QuizAttempt.module_id, func.count(QuizAttempt.id))
+            .join(User, User.id == QuizAttempt.user_id)
+            .group_by(cohort, QuizAttempt.module_id)
+        ):
+            cohort_modules[dimension, name, module_id]["quiz_attempts"] = count
+
+    return {
+        GlobalRollup: [global_row],
+        ModuleRollup: [{"module_id": key, **values} for key, values in modules.items()],
+        DepartmentRollup: [{"department": key, **values} for key, values in departments.items()],
+        DailyRollup: [{"day": key, **values} for key, values in days.items()],
+        CohortRollup: cohort_students,
+        CohortModuleRollup: [
+            {"dimension": dimension, "cohort": name, "module_id": module_id, **values}
+            for (dimension, name, module_id), values in cohort_modules.items()
+        ]
+    }
+
+
+def lock_rollups(connection: Connection, models=ROLLUP_MODELS) -> None:
+    """Lock rollup tables against writers until the transaction ends.
+
+    Tables are taken in ROLLUP_LOCK_ORDER, the order every flush bumps them in,
+    so a rebuild and a writer cannot deadlock. Readers are not blocked. SQLite
+    has a single writer anyway and needs no locks.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for model in ROLLUP_LOCK_ORDER:
+        if model in models:
+            connection.execute(text(f"LOCK TABLE {model.__tablename__} IN EXCLUSIVE MODE"))
+
+
+def rebuild_rollups(connection: Connection, models=ROLLUP_MODELS) -> Dict[str, int]:
+    """Replace rollup rows with freshly computed values; returns row counts.
+
+    The rollup tables are locked first, so deltas from concurrent writes wait
+    and land on top of the rebuilt rows instead of being lost or counted twice.
+    """
+    lock_rollups(connection, models)
+    rollups = compute_rollups(connection)
+    counts = {}
+    for model in models:
+        connection.execute(delete(model))
+        if rollups[model]:
+            connection.execute(insert(model), rollups[model])
+        counts[model.__tablename__] = len(rollups[model])
+    return counts
+
+
+def verify_rollups(connection: Connection) -> List[Dict[str, Any]]:
+    """Compare stored rollups with the live data and return every mismatch."""
+    rollups = compute_rollups(connection)
+    mismatches = []
+    for model in ROLLUP_MODELS:
+        key_columns = [column.name for column in model.__table__.primary_key]
+        value_columns = [column.name for column in model.__table__.columns if column.name not in key_columns]
+
+        def key_of(row):
+            return tuple(row[column] for column in key_columns)
+
+        expected = {key_of(row): row for row in rollups[model]}
+        stored = {key_of(row): dict(row) for row in connection.execute(select(model.__table__)).mappings()}
+
+        for key in expected.keys() | stored.keys():
+            for column in value_columns:
+                want = expected.get(key, {}).get(column) or 0
+                have = stored.get(key, {}).get(column) or 0
+                if want != have:
+                    mismatches.append({
+                        "table": model.__tablename__, "key": key,
+                        "column": column, "expected": want, "stored": have
+                    })
+    return mismatches
@@ -0,0 +1,151 @@
+import re
+from typing import Any, Dict, List, NamedTuple
+
+from sqlalchemy import delete, func, insert, literal_column, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..models.events import SEARCH_SOURCES, search_document
+from ..models.models import DisasterModule, ModulePhase, SearchDocument, search_tsvector
+
+_WORDS = re.compile(r"\w+", re.UNICODE)
+
+
+class _Match(NamedTuple):
+    id: int
+    rank: float
+    snippet: str
+
+
+class SearchService:
+    """Service for ranked full-text search over module content."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search active modules' content, best matches first."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return self._search_postgresql(query, limit)
+        if dialect == "sqlite":
+            return self._search_sqlite(query, limit)
+        return self._search_like(query, limit)
+
+    def _results(self, matches) -> List[Dict[str, Any]]:
+        """Attach module and phase details to (document id, rank, snippet) rows."""
+        matches = list(matches)
+        if not matches:
+            return []
+
+        documents = {
+            row.id: row for row in self.db.execute(
+                select(
+                    SearchDocument.id, SearchDocument.kind, SearchDocument.source_id,
+                    SearchDocument.module_id, SearchDocument.phase_id, SearchDocument.title,
+                    DisasterModule.title.label("module_title"), ModulePhase.phase_type
+                )
+                .join(DisasterModule, DisasterModule.id == SearchDocument.module_id)
+                .outerjoin(ModulePhase, ModulePhase.id == SearchDocument.phase_id)
+                .where(SearchDocument.id.in_([match.id for match in matches]), DisasterModule.is_active == True)
+            )
+        }
+
+        return [
+            {
+                "kind": documents[match.id].kind,
+                "source_id": documents[match.id].source_id,
+                "module_id": documents[match.id].module_id,
+                "module_title": documents[match.id].module_title,
+                "phase_id": documents[match.id].phase_id,
+                "phase_type": documents[match.id].phase_type,
+                "title": documents[match.id].title,
+                "snippet": match.snippet,
+                "rank": round(float(match.rank), 4)
+            }
+            for match in matches if match.id in documents
+        ]
+
+    def _search_postgresql(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        # websearch_to_tsquery accepts free text and drops stop words
+        ts_query = func.websearch_to_tsquery(literal_column("'english'"), query)
+        document = literal_column(search_tsvector("search_documents."))
+        rank = func.ts_rank_cd(document, ts_query)
+
+        # Rank on the GIN index, then build headlines only for the page returned
+        top = (
+            select(SearchDocument.id, SearchDocument.body, rank.label("rank"))
+            .join(DisasterModule, DisasterModule.id == SearchDocument.module_id)
+            .where(document.op("@@")(ts_query), DisasterModule.is_active == True)
+            .order_by(rank.desc(), SearchDocument.id)
+            .limit(limit)
+            .subquery()
+        )
+        return self._results(self.db.execute(
+            select(
+                top.c.id, top.c.rank,
+                func.ts_headline(
+                    literal_column("'english'"), top.c.body, ts_query,
+                    "StartSel=<b>, StopSel=</b>, MaxWords=25, MinWords=8, MaxFragments=2"
+                ).label("snippet")
+            ).order_by(top.c.rank.desc(), top.c.id)
+        ))
+
+    def _search_sqlite(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        words = _WORDS.findall(query.lower())
+        if not words:
+            return []
+
+        # Any word may match; bm25 ranks documents matching more (and rarer) words first
+        match = " OR ".join(f'"{word}"' for word in words)
+        return self._results(self.db.execute(
+            text(
+                "SELECT search_documents_fts.rowid AS id, "
+                "-bm25(search_documents_fts, 2.0, 1.0) AS rank, "
+                "snippet(search_documents_fts, 1, '<b>', '</b>', '…', 16) AS snippet "
+                "FROM search_documents_fts "
+                "JOIN search_documents ON search_documents.id = search_documents_fts.rowid "
+                "JOIN disaster_modules ON disaster_modules.id = search_documents.module_id "
+                "WHERE search_documents_fts MATCH :match AND disaster_modules.is_active = 1 "
+                "ORDER BY bm25(search_documents_fts, 2.0, 1.0) LIMIT :limit"
+            ),
+            {"match": match, "limit": limit}
+        ))
+
+    def _search_like(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        words = _WORDS.findall(query.lower())
+        if not words:
+            return []
+
+        rows = self.db.execute(
+            select(SearchDocument.id, SearchDocument.body)
+            .where(or_(*[
+                or_(SearchDocument.title.ilike(f"%{word}%"), SearchDocument.body.ilike(f"%{word}%"))
+                for word in words
+            ]))
+            .order_by(SearchDocument.id)
+            .limit(limit)
+        ).all()
+        return self._results(_Match(row.id, 0.0, row.body[:200]) for row in rows)
+
+
+def rebuild_search_index(connection: Connection) -> int:
+    """Rebuild every search document from the content tables; returns the count."""
+    phase_modules = dict(connection.execute(select(ModulePhase.id, ModulePhase.module_id)).all())
+
+    documents = []
+    for model in SEARCH_SOURCES:
+        for row in connection.execute(select(model.__table__)):
+            if model is DisasterModule:
+                module_id = row.id
+            elif model is ModulePhase:
+                module_id = row.module_id
+            else:
+                module_id = phase_modules.get(row.phase_id)
+            if module_id is not None:
+                documents.append(search_document(row, module_id, model))
+
+    connection.execute(delete(SearchDocument))
+    if documents:
+        connection.execute(insert(SearchDocument), documents)
+    return len(documents)
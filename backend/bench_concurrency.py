@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Load a running API with many concurrent clients and report throughput and
+latency. Run it once against a server started with USE_ASYNC_DB=False and
+once with USE_ASYNC_DB=True to compare the sync and async database paths.
+
+Usage:
+    python bench_concurrency.py --token <access token> [--clients 1000]
+        [--requests 5] [--path /api/emergency/alerts] [--base-url http://localhost:8000]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def client_loop(client: httpx.AsyncClient, path: str, requests: int,
+                      latencies: list, errors: list):
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    latencies, errors = [], []
+
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers,
+                                 limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            client_loop(client, args.path, args.requests, latencies, errors)
+            for _ in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Clients:     {args.clients} x {args.requests} requests -> {args.path}")
+    print(f"Throughput:  {len(latencies) / elapsed:8.1f} req/s")
+    print(f"Latency p50: {quantiles[49] * 1000:8.1f} ms")
+    print(f"Latency p90: {quantiles[89] * 1000:8.1f} ms")
+    print(f"Latency p99: {quantiles[98] * 1000:8.1f} ms")
+    print(f"Errors:      {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/api/emergency/alerts")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the get_module_questions read paths on a seeded SQLite database
+(point DATABASE_URL at PostgreSQL to measure JSONB/json_agg instead):
+
+  text+parse  options as JSON text, parsed per row, serialized via pydantic
+  orm         native JSON column loaded through the ORM, serialized via pydantic
+  zero-parse  JSON array rendered by the database and returned as-is
+
+Usage: python bench_module_questions.py [--questions 1000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_db_dir = tempfile.mkdtemp(prefix="suraksha-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+
+def seed(db, questions: int) -> int:
+    from sqlalchemy import insert
+    from app.models.models import DisasterModule, QuizQuestion
+
+    module = DisasterModule(slug="bench", title="Bench", description="", icon="", color="", is_active=True)
+    db.add(module)
+    db.flush()
+    db.execute(insert(QuizQuestion), [
+        {"module_id": module.id, "question": f"Question {i}: what should you do first?",
+         "options": [f"Option {i}-{j}" for j in range(4)], "correct_answer": i % 4,
+         "phase": ("before", "during", "after")[i % 3]}
+        for i in range(questions)
+    ])
+    db.commit()
+    return module.id
+
+
+def text_parse(db, module_id, adapter):
+    from sqlalchemy import Text, cast, select
+    from app.models.models import QuizQuestion
+
+    rows = db.execute(
+        select(QuizQuestion.id, QuizQuestion.module_id, QuizQuestion.question,
+               cast(QuizQuestion.options, Text).label("options"),
+               QuizQuestion.phase)
+        .where(QuizQuestion.module_id == module_id).order_by(QuizQuestion.id)
+    ).all()
+    questions = [dict(row._mapping, options=json.loads(row.options)) for row in rows]
+    return adapter.dump_json(adapter.validate_python(questions))
+
+
+def orm(db, module_id, adapter):
+    from app.api.modules import questions_statement
+
+    questions = db.execute(questions_statement(module_id)).scalars().all()
+    return adapter.dump_json(adapter.validate_python(questions, from_attributes=True))
+
+
+def zero_parse(db, module_id, adapter):
+    from app.api.modules import questions_json
+
+    return questions_json(db, module_id)
+
+
+def measure(label, func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    print(f"{label:<12} {min(timings) * 1000:9.2f} ms (best of {repeat}), {len(result)} bytes")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from typing import List
+    from pydantic import TypeAdapter
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import models  # noqa: F401 (register tables)
+    from app.models.schemas import QuizQuestion as QuizQuestionSchema
+
+    Base.metadata.create_all(bind=engine)
+    adapter = TypeAdapter(List[QuizQuestionSchema])
+    db = SessionLocal()
+    try:
+        module_id = seed(db, args.questions)
+        print(f"{args.questions} questions ({engine.dialect.name})")
+        results = [
+            measure(label, lambda path=path: path(db, module_id, adapter), args.repeat)
+            for label, path in (("text+parse", text_parse), ("orm", orm), ("zero-parse", zero_parse))
+        ]
+        assert len({len(json.loads(body)) for body in results}) == 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
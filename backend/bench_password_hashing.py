@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark bcrypt login throughput: inline verification vs the worker pool.
+
+Usage: python bench_password_hashing.py [--logins 200] [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ.setdefault("PASSWORD_HASH_QUEUE_DEPTH", str(args.logins))
+
+    from app.core import security
+
+    hashed = security.get_password_hash("demo123")
+
+    # Inline: what a sync handler does today, one core
+    start = time.perf_counter()
+    for _ in range(args.logins):
+        security.verify_password("demo123", hashed)
+    inline_elapsed = time.perf_counter() - start
+
+    # Pool: concurrent logins spread over the worker processes
+    async def run_pool():
+        await security.verify_password_async("demo123", hashed)  # warm up workers
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            security.verify_password_async("demo123", hashed)
+            for _ in range(args.logins)
+        ])
+        return time.perf_counter() - start
+
+    pool_elapsed = asyncio.run(run_pool())
+    security.shutdown_hash_executor()
+
+    inline_rate = args.logins / inline_elapsed
+    pool_rate = args.logins / pool_elapsed
+    print(f"Logins:              {args.logins}")
+    print(f"Inline (1 core):     {inline_rate:8.1f} logins/s")
+    print(f"Pool ({args.workers} workers):   {pool_rate:8.1f} logins/s "
+          f"({pool_rate / args.workers:.1f} logins/s per core)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request auth overhead of verify_token with and without the
+verified-token cache.
+
+Usage: python bench_token_verification.py [--requests 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.core import security
+
+    token = security.create_access_token(data={"sub": "student@suraksha.edu"})
+    error = ValueError("invalid token")
+
+    def run(cache_enabled: bool) -> float:
+        settings.token_cache_enabled = cache_enabled
+        security.token_cache.clear()
+        start = time.perf_counter()
+        for _ in range(args.requests):
+            security.verify_token(token, error)
+        return time.perf_counter() - start
+
+    uncached = run(False)
+    cached = run(True)
+
+    print(f"Requests:  {args.requests}")
+    print(f"Uncached:  {uncached / args.requests * 1e6:8.2f} us/request")
+    print(f"Cached:    {cached / args.requests * 1e6:8.2f} us/request")
+    print(f"Speedup:   {uncached / cached:8.1f}x")
+    print(f"Cache:     {security.token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the request-level tests: the app runs against a throwaway
+SQLite database unless DATABASE_URL is already set.
+"""
+import itertools
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_db_dir = tempfile.mkdtemp(prefix="suraksha-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+# The same file doubles as a "replica" so the read routing paths are exercised
+os.environ.setdefault("DATABASE_REPLICA_URLS", json.dumps([os.environ["DATABASE_URL"]]))
+
+_serial = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    # Depends on client: importing the app creates the tables
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a user and return it with bearer headers for its access token."""
+    from app.core.security import create_access_token, token_claims
+    from app.models.models import User, UserRole
+
+    def make(role=UserRole.STUDENT, **fields):
+        user = User(
+            email=f"user{next(_serial)}@test.edu",
+            hashed_password="not-a-real-hash",
+            name="Test User",
+            role=role,
+            **fields
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        headers = {"Authorization": f"Bearer {create_access_token(token_claims(user))}"}
+        return user, headers
+
+    return make
+
+
+@pytest.fixture
+def make_module(db):
+    """Create an active disaster module."""
+    from app.models.models import DisasterModule
+
+    def make(**fields):
+        number = next(_serial)
+        module = DisasterModule(**{
+            "slug": f"module-{number}", "title": f"Module {number}", "description": "",
+            "icon": "", "color": "", **fields
+        })
+        db.add(module)
+        db.commit()
+        db.refresh(module)
+        return module
+
+    return make
+
+
+@pytest.fixture
+def app_request(client):
+    """Send a request in the caller's context, so query counters see it."""
+    import asyncio
+    import httpx
+    from app.main import app
+
+    def send(method, url, **kwargs):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return await http.request(method, url, **kwargs)
+        return asyncio.run(run())
+
+    return send
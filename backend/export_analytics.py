@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Dump an analytics table to a Parquet or CSV file with bounded memory.
+
+Usage: python export_analytics.py sos_requests sos.parquet
+       python export_analytics.py quiz_attempts attempts.csv --format csv
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    from app.services.export import EXPORT_FORMATS, EXPORT_TABLES, TableExporter, pyarrow_available
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("output", help="file to write ('-' for stdout)")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS),
+                        help="default: from the output extension, else parquet")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "parquet")
+    if fmt == "parquet" and not pyarrow_available():
+        parser.error("Parquet export requires pyarrow (pip install pyarrow) or --format csv")
+
+    from app.core.database import engine
+
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        exporter = TableExporter(connection, args.table, batch_size=args.batch_size)
+        if args.output == "-":
+            exporter.write(fmt, sys.stdout.buffer)
+        else:
+            with open(args.output, "wb") as stream:
+                exporter.write(fmt, stream)
+            print(f"✅ Exported {args.table} to {args.output} in {time.perf_counter() - start:.1f}s",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
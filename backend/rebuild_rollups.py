@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Recompute the analytics rollup tables from the live data.
+
+Usage: python rebuild_rollups.py           # rebuild in one transaction
+       python rebuild_rollups.py --check   # report drift, exit 1 if any
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="compare with live data without writing")
+    args = parser.parse_args()
+
+    from app.core.database import engine
+    from app.services.rollups import rebuild_rollups, verify_rollups
+
+    if args.check:
+        with engine.connect() as connection:
+            mismatches = verify_rollups(connection)
+        for mismatch in mismatches:
+            print(f"{mismatch['table']} {mismatch['key']} {mismatch['column']}: "
+                  f"stored {mismatch['stored']}, expected {mismatch['expected']}")
+        print("✅ Rollups match live data" if not mismatches else f"❌ {len(mismatches)} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+    with engine.begin() as connection:
+        counts = rebuild_rollups(connection)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} rows")
+    print("✅ Rollups rebuilt")
+
+
+if __name__ == "__main__":
+    main()
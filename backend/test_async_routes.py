@@ -0,0 +1,115 @@
+"""
+The AsyncSession twins of the hot routes (settings.use_async_db), mounted on
+their own app over aiosqlite so they run whatever the test settings are.
+"""
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def async_request(client, monkeypatch):
+    """Send a request to an app serving only the async routers."""
+    import httpx
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.api import emergency_async, modules_async
+    from app.core import database
+    from app.core.config import settings
+
+    # NullPool: every request runs in a fresh event loop
+    engine = create_async_engine(database.async_driver_url(settings.database_url), poolclass=NullPool)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(database, "async_replica_session_factories", [factory])
+
+    app = FastAPI()
+    app.include_router(modules_async.router, prefix="/api/modules")
+    app.include_router(emergency_async.router, prefix="/api/emergency")
+
+    def send(method, url, **kwargs):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return await http.request(method, url, **kwargs)
+        return asyncio.run(run())
+
+    yield send
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def async_read_routes(monkeypatch):
+    from app.core import database
+
+    routes = []
+    open_async_read_session = database.open_async_read_session
+
+    async def record(use_replica=True):
+        routes.append(use_replica)
+        return await open_async_read_session(use_replica)
+
+    monkeypatch.setattr(database, "open_async_read_session", record)
+    return routes
+
+
+def test_async_listings_read_from_replica(async_request, async_read_routes, make_user):
+    import time
+    from app.core.database import WRITE_MARKER, sign_write_marker
+
+    _, headers = make_user()
+    for url in ("/api/emergency/contacts/public", "/api/emergency/contacts",
+                "/api/emergency/alerts", "/api/emergency/sos"):
+        async_read_routes.clear()
+        assert async_request("GET", url, headers=headers).status_code == 200
+        assert async_read_routes == [True]
+
+    # A recent write keeps the client on the primary
+    fresh = {**headers, WRITE_MARKER: sign_write_marker(time.time())}
+    assert async_request("GET", "/api/emergency/sos", headers=fresh).status_code == 200
+    assert async_read_routes[-1] is False
+
+
+def test_async_sos_round_trip(async_request, make_user):
+    user, headers = make_user()
+    for location in ("Library", "Gym", "Lab"):
+        response = async_request("POST", "/api/emergency/sos", headers=headers,
+                                 json={"user_id": user.id, "location": location})
+        assert response.status_code == 200
+        assert response.json()["user_id"] == user.id
+
+    listed = async_request("GET", "/api/emergency/sos", headers=headers).json()
+    assert [sos["location"] for sos in listed] == ["Lab", "Gym", "Library"]
+
+    page = async_request("GET", "/api/emergency/sos", headers=headers,
+                         params={"cursor": "", "limit": 2}).json()
+    assert [sos["location"] for sos in page["items"]] == ["Lab", "Gym"]
+    rest = async_request("GET", "/api/emergency/sos", headers=headers,
+                         params={"cursor": page["next_cursor"], "limit": 2}).json()
+    assert [sos["location"] for sos in rest["items"]] == ["Library"]
+    assert rest["next_cursor"] is None
+
+
+def test_async_progress_routes(async_request, async_read_routes, make_user, make_module):
+    user, headers = make_user()
+    _, other_headers = make_user()
+    module = make_module()
+
+    created = async_request("GET", f"/api/modules/{module.id}/progress", headers=headers)
+    assert created.status_code == 200
+    assert created.json()["score"] == 0
+
+    updated = async_request("PUT", f"/api/modules/{module.id}/progress", headers=headers,
+                            json={"score": 80, "time_spent": 120})
+    assert updated.status_code == 200
+    assert updated.json()["score"] == 80
+
+    async_read_routes.clear()
+    listed = async_request("GET", f"/api/modules/user/{user.id}/progress", headers=headers)
+    assert listed.status_code == 200
+    assert [(row["module_id"], row["score"]) for row in listed.json()] == [(module.id, 80)]
+    assert async_read_routes == [True]
+
+    forbidden = async_request("GET", f"/api/modules/user/{user.id}/progress", headers=other_headers)
+    assert forbidden.status_code == 403
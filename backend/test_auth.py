@@ -0,0 +1,133 @@
+"""
+Request-level checks for the authenticated dependencies (token claims,
+principal cache, token versions).
+"""
+import pytest
+
+
+def test_authenticated_get(client, make_user):
+    user, headers = make_user()
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+
+    # Second request is served from the principal cache
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert client.get("/api/modules/", headers=headers).status_code == 200
+
+
+def test_missing_or_bad_token_is_rejected(client):
+    assert client.get("/api/auth/me").status_code == 403
+    bad = {"Authorization": "Bearer not-a-token"}
+    assert client.get("/api/auth/me", headers=bad).status_code == 401
+
+
+def test_bumped_token_version_rejects_old_tokens(client, make_user, db):
+    from app.core.security import bump_token_version
+
+    user, headers = make_user()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    user = db.merge(user)
+    bump_token_version(user)
+    db.commit()
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_role_change_retires_admin_tokens(client, make_user, db):
+    from app.models.models import UserRole
+
+    user, headers = make_user(role=UserRole.ADMIN)
+    assert client.get("/api/metrics/auth-cache", headers=headers).status_code == 200
+
+    user = db.merge(user)
+    user.role = UserRole.STUDENT
+    db.commit()
+
+    assert client.get("/api/metrics/auth-cache", headers=headers).status_code == 401
+
+
+def test_refresh_takes_role_from_the_user_row(client, make_user, db):
+    from jose import jwt
+    from app.core.config import settings
+    from app.core.security import create_refresh_token, token_claims
+    from app.models.models import UserRole
+
+    user, _ = make_user()
+    # A stale role claim on an otherwise valid refresh token
+    claims = dict(token_claims(user), role=UserRole.ADMIN.value)
+    response = client.post("/api/auth/refresh", params={"refresh_token": create_refresh_token(claims)})
+    assert response.status_code == 200
+
+    payload = jwt.decode(response.json()["access_token"], settings.secret_key, algorithms=[settings.algorithm])
+    assert payload["role"] == UserRole.STUDENT.value
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/api/metrics/auth-cache", headers=headers).status_code == 403
+
+
+def test_full_hash_pool_sheds_logins(client, make_user, monkeypatch):
+    from app.core import security
+    from app.core.config import settings
+
+    user, _ = make_user()
+    full = security._hash_pool_size() + settings.password_hash_queue_depth
+    monkeypatch.setattr(security, "_hash_jobs_in_flight", full)
+
+    response = client.post("/api/auth/login", json={"email": user.email, "password": "anything"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    # Rejected before reaching the pool, so nothing was counted in
+    assert security._hash_jobs_in_flight == full
+
+
+def _cached_token(headers):
+    import hashlib
+    from app.core.security import token_cache
+
+    token = headers["Authorization"].removeprefix("Bearer ")
+    return token_cache.get(hashlib.sha256(token.encode()).digest())
+
+
+def test_token_cache_hit_still_checks_revocation(client, make_user):
+    from app.core.security import revocation_store
+
+    _, headers = make_user()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    token_data = _cached_token(headers)
+    assert token_data is not None
+
+    revocation_store.revoke(token_data.jti, token_data.exp)
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    # Rejected on the cached claims, not because the entry was dropped
+    assert _cached_token(headers) is token_data
+
+
+def test_token_cache_hit_still_checks_token_version(client, make_user):
+    _, headers = make_user()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert _cached_token(headers) is not None
+
+    assert client.post("/api/auth/logout-all", headers=headers).status_code == 200
+    assert _cached_token(headers) is not None
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+@pytest.mark.parametrize("change", ["role", "is_active"])
+def test_privilege_change_evicts_the_cached_principal(client, make_user, db, change):
+    from app.core.security import principal_cache
+    from app.models.models import UserRole
+
+    user, headers = make_user()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert principal_cache.get(user.id) is not None
+
+    user = db.merge(user)
+    if change == "role":
+        user.role = UserRole.ADMIN
+    else:
+        user.is_active = False
+    db.commit()
+
+    assert principal_cache.get(user.id) is None
@@ -0,0 +1,138 @@
+"""
+Admin bulk import of student accounts, streamed back as NDJSON.
+"""
+import csv
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+
+def _fast_hash(password: str) -> str:
+    # Stands in for bcrypt in the worker processes, keeping its 72-byte limit
+    if len(password.encode()) > 72:
+        raise ValueError("password cannot be longer than 72 bytes")
+    return f"hashed:{password}"
+
+
+@pytest.fixture
+def bulk_import(client, make_user, monkeypatch):
+    """Upload a file to /bulk-import and return its parsed NDJSON lines."""
+    from app.core.config import settings
+    from app.models.models import UserRole
+    from app.services import provisioning
+
+    # Workers are forked after this, so they see the patched hash function
+    monkeypatch.setattr(provisioning, "get_password_hash", _fast_hash)
+    monkeypatch.setattr(settings, "bulk_import_batch_size", 2)
+    monkeypatch.setattr(settings, "bulk_import_hash_workers", 1)
+    _, headers = make_user(role=UserRole.ADMIN)
+
+    def upload(content: bytes, filename: str = "students.csv"):
+        response = client.post("/api/auth/bulk-import", headers=headers,
+                               files={"file": (filename, content)})
+        assert response.status_code == 200
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    return upload
+
+
+def _csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["email", "name", "password", "department"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def test_csv_import_reports_every_row(bulk_import, make_user, db):
+    from app.models.models import User
+
+    existing, _ = make_user()
+    lines = bulk_import(_csv([
+        {"email": "bulk-a@test.edu", "name": "A", "password": "secret-a", "department": "CS"},
+        {"email": "not-an-email", "name": "B", "password": "secret-b"},
+        {"email": "bulk-a@test.edu", "name": "A again", "password": "secret-a"},
+        {"email": existing.email, "name": "Existing", "password": "secret-c"},
+        # Over bcrypt's 72-byte limit
+        {"email": "bulk-long@test.edu", "name": "Long", "password": "x" * 100},
+        {"email": "bulk-b@test.edu", "name": "B", "password": "secret-b"},
+    ]))
+
+    rows, summary = lines[:-1], lines[-1]
+    assert [(row["row"], row["status"]) for row in rows] == [
+        (1, "created"), (2, "invalid"), (3, "duplicate"), (4, "exists"), (5, "error"), (6, "created")
+    ]
+    assert "Password hashing failed" in rows[4]["detail"]
+    assert summary == {"summary": {"created": 2, "exists": 1, "duplicate": 1, "invalid": 1, "error": 1}}
+
+    created = db.query(User).filter(User.email == "bulk-a@test.edu").one()
+    assert created.department == "CS"
+    assert created.hashed_password == "hashed:secret-a"
+    assert db.query(User).filter(User.email == "bulk-long@test.edu").first() is None
+
+
+def test_ndjson_import(bulk_import):
+    content = b"\n".join([
+        json.dumps({"email": "bulk-nd@test.edu", "name": "N", "password": "secret"}).encode(),
+        b"{not json",
+        json.dumps({"email": "bulk-admin@test.edu", "name": "Admin", "password": "secret", "role": "admin"}).encode(),
+    ])
+    lines = bulk_import(content, filename="students.ndjson")
+
+    assert [row["status"] for row in lines[:-1]] == ["created", "invalid", "invalid"]
+    assert lines[-1]["summary"]["created"] == 1
+
+
+def test_unreadable_upload_still_ends_with_a_summary(bulk_import):
+    lines = bulk_import(b"email,name,password\n\xff\xfe\xfa,broken,row\n")
+
+    assert lines[0] == {"status": "error", "detail": "Import stopped: UnicodeDecodeError"}
+    assert lines[-1] == {"summary": {"created": 0, "exists": 0, "duplicate": 0, "invalid": 0, "error": 0}}
+
+
+def test_orm_insert_path(db):
+    from app.models.models import User, UserRole
+    from app.services.provisioning import BulkProvisioningService
+
+    service = BulkProvisioningService(db)
+    service._insert([{
+        "email": "bulk-orm@test.edu", "hashed_password": "hash", "name": "ORM", "role": UserRole.STUDENT,
+        "is_active": True, "token_version": 0, "phone": None, "department": "EE", "year_of_study": None
+    }])
+
+    user = db.query(User).filter(User.email == "bulk-orm@test.edu").one()
+    assert (user.role, user.department) == (UserRole.STUDENT, "EE")
+    # Not committed: the rollups were never told about this user
+    db.rollback()
+
+
+def test_copy_insert_path():
+    from app.models.models import UserRole
+    from app.services.provisioning import BulkProvisioningService, _COPY_COLUMNS
+
+    copied = {}
+
+    class Cursor:
+        def copy_expert(self, sql, buffer):
+            copied["sql"] = sql
+            copied["rows"] = list(csv.reader(io.StringIO(buffer.read())))
+
+        def close(self):
+            copied["closed"] = True
+
+    # A PostgreSQL session as far as _insert can tell
+    db = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        connection=lambda: SimpleNamespace(connection=SimpleNamespace(cursor=Cursor))
+    )
+    service = BulkProvisioningService(db)
+    service._insert([{
+        "email": "bulk-copy@test.edu", "hashed_password": "hash", "name": "Copy, Esq.", "role": UserRole.STUDENT,
+        "is_active": True, "token_version": 0, "phone": None, "department": "ME", "year_of_study": "2"
+    }])
+
+    assert copied["sql"] == f"COPY users ({', '.join(_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    assert copied["rows"] == [["bulk-copy@test.edu", "hash", "Copy, Esq.", "STUDENT", "True", "0", "", "ME", "2"]]
+    assert copied["closed"]
@@ -0,0 +1,133 @@
+"""
+StaleWhileRevalidateCache: fresh hits, stale serving with one background
+refresh, shared computations on a miss, and failures.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import StaleWhileRevalidateCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test moves by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now.value, time=lambda: now.value))
+    return now
+
+
+def _wait_for_refresh(cache, refreshes):
+    for _ in range(200):
+        stats = cache.stats()
+        if stats["refreshes"] >= refreshes and not stats["in_flight"]:
+            return
+        time.sleep(0.01)
+    raise AssertionError("background refresh did not finish")
+
+
+def test_fresh_values_are_served_from_cache(clock):
+    cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+    calls = []
+
+    assert cache.get("k", lambda: calls.append(1) or "v1") == ("v1", 1000.0, False)
+    clock.value += 5
+    assert cache.get("k", lambda: calls.append(1) or "v2") == ("v1", 1000.0, False)
+    assert calls == [1]
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_stale_value_is_served_while_one_refresh_runs(clock):
+    cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+    cache.get("k", lambda: "old")
+    clock.value += 20
+
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "new"
+
+    # Returned without waiting for the refresh, and only one refresh starts
+    assert cache.get("k", slow) == ("old", 1000.0, True)
+    assert cache.get("k", slow) == ("old", 1000.0, True)
+    release.set()
+    _wait_for_refresh(cache, refreshes=2)
+
+    assert calls == [1]
+    assert cache.get("k", slow) == ("new", 1020.0, False)
+    assert cache.stats()["stale_hits"] == 2
+
+
+def test_expired_past_the_stale_window_is_recomputed(clock):
+    cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+    cache.get("k", lambda: "old")
+    clock.value += 70
+
+    assert cache.get("k", lambda: "new") == ("new", 1070.0, False)
+    assert cache.stats()["stale_hits"] == 0
+
+
+def test_concurrent_misses_share_one_computation(clock):
+    cache = StaleWhileRevalidateCache(ttl=10)
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "v"
+
+    leader = threading.Thread(target=lambda: results.append(cache.get("k", compute)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(cache.get("k", compute)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert calls == [1]
+    assert results == [("v", 1000.0, False)] * 2
+
+
+def test_failed_computation_is_raised_and_retried(clock):
+    cache = StaleWhileRevalidateCache(ttl=10)
+
+    def broken():
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError, match="database down"):
+        cache.get("k", broken)
+    assert cache.stats()["in_flight"] == 0
+    assert cache.get("k", lambda: "v") == ("v", 1000.0, False)
+
+
+def test_failed_background_refresh_keeps_serving_stale(clock):
+    cache = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+    cache.get("k", lambda: "old")
+    clock.value += 20
+
+    def broken():
+        raise RuntimeError("database down")
+
+    assert cache.get("k", broken) == ("old", 1000.0, True)
+    _wait_for_refresh(cache, refreshes=1)
+
+    # The next stale read tries again
+    assert cache.get("k", lambda: "new") == ("old", 1000.0, True)
+    _wait_for_refresh(cache, refreshes=2)
+    assert cache.get("k", lambda: "unused") == ("new", 1020.0, False)
+
+
+def test_invalidate_forces_a_recompute(clock):
+    cache = StaleWhileRevalidateCache(ttl=10)
+    cache.get("k", lambda: "old")
+    cache.invalidate("k")
+    assert cache.get("k", lambda: "new") == ("new", 1000.0, False)
@@ -0,0 +1,69 @@
+"""
+The admin dashboard: sections run concurrently and a slow or failing one is
+reported degraded instead of holding up the rest.
+"""
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def sections(client, monkeypatch):
+    """Replace the dashboard section queries with canned results."""
+    from app.core.config import settings
+    from app.services.analytics import AnalyticsService
+
+    monkeypatch.setattr(settings, "dashboard_section_timeout_seconds", 0.2)
+    results = {
+        "get_user_analytics": lambda: {"total_users": 3},
+        "get_module_analytics": lambda: [{"module_id": 1}],
+        "get_recent_activities": lambda: [{"type": "sos"}],
+        "get_alert_summary": lambda: {"active_alerts": 1},
+    }
+    for method in results:
+        monkeypatch.setattr(AnalyticsService, method, lambda self, method=method: results[method]())
+    return results
+
+
+def test_dashboard_with_every_section(sections):
+    from app.services.analytics import compute_dashboard
+
+    assert compute_dashboard() == {
+        "user_analytics": {"total_users": 3},
+        "module_analytics": [{"module_id": 1}],
+        "recent_activities": [{"type": "sos"}],
+        "alert_summary": {"active_alerts": 1},
+        "degraded": False,
+        "degraded_sections": [],
+    }
+
+
+def test_slow_and_failing_sections_are_degraded(sections):
+    from app.services.analytics import compute_dashboard
+
+    release = threading.Event()
+
+    def broken():
+        raise RuntimeError("database down")
+
+    sections["get_alert_summary"] = lambda: release.wait(5) and {"active_alerts": 1}
+    sections["get_module_analytics"] = broken
+    try:
+        dashboard = compute_dashboard()
+    finally:
+        release.set()
+
+    assert dashboard["degraded"] is True
+    assert sorted(dashboard["degraded_sections"]) == ["alert_summary", "module_analytics"]
+    # Degraded sections fall back to their empty values, the rest are intact
+    assert dashboard["alert_summary"] == {}
+    assert dashboard["module_analytics"] == []
+    assert dashboard["user_analytics"] == {"total_users": 3}
+    assert dashboard["recent_activities"] == [{"type": "sos"}]
+
+
+def test_lifespan_runs_the_background_workers(client):
+    from app.core.revocation import revocation_store
+
+    # client keeps the app's lifespan open for the whole session
+    assert revocation_store._thread is not None and revocation_store._thread.is_alive()
@@ -0,0 +1,58 @@
+"""
+Connection pool checkout metrics and the admin endpoint that reports them.
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core.db_metrics import CHECKOUT_BUCKETS, InstrumentedQueuePool, PoolMetrics, pool_metrics
+
+
+def test_checkout_waits_land_in_their_buckets():
+    metrics = PoolMetrics()
+    metrics.observe_checkout(0.0005, in_use=1)
+    metrics.observe_checkout(0.005, in_use=3)  # on a bound: counted in that bucket
+    metrics.observe_checkout(60, in_use=2)
+
+    assert metrics.bucket_counts[0] == 1
+    assert metrics.bucket_counts[CHECKOUT_BUCKETS.index(0.005)] == 1
+    assert metrics.bucket_counts[-1] == 1
+    assert (metrics.checkouts, metrics.peak_in_use, metrics.wait_seconds_max) == (3, 3, 60)
+
+
+def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.01)
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = pool_metrics(engine)
+    assert (stats["pool_size"], stats["in_use"], stats["idle"]) == (1, 1, 0)
+    assert (stats["checkouts"], stats["peak_in_use"], stats["timeouts"]) == (1, 1, 1)
+    assert sum(stats["wait_histogram"].values()) == 1
+
+    held.close()
+    engine.dispose()
+    # The counters survive the pool being recreated
+    assert pool_metrics(engine)["timeouts"] == 1
+
+
+def test_uninstrumented_pool_has_no_metrics():
+    assert pool_metrics(create_engine("sqlite://")) is None
+
+
+def test_db_pool_endpoint(client, make_user):
+    from app.models.models import UserRole
+
+    _, headers = make_user()
+    assert client.get("/api/metrics/db-pool", headers=headers).status_code == 403
+
+    _, admin_headers = make_user(role=UserRole.ADMIN)
+    response = client.get("/api/metrics/db-pool", headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["primary"]["checkouts"] > 0
+    assert "le_inf" in body["primary"]["wait_histogram"]
+    # conftest points one replica at the test database
+    assert len(body["replicas"]) == 1
+    assert body["replicas"][0]["pool"]["pool_size"] >= 1
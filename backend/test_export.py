@@ -0,0 +1,48 @@
+"""
+Admin table exports (/api/analytics/export/{table}).
+"""
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def attempts(make_user, make_module, db):
+    """Three quiz attempts for a fresh module."""
+    from app.models.models import QuizAttempt
+
+    user, _ = make_user()
+    module = make_module()
+    db.add_all([
+        QuizAttempt(user_id=user.id, module_id=module.id, score=score, total_questions=3,
+                    answers=answers, phase=phase)
+        for score, answers, phase in ((3, [0, 1, 2], None), (1, [2, 2, 2], "before"), (0, [], None))
+    ])
+    db.commit()
+    return module
+
+
+def test_parquet_export_round_trips(client, make_user, attempts, db, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from app.core.config import settings
+    from app.models.models import QuizAttempt, UserRole
+    from app.services.export import TableExporter
+
+    # Several batches, so the file is written in more than one row group
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    _, headers = make_user(role=UserRole.ADMIN)
+
+    response = client.get("/api/analytics/export/quiz_attempts", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.schema == TableExporter(db.connection(), "quiz_attempts").schema()
+    assert table.num_rows == db.query(QuizAttempt).count()
+
+    rows = [row for row in table.to_pylist() if row["module_id"] == attempts.id]
+    assert [(row["score"], json.loads(row["answers"]), row["phase"]) for row in rows] == [
+        (3, [0, 1, 2], None), (1, [2, 2, 2], "before"), (0, [], None)
+    ]
+    assert all(row["completed_at"] is not None for row in rows)
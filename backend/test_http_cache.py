@@ -0,0 +1,52 @@
+"""
+Conditional GETs on module reads: ETags follow the module's content version,
+and a stale If-None-Match never hides a missing module.
+"""
+import pytest
+
+MODULE_PATHS = ["/api/modules/{id}", "/api/modules/{id}/questions", "/api/modules/{id}/content"]
+
+
+@pytest.mark.parametrize("path", MODULE_PATHS)
+def test_etag_round_trip(client, make_user, make_module, path):
+    _, headers = make_user()
+    url = path.format(id=make_module().id)
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("path", MODULE_PATHS)
+def test_stale_etag_for_deleted_module_is_404(client, db, make_user, make_module, path):
+    _, headers = make_user()
+    module = make_module()
+    url = path.format(id=module.id)
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    module.is_active = False
+    db.commit()
+
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 404
+
+
+def test_content_etag_changes_with_the_phase_tree(client, db, make_user, make_module):
+    from app.models.models import ModulePhase
+
+    _, headers = make_user()
+    module = make_module()
+    url = f"/api/modules/{module.id}/content"
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    db.add(ModulePhase(module_id=module.id, phase_type="before", title="Before",
+                       content_focus="", format="text"))
+    db.commit()
+
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["phases"]) == 1
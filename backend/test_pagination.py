@@ -0,0 +1,108 @@
+"""
+Cursor pagination: walking every page of a listing must return each row
+exactly once, in the same order as the unpaginated query.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def _walk(client, path, headers, limit=3, **params):
+    ids, cursor = [], ""
+    while cursor is not None:
+        assert len(ids) < 100, "cursor walk is not advancing"
+        response = client.get(path, headers=headers, params={**params, "cursor": cursor, "limit": limit})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+    return ids
+
+
+def _all_ids(db, statement):
+    return list(db.execute(statement.with_only_columns(statement.selected_columns[0].table.c.id)).scalars())
+
+
+@pytest.fixture
+def listing_rows(db, make_user):
+    """Rows with NULL sort keys, tied sort keys and mixed timestamp storage."""
+    from sqlalchemy import update
+    from app.models.models import (
+        AlertSeverity, AlertType, EmergencyAlert, EmergencyContact, SOSRequest
+    )
+
+    user, headers = make_user()
+    now = datetime.utcnow().replace(microsecond=0)
+    priorities = [1, 1, None, 2, None, 1, 3, None]
+    contacts = [
+        EmergencyContact(name=f"Contact {i % 3}", role="Warden", phone="100", priority=priority)
+        for i, priority in enumerate(priorities)
+    ]
+    db.add_all(contacts)
+    db.flush()
+    # The column default replaces NULL priorities on insert
+    db.execute(update(EmergencyContact).where(EmergencyContact.id.in_([
+        contact.id for contact, priority in zip(contacts, priorities) if priority is None
+    ])).values(priority=None))
+    for i in range(8):
+        # Half the rows get the server-default timestamp, half an explicit one
+        created_at = None if i % 2 else now - timedelta(seconds=i // 4, microseconds=i * 1000)
+        db.add(EmergencyAlert(
+            alert_type=AlertType.FIRE, severity=(AlertSeverity.HIGH, AlertSeverity.LOW)[i % 2],
+            title="Drill", message="Drill", location="Campus", source="Test", created_at=created_at
+        ))
+        db.add(SOSRequest(user_id=user.id, created_at=created_at))
+    db.commit()
+    return user, headers
+
+
+@pytest.mark.parametrize("path, statement", [
+    ("/api/emergency/contacts", lambda user: __import__("app.api.emergency", fromlist=["x"]).contacts_statement()),
+    ("/api/emergency/alerts", lambda user: __import__("app.api.emergency", fromlist=["x"]).alerts_statement()),
+    ("/api/emergency/sos", lambda user: __import__("app.api.emergency", fromlist=["x"]).sos_statement(user)),
+])
+def test_cursor_walk_has_no_gaps_or_duplicates(client, db, listing_rows, path, statement):
+    user, headers = listing_rows
+    expected = _all_ids(db, statement(user))
+    walked = _walk(client, path, headers)
+    assert len(walked) == len(set(walked))
+    assert walked == expected
+
+
+def test_activity_feed_cursor_breaks_timestamp_ties(client, db, make_user, make_module):
+    from app.models.models import SOSRequest, StudentProgress, UserRole
+
+    user, _ = make_user()
+    _, admin_headers = make_user(role=UserRole.ADMIN)
+    tied = datetime.utcnow().replace(microsecond=0) - timedelta(days=1)
+    marker = f"tie-{user.id}"
+
+    # Completions and SOS requests sharing one timestamp, plus an older completion
+    for i in range(3):
+        module = make_module(title=f"{marker}-module-{i}")
+        db.add(StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=50,
+                               completed_at=tied if i < 2 else tied - timedelta(seconds=1)))
+        db.add(SOSRequest(user_id=user.id, location=f"{marker}-sos-{i}", created_at=tied))
+    db.commit()
+
+    def label(activity):
+        return activity.get("module_title") or activity.get("location") or ""
+
+    walked, cursor = [], ""
+    while cursor is not None:
+        assert len(walked) < 500, "cursor walk is not advancing"
+        page = client.get("/api/analytics/activities", headers=admin_headers,
+                          params={"cursor": cursor, "limit": 2}).json()
+        walked.extend(label(activity) for activity in page["items"])
+        cursor = page["next_cursor"]
+
+    mine = [name for name in walked if name.startswith(marker)]
+    assert mine == [
+        f"{marker}-sos-2", f"{marker}-sos-1", f"{marker}-sos-0",
+        f"{marker}-module-1", f"{marker}-module-0", f"{marker}-module-2"
+    ]
+
+    plain = client.get("/api/analytics/activities", headers=admin_headers, params={"limit": 100}).json()
+    assert [label(activity) for activity in plain if label(activity).startswith(marker)] == mine
+    assert client.get("/api/analytics/activities", headers=admin_headers,
+                      params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,42 @@
+"""
+Statement budgets for hot endpoints; a failure lists the repeated statement
+shapes (likely N+1 loops).
+"""
+from app.core.query_stats import assert_max_queries
+
+
+def test_module_content_query_count_is_flat(app_request, make_user, make_module, db):
+    from app.models.models import ModulePhase, PhaseChecklist, PhaseQA, PhaseStep
+
+    _, headers = make_user()
+    module = make_module()
+    for phase_type in ("before", "during", "after"):
+        phase = ModulePhase(module_id=module.id, phase_type=phase_type, title=phase_type,
+                            content_focus="", format="text")
+        db.add(phase)
+        db.flush()
+        for i in range(3):
+            db.add_all([
+                PhaseChecklist(phase_id=phase.id, item=f"Item {i}", order_index=i),
+                PhaseStep(phase_id=phase.id, step=f"Step {i}", description="", order_index=i),
+                PhaseQA(phase_id=phase.id, question=f"Q {i}", answer="A", category="general")
+            ])
+    db.commit()
+
+    # Principal, content version, then the module and three selectin loads per level
+    url = f"/api/modules/{module.id}/content"
+    with assert_max_queries(7):
+        response = app_request("GET", url, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["phases"]) == 3
+
+    # Served from the content cache
+    with assert_max_queries(2):
+        assert app_request("GET", url, headers=headers).status_code == 200
+
+
+def test_sos_listing_query_count(app_request, make_user):
+    _, headers = make_user()
+    with assert_max_queries(2):
+        response = app_request("GET", "/api/emergency/sos", headers=headers, params={"cursor": ""})
+    assert response.status_code == 200
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN-based regression check: fails if a hot query falls back to a
+sequential scan on PostgreSQL.
+
+Sequential scans are disabled for the session (enable_seqscan = off), so the
+planner only picks one when no usable index exists. Runs against DATABASE_URL
+after `alembic upgrade head`.
+"""
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def hot_queries():
+    """The filter/sort shapes used by the routers and AnalyticsService."""
+    from sqlalchemy import func, select
+    from app.api.emergency import alerts_statement, contacts_statement, sos_statement
+    from app.api.modules import progress_statement
+    from app.models.models import (
+        QuizAttempt, QuizQuestion, SOSRequest, StudentProgress, UserRole
+    )
+
+    student = SimpleNamespace(id=1, role=UserRole.STUDENT)
+    admin = SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+    return {
+        "contacts (active)": contacts_statement(True).limit(50),
+        "alerts (active)": alerts_statement(active_only=True).limit(50),
+        "sos (student)": sos_statement(student).limit(50),
+        "sos (admin, by status)": sos_statement(admin, "active").limit(50),
+        "sos (admin, recent)": sos_statement(admin).limit(50),
+        "progress (user, module)": progress_statement(1, 1),
+        "questions (module, phase)": select(QuizQuestion).where(
+            QuizQuestion.module_id == 1, QuizQuestion.phase == "before"
+        ),
+        "quiz attempts (module)": select(func.count(QuizAttempt.id)).where(
+            QuizAttempt.module_id == 1
+        ),
+        "module completions": select(func.count(StudentProgress.id)).where(
+            StudentProgress.module_id == 1, StudentProgress.completed == True
+        ),
+        "recent completions": select(StudentProgress).where(
+            StudentProgress.completed == True, StudentProgress.completed_at != None
+        ).order_by(StudentProgress.completed_at.desc()).limit(10),
+        "active sos count": select(func.count(SOSRequest.id)).where(
+            SOSRequest.status == "active"
+        ),
+    }
+
+
+def seq_scans(plan):
+    """Yield relation names of every Seq Scan node in an EXPLAIN JSON plan."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def check_query_plans():
+    """Return a list of "query: table" entries that use a sequential scan."""
+    from sqlalchemy import text
+    from app.core.database import engine
+
+    if engine.dialect.name != "postgresql":
+        print("⚠️ Query plan check only runs on PostgreSQL, skipping")
+        return []
+
+    failures = []
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for name, stmt in hot_queries().items():
+            sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            tables = sorted(set(seq_scans(plan[0]["Plan"])))
+            status = "❌" if tables else "✅"
+            print(f"{status} {name}" + (f" (seq scan on {', '.join(tables)})" if tables else ""))
+            failures.extend(f"{name}: {table}" for table in tables)
+    return failures
+
+
+def _on_postgresql() -> bool:
+    from sqlalchemy.engine import make_url
+    from app.core.config import settings
+
+    return make_url(settings.database_url).get_backend_name() == "postgresql"
+
+
+@pytest.mark.skipif(not _on_postgresql(), reason="query plans are only checked on PostgreSQL")
+def test_hot_queries_use_indexes():
+    failures = check_query_plans()
+    assert not failures, f"Hot queries fell back to sequential scans: {failures}"
+
+
+if __name__ == "__main__":
+    try:
+        failures = check_query_plans()
+    except Exception as e:
+        print(f"❌ Query plan check failed: {e}")
+        sys.exit(1)
+    sys.exit(1 if failures else 0)
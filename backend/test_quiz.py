@@ -0,0 +1,105 @@
+"""
+Quiz serving and server-side grading, per module and per phase.
+"""
+import pytest
+
+
+@pytest.fixture
+def quiz_module(db, make_module):
+    from app.models.models import QuizQuestion
+
+    module = make_module()
+    # (phase, correct option) in id order
+    for phase, correct in [("before", 0), ("during", 1), ("before", 2), ("after", 3), ("during", 0)]:
+        db.add(QuizQuestion(module_id=module.id, question=f"{phase}?", options=["a", "b", "c", "d"],
+                            correct_answer=correct, phase=phase))
+    db.commit()
+    return module
+
+
+def test_questions_do_not_expose_answers(client, make_user, quiz_module):
+    _, headers = make_user()
+    for params in ({}, {"phase": "before"}):
+        response = client.get(f"/api/modules/{quiz_module.id}/questions", headers=headers, params=params)
+        assert response.status_code == 200
+        assert response.json()
+        assert all("correct_answer" not in question for question in response.json())
+
+
+def test_phase_submission_is_graded_against_that_phase(client, make_user, quiz_module):
+    _, headers = make_user()
+    url = f"/api/modules/{quiz_module.id}/quiz"
+    served = client.get(f"/api/modules/{quiz_module.id}/questions", headers=headers,
+                        params={"phase": "during"}).json()
+    assert len(served) == 2
+
+    response = client.post(url, headers=headers, json={"phase": "during", "answers": [1, 3]})
+    assert response.status_code == 200
+    assert response.json()["correct"] == [True, False]
+    assert response.json()["total_questions"] == 2
+
+    # The before phase is keyed and cached separately
+    response = client.post(url, headers=headers, json={"phase": "before", "answers": [0, 2]})
+    assert response.json()["correct"] == [True, True]
+
+
+def test_whole_module_submission(client, make_user, quiz_module):
+    _, headers = make_user()
+    url = f"/api/modules/{quiz_module.id}/quiz"
+
+    response = client.post(url, headers=headers, json={"answers": [0, 1, 2, 3, 0]})
+    assert response.status_code == 200
+    assert response.json()["percentage"] == 100
+
+    assert client.post(url, headers=headers, json={"answers": [0, 1]}).status_code == 400
+    assert client.post(url, headers=headers, json={"phase": "later", "answers": [0]}).status_code == 422
+
+
+def test_only_whole_module_submissions_score_progress(client, make_user, quiz_module, db):
+    from app.models.models import QuizAttempt, StudentProgress
+
+    user, headers = make_user()
+    url = f"/api/modules/{quiz_module.id}/quiz"
+
+    def progress_rows():
+        return db.query(StudentProgress).filter_by(user_id=user.id, module_id=quiz_module.id).all()
+
+    response = client.post(url, headers=headers, json={"phase": "after", "answers": [3]})
+    assert response.json()["phase"] == "after"
+    assert progress_rows() == []
+
+    for answers, percentage in (([0, 1, 2, 0, 1], 60), ([0, 1, 2, 3, 0], 100)):
+        assert client.post(url, headers=headers, json={"answers": answers}).status_code == 200
+        db.expire_all()
+        rows = progress_rows()
+        assert [row.score for row in rows] == [percentage]
+
+    client.post(url, headers=headers, json={"phase": "before", "answers": [1, 1]})
+    db.expire_all()
+    assert [row.score for row in progress_rows()] == [100]
+
+    phases = db.query(QuizAttempt.phase).filter_by(user_id=user.id).order_by(QuizAttempt.id).all()
+    assert [phase for phase, in phases] == ["after", None, None, "before"]
+
+
+def test_answers_are_checked_against_option_count(client, make_user, make_module, db):
+    from app.models.models import QuizQuestion
+
+    _, headers = make_user()
+    module = make_module()
+    db.add_all([
+        QuizQuestion(module_id=module.id, question="Two options", options=["a", "b"],
+                     correct_answer=1, phase="before"),
+        # Corrupt key: out of range of its options and of a byte
+        QuizQuestion(module_id=module.id, question="Broken", options=["a", "b"],
+                     correct_answer=300, phase="before"),
+    ])
+    db.commit()
+    url = f"/api/modules/{module.id}/quiz"
+
+    for answers in ([2, 0], [-1, 0], [1, 300]):
+        assert client.post(url, headers=headers, json={"answers": answers}).status_code == 400
+
+    response = client.post(url, headers=headers, json={"answers": [1, 1]})
+    assert response.status_code == 200
+    assert response.json()["correct"] == [True, False]
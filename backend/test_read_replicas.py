@@ -0,0 +1,71 @@
+"""
+Read-your-writes routing: a committed write hands the client a marker that
+keeps its reads on the primary, independent of worker or token.
+"""
+import pytest
+
+
+@pytest.fixture
+def read_routes(monkeypatch):
+    from app.core import database
+
+    routes = []
+    open_read_session = database.open_read_session
+
+    def record(use_replica=True):
+        routes.append(use_replica)
+        return open_read_session(use_replica)
+
+    monkeypatch.setattr(database, "open_read_session", record)
+    return routes
+
+
+def test_write_sets_marker_and_pins_reads_to_primary(client, make_user, read_routes):
+    from app.core.database import WRITE_MARKER, WRITE_MARKER_COOKIE
+
+    user, headers = make_user()
+    response = client.post("/api/emergency/sos", headers=headers,
+                           json={"user_id": user.id, "location": "Library"})
+    assert response.status_code == 200
+    marker = response.headers[WRITE_MARKER]
+    assert client.cookies.get(WRITE_MARKER_COOKIE) == marker
+
+    assert client.get("/api/emergency/sos", headers=headers).status_code == 200
+    assert read_routes[-1] is False
+
+    # Without the cookie, the echoed header is enough (e.g. mobile clients)
+    client.cookies.clear()
+    assert client.get("/api/emergency/sos", headers={**headers, WRITE_MARKER: marker}).status_code == 200
+    assert read_routes[-1] is False
+
+
+def test_reads_without_marker_use_replica(client, make_user, read_routes):
+    from app.core.database import WRITE_MARKER
+
+    client.cookies.clear()
+    _, headers = make_user()
+    response = client.get("/api/emergency/sos", headers=headers)
+    assert response.status_code == 200
+    assert WRITE_MARKER not in response.headers
+    assert read_routes[-1] is True
+
+    stale = {**headers, WRITE_MARKER: "0"}
+    assert client.get("/api/emergency/sos", headers=stale).status_code == 200
+    assert read_routes[-1] is True
+
+
+def test_forged_or_future_markers_are_ignored(client, make_user, read_routes):
+    import time
+    from app.core.database import WRITE_MARKER, sign_write_marker
+
+    client.cookies.clear()
+    _, headers = make_user()
+    now = time.time()
+    signed = sign_write_marker(now)
+    for marker in (f"{now:.3f}", f"{now:.3f}:{'0' * 32}", f"{now + 5:.3f}:{signed.split(':')[1]}",
+                   sign_write_marker(now + 3600)):
+        assert client.get("/api/emergency/sos", headers={**headers, WRITE_MARKER: marker}).status_code == 200
+        assert read_routes[-1] is True
+
+    assert client.get("/api/emergency/sos", headers={**headers, WRITE_MARKER: signed}).status_code == 200
+    assert read_routes[-1] is False
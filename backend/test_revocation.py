@@ -0,0 +1,96 @@
+"""
+Token revocation: the Bloom filter, the store in front of its backend, and
+logout through the API.
+"""
+import time
+
+from app.core.revocation import BloomFilter, InMemoryRevocationBackend, RevocationStore
+
+
+def test_bloom_filter_membership_and_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 10000 * 0.01 * 3
+
+
+def test_store_revokes_until_expiry():
+    store = RevocationStore(InMemoryRevocationBackend(), capacity=100)
+
+    store.revoke("live", time.time() + 60)
+    store.revoke("already-expired", time.time() - 1)
+
+    assert store.is_revoked("live")
+    assert not store.is_revoked("already-expired")
+    assert not store.is_revoked("never-revoked")
+
+
+def test_sync_picks_up_other_workers_and_forgets_expired():
+    backend = InMemoryRevocationBackend()
+    store = RevocationStore(backend, capacity=100)
+    store.revoke("short-lived", time.time() + 60)
+
+    # Revoked by another worker sharing the backend
+    backend.add("elsewhere", time.time() + 60)
+    assert not store.is_revoked("elsewhere")
+    store.sync()
+    assert store.is_revoked("elsewhere")
+
+    backend._entries["short-lived"] = time.time() - 1
+    store.sync()
+    assert "short-lived" not in store._bloom
+    assert "elsewhere" in store._bloom
+
+
+def test_revocation_during_a_sync_is_kept():
+    backend = InMemoryRevocationBackend()
+    store = RevocationStore(backend, capacity=100)
+
+    class RacingBackend:
+        def add(self, jti, expires_at):
+            backend.add(jti, expires_at)
+
+        def contains(self, jti):
+            return backend.contains(jti)
+
+        def active(self):
+            # Scanned before the revocation below reaches the backend
+            snapshot = backend.active()
+            store.revoke("mid-sync", time.time() + 60)
+            return snapshot
+
+    store.backend = RacingBackend()
+    store.sync()
+    assert store.is_revoked("mid-sync")
+
+
+def test_background_sync_runs_off_the_request_path():
+    backend = InMemoryRevocationBackend()
+    store = RevocationStore(backend, capacity=100, sync_interval=0.01)
+    calls = []
+    active = backend.active
+    backend.active = lambda: calls.append(1) or active()
+
+    store.is_revoked("anything")
+    assert calls == []
+
+    backend.add("elsewhere", time.time() + 60)
+    store.start_sync()
+    try:
+        deadline = time.monotonic() + 2
+        while not store.is_revoked("elsewhere") and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        store.stop_sync()
+    assert store.is_revoked("elsewhere")
+
+
+def test_logout_rejects_the_token(client, make_user):
+    _, headers = make_user()
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
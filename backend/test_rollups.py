@@ -0,0 +1,179 @@
+"""
+Rollup maintenance: listener deltas must match a full recompute, and every
+flush must take the shared rollup rows in ROLLUP_LOCK_ORDER.
+"""
+from sqlalchemy import event
+
+
+def _rollup_tables_written(engine, work):
+    from app.models.events import ROLLUP_LOCK_ORDER
+
+    names = [model.__tablename__ for model in ROLLUP_LOCK_ORDER]
+    written = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            table = statement.split()[2]
+            if table in names:
+                written.append(table)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        work()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return written, names
+
+
+def test_flush_takes_rollup_rows_in_lock_order(db, make_user, make_module):
+    from datetime import datetime
+    from app.core.database import engine
+    from app.models.models import QuizAttempt, SOSRequest, StudentProgress
+
+    user, _ = make_user(department="Civil", year_of_study="2")
+    module = make_module()
+
+    def work():
+        # Added in an order that would otherwise lock Daily/Department before Module/Global
+        db.add(SOSRequest(user_id=user.id))
+        db.add(QuizAttempt(user_id=user.id, module_id=module.id, score=1, total_questions=1, answers=[0]))
+        db.add(StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=80,
+                              completed_at=datetime.utcnow()))
+        db.commit()
+
+    written, order = _rollup_tables_written(engine, work)
+    ranks = [order.index(table) for table in written]
+    assert written and ranks == sorted(ranks)
+
+
+def test_listener_rollups_match_recompute(db, make_user, make_module):
+    from datetime import datetime
+    from app.models.models import SOSRequest, StudentProgress
+    from app.services.rollups import verify_rollups
+
+    user, _ = make_user(department="Mechanical", year_of_study="3")
+    module = make_module()
+    progress = StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=60,
+                              completed_at=datetime.utcnow())
+    sos = SOSRequest(user_id=user.id)
+    db.add_all([progress, sos])
+    db.commit()
+
+    progress.score = 90
+    sos.status = "resolved"
+    sos.resolved_at = datetime.utcnow()
+    db.commit()
+
+    assert verify_rollups(db.connection()) == []
+
+
+def test_cohort_change_moves_user_activity(db, make_user, make_module):
+    from datetime import datetime
+    from app.models.models import DepartmentRollup, QuizAttempt, SOSRequest, StudentProgress
+    from app.services.rollups import verify_rollups
+
+    user, _ = make_user(department="Chemical", year_of_study="1")
+    module = make_module()
+    db.add_all([
+        StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=70,
+                        completed_at=datetime.utcnow()),
+        QuizAttempt(user_id=user.id, module_id=module.id, score=2, total_questions=3, answers=[0, 1, 2]),
+        SOSRequest(user_id=user.id)
+    ])
+    db.commit()
+
+    user = db.merge(user)
+    user.department = "Electrical"
+    user.year_of_study = "2"
+    db.commit()
+
+    moved = db.get(DepartmentRollup, "Electrical")
+    db.refresh(moved)
+    assert (moved.students, moved.completed_count, moved.completed_score_sum,
+            moved.quiz_attempts, moved.sos_requests) == (1, 1, 70, 1, 1)
+    assert verify_rollups(db.connection()) == []
+
+
+def test_deletes_are_subtracted(db, make_user, make_module):
+    from datetime import datetime
+    from app.models.models import QuizAttempt, SOSRequest, StudentProgress
+    from app.services.rollups import verify_rollups
+
+    user, _ = make_user(department="Aerospace", year_of_study="4")
+    other_module = make_module()
+    module = make_module()
+    rows = [
+        StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=75,
+                        completed_at=datetime.utcnow()),
+        StudentProgress(user_id=user.id, module_id=other_module.id, completed=True, score=30,
+                        completed_at=datetime.utcnow()),
+        QuizAttempt(user_id=user.id, module_id=module.id, score=1, total_questions=2, answers=[0, 1]),
+        SOSRequest(user_id=user.id),
+        SOSRequest(user_id=user.id, status="resolved", resolved_at=datetime.utcnow()),
+    ]
+    db.add_all(rows)
+    db.commit()
+    rows[1].score = None
+    db.commit()
+    assert verify_rollups(db.connection()) == []
+
+    # Edited in memory first: the subtracted values are the stored ones
+    rows[0].score = 10
+    for row in rows:
+        db.delete(row)
+    db.commit()
+    assert verify_rollups(db.connection()) == []
+
+
+def test_module_average_ignores_null_scores(db, make_user, make_module):
+    from datetime import datetime
+    from app.models.models import StudentProgress
+    from app.services.analytics import AnalyticsService
+    from app.services.rollups import verify_rollups
+
+    module = make_module()
+    for score in (80, None, 60):
+        user, _ = make_user()
+        progress = StudentProgress(user_id=user.id, module_id=module.id, completed=True, score=score,
+                                   completed_at=datetime.utcnow())
+        db.add(progress)
+        db.commit()
+        if score is None:
+            # The column default replaces None on insert; NULL scores come from updates
+            progress.score = None
+            db.commit()
+
+    analytics = {row["module_id"]: row for row in AnalyticsService(db).get_module_analytics()}
+    assert analytics[module.id]["average_score"] == 70
+    assert verify_rollups(db.connection()) == []
+
+
+def test_null_is_active_counts_as_active(db, make_user):
+    from sqlalchemy import update
+    from app.models.models import User
+    from app.services.rollups import verify_rollups
+
+    user, _ = make_user()
+    db.execute(update(User).where(User.id == user.id).values(is_active=None))
+    db.commit()
+    assert verify_rollups(db.connection()) == []
+
+
+def test_rebuild_locks_tables_in_lock_order(db):
+    from types import SimpleNamespace
+    from app.models.events import ROLLUP_LOCK_ORDER
+    from app.models.models import CohortRollup, DailyRollup, GlobalRollup
+    from app.services.rollups import lock_rollups, rebuild_rollups, verify_rollups
+
+    statements = []
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"),
+                                 execute=lambda statement: statements.append(str(statement)))
+    lock_rollups(connection, [DailyRollup, GlobalRollup, CohortRollup])
+    assert statements == [
+        f"LOCK TABLE {model.__tablename__} IN EXCLUSIVE MODE"
+        for model in ROLLUP_LOCK_ORDER if model in (DailyRollup, GlobalRollup, CohortRollup)
+    ]
+
+    rebuild_rollups(db.connection())
+    db.commit()
+    assert verify_rollups(db.connection()) == []
@@ -0,0 +1,106 @@
+"""
+Full-text search over module content, kept in step by the ORM listeners.
+"""
+import pytest
+
+
+@pytest.fixture
+def content(db, make_module):
+    """Two modules, the first with a phase holding a checklist item, a step and a Q&A."""
+    from app.models.models import ModulePhase, PhaseChecklist, PhaseQA, PhaseStep
+
+    flood = make_module(title="Flood safety", description="Rising water and evacuation routes")
+    other = make_module(title="Earthquake safety", description="Drop, cover and hold on")
+    phase = ModulePhase(module_id=flood.id, phase_type="before", title="Preparation",
+                        content_focus="Get ready before the monsoon", format="checklist")
+    db.add(phase)
+    db.flush()
+    db.add_all([
+        PhaseChecklist(phase_id=phase.id, item="Stack sandbags along the doorway", order_index=1),
+        PhaseStep(phase_id=phase.id, step="Move valuables", description="Carry electronics upstairs",
+                  order_index=1),
+        PhaseQA(phase_id=phase.id, question="When should I leave?", answer="When the siren sounds",
+                category="evacuation"),
+    ])
+    db.commit()
+    return flood, other, phase
+
+
+def _search(client, headers, q, modules=None):
+    """Search results, limited to the given modules (other tests index the same text)."""
+    response = client.get("/api/modules/search", headers=headers, params={"q": q, "limit": 50})
+    assert response.status_code == 200, response.text
+    module_ids = {module.id for module in modules or ()}
+    return [result for result in response.json() if modules is None or result["module_id"] in module_ids]
+
+
+def test_search_finds_content_at_every_level(client, make_user, content):
+    flood, _, phase = content
+    _, headers = make_user()
+
+    results = _search(client, headers, "sandbags", content[:2])
+    assert [(result["kind"], result["module_id"], result["phase_id"]) for result in results] == [
+        ("checklist", flood.id, phase.id)
+    ]
+    assert "<b>" in results[0]["snippet"]
+    assert results[0]["module_title"] == "Flood safety"
+
+    kinds = {result["kind"] for result in _search(client, headers, "evacuation monsoon electronics siren", content[:2])}
+    assert kinds == {"module", "phase", "step", "qa"}
+
+
+def test_search_follows_edits_moves_and_deletes(client, make_user, content, db):
+    from app.models.models import PhaseStep
+
+    flood, other, phase = content
+    _, headers = make_user()
+
+    phase = db.merge(phase)
+    phase.module_id = other.id
+    db.commit()
+    for q in ("sandbags", "electronics", "siren", "monsoon"):
+        assert {result["module_id"] for result in _search(client, headers, q, content[:2])} == {other.id}
+
+    step = db.query(PhaseStep).filter(PhaseStep.phase_id == phase.id).one()
+    step.description = "Carry paperwork upstairs"
+    db.commit()
+    assert _search(client, headers, "electronics", content[:2]) == []
+    assert [result["kind"] for result in _search(client, headers, "paperwork", content[:2])] == ["step"]
+
+    db.delete(step)
+    db.commit()
+    assert _search(client, headers, "paperwork", content[:2]) == []
+
+
+def test_inactive_modules_are_not_searched(client, make_user, content, db):
+    flood, _, _ = content
+    _, headers = make_user()
+
+    flood = db.merge(flood)
+    flood.is_active = False
+    db.commit()
+    assert _search(client, headers, "sandbags", content[:2]) == []
+
+
+def test_rebuild_matches_listeners(client, content, db):
+    from sqlalchemy import select
+    from app.models.models import SearchDocument
+    from app.services.search import rebuild_search_index
+
+    flood, other, phase = content
+    phase = db.merge(phase)
+    phase.module_id = other.id
+    db.commit()
+
+    columns = [SearchDocument.kind, SearchDocument.source_id, SearchDocument.module_id,
+               SearchDocument.phase_id, SearchDocument.title, SearchDocument.body]
+    maintained = sorted(db.execute(select(*columns)).all())
+    rebuild_search_index(db.connection())
+    assert sorted(db.execute(select(*columns)).all()) == maintained
+    db.rollback()
+
+
+def test_search_validates_the_query(client, make_user):
+    _, headers = make_user()
+    assert client.get("/api/modules/search", headers=headers, params={"q": "a"}).status_code == 422
+    assert _search(client, headers, "!!") == []
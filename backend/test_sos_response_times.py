@@ -0,0 +1,69 @@
+"""
+SOS time-to-resolve percentiles (/api/analytics/sos-response-times) against
+hand-computed values.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+def test_duration_stats_known_values():
+    from app.services.analytics import _duration_stats
+
+    assert _duration_stats(np.arange(1, 101, dtype=float)) == {
+        "resolved": 100, "mean": 50.5, "p50": 50.5, "p90": 90.1, "p99": 99.0, "max": 100.0
+    }
+    assert _duration_stats(np.array([42.0])) == {
+        "resolved": 1, "mean": 42.0, "p50": 42.0, "p90": 42.0, "p99": 42.0, "max": 42.0
+    }
+
+
+def test_duration_stats_empty():
+    from app.services.analytics import _duration_stats
+
+    assert _duration_stats(np.array([])) == {
+        "resolved": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None
+    }
+
+
+def test_sos_response_times_endpoint(client, make_user, db):
+    from app.models.models import SOSRequest, UserRole
+
+    admin, headers = make_user(role=UserRole.ADMIN)
+    student, _ = make_user()
+    # A day no other test writes SOS requests in
+    opened = datetime(2001, 1, 1, 9, 0, 0)
+    for seconds in (1800, 600, 7200, 1200):
+        db.add(SOSRequest(user_id=student.id, status="resolved", created_at=opened,
+                          resolved_at=opened + timedelta(seconds=seconds), resolved_by=admin.id))
+    db.add(SOSRequest(user_id=student.id, status="active", created_at=opened))
+    db.commit()
+
+    response = client.get("/api/analytics/sos-response-times", headers=headers,
+                          params={"start": "2001-01-01T00:00:00", "end": "2001-01-02T00:00:00"})
+    assert response.status_code == 200
+    body = response.json()
+
+    # Sorted durations 600, 1200, 1800, 7200 with linear interpolation
+    expected = {"resolved": 4, "mean": 2700.0, "p50": 1500.0, "p90": 5580.0, "p99": 7038.0, "max": 7200.0}
+    assert (body["total_requests"], body["open_requests"]) == (5, 1)
+    assert body["time_to_resolve_seconds"] == expected
+    assert body["created_by_hour_utc"][9] == 5
+    assert [bucket["count"] for bucket in body["time_to_resolve_histogram"]] == [3, 0, 1, 0, 0, 0, 0, 0]
+    assert body["by_resolver"] == [{"resolver_id": admin.id, "resolver_name": admin.name, **expected}]
+
+
+def test_sos_response_times_empty_range(client, make_user):
+    from app.models.models import UserRole
+
+    _, headers = make_user(role=UserRole.ADMIN)
+    response = client.get("/api/analytics/sos-response-times", headers=headers,
+                          params={"start": "2002-01-01T00:00:00", "end": "2002-01-02T00:00:00"})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert (body["total_requests"], body["open_requests"]) == (0, 0)
+    assert body["time_to_resolve_seconds"]["resolved"] == 0
+    assert body["time_to_resolve_seconds"]["p50"] is None
+    assert body["created_by_hour_utc"] == [0] * 24
+    assert body["by_resolver"] == []